@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Zugriff auf die GPIOs über das Linux GPIO Character Device
+
+Anstelle von RPi.GPIO wird die GPIO Schnittstelle des Kernels
+(:file:`/dev/gpiochipN`, uAPI v2) direkt per ioctl angesprochen. Alle
+Eingänge werden einmalig in einer Anforderung (Line Request) reserviert.
+Danach werden alle Pegel mit genau einem ioctl gelesen und die Flanken mit
+dem Zeitstempel des Kernels blockweise aus dem Dateideskriptor gelesen.
+
+Die Schnittstelle besitzt keinen globalen Zustand wie RPi.GPIO und kann
+daher aus den Threads der Datenerfassung heraus verwendet werden. Mit
+:class:`~driver.gpio_chardev.FakeGpioChip` steht ein Ersatz ohne Hardware
+zur Verfügung.
+
+.. code-block:: python
+
+    chip = GpioChip("/dev/gpiochip0")
+    lines = chip.request_lines([14, 15, 17], edges=True)
+    print(lines.get_values())
+    for offset, level, timestamp in lines.read_events(1.0):
+        print(offset, level, timestamp)
+
+"""
+
+# Module für den Zugriff auf das Character Device
+import fcntl
+import os
+import select
+import struct
+
+# Modul zur Bearbeitung der Zeitstempel
+import time
+
+# Import Logging Modul
+import logging
+
+
+def _IOWR(type: int, nr: int, size: int) -> int:
+    """Berechnung einer ioctl Nummer für Lese- und Schreibzugriff"""
+    return (3 << 30) | (size << 16) | (type << 8) | nr
+
+
+# ============================================
+# Konstanten der GPIO uAPI v2 (linux/gpio.h)
+# ============================================
+_GPIO_V2_LINES_MAX = 64
+_GPIO_V2_LINE_NUM_ATTRS_MAX = 10
+
+_GPIO_V2_LINE_FLAG_INPUT = 1 << 2
+_GPIO_V2_LINE_FLAG_EDGE_RISING = 1 << 4
+_GPIO_V2_LINE_FLAG_EDGE_FALLING = 1 << 5
+_GPIO_V2_LINE_FLAG_EVENT_CLOCK_REALTIME = 1 << 11
+
+_GPIO_V2_LINE_ATTR_ID_DEBOUNCE = 3
+
+_GPIO_V2_LINE_EVENT_RISING_EDGE = 1
+
+# struct gpio_v2_line_request: offsets, consumer, config, num_lines,
+# event_buffer_size, padding, fd
+_LINE_REQUEST = struct.Struct("<64I32sQI5I" + "IIQQ" * _GPIO_V2_LINE_NUM_ATTRS_MAX + "II5Ii")
+# struct gpio_v2_line_values: bits, mask
+_LINE_VALUES = struct.Struct("<QQ")
+# struct gpio_v2_line_event: timestamp_ns, id, offset, seqno, line_seqno
+_LINE_EVENT = struct.Struct("<QIIII24x")
+
+_GPIO_V2_GET_LINE_IOCTL = _IOWR(0xB4, 0x07, _LINE_REQUEST.size)
+_GPIO_V2_LINE_GET_VALUES_IOCTL = _IOWR(0xB4, 0x0E, _LINE_VALUES.size)
+
+
+class GpioChip:
+    """Ein GPIO Controller des Kernels
+
+    :param path: Pfad des Character Device, defaults to "/dev/gpiochip0"
+    :type path: str, optional
+    """
+
+    def __init__(self, path: str = "/dev/gpiochip0"):
+        self.path = path
+
+        # ============================================
+        # Konfiguration des Logging
+        # ============================================
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+    def request_lines(self, offsets: list[int], edges: bool = False,
+                      consumer: str = "tatooine_monitor",
+                      debounce_us: int = 0) -> "GpioLineRequest":
+        """Reservieren mehrerer Eingänge in einer Anforderung
+
+        :param offsets: Nummern der Leitungen am Controller (BCM Nummern)
+        :type offsets: list[int]
+        :param edges: Erfassung beider Flanken, defaults to False
+        :type edges: bool, optional
+        :param consumer: Name des Nutzers im Kernel, defaults to "tatooine_monitor"
+        :type consumer: str, optional
+        :param debounce_us: Entprellzeit im Kernel, defaults to 0
+        :type debounce_us: int, optional
+        :return: Reservierte Eingänge
+        :rtype: GpioLineRequest
+        """
+        if not 0 < len(offsets) <= _GPIO_V2_LINES_MAX:
+            raise ValueError(f"Anzahl der GPIOs {len(offsets)} nicht zulässig")
+
+        flags = _GPIO_V2_LINE_FLAG_INPUT
+        if edges:
+            flags |= _GPIO_V2_LINE_FLAG_EDGE_RISING | \
+                _GPIO_V2_LINE_FLAG_EDGE_FALLING | \
+                _GPIO_V2_LINE_FLAG_EVENT_CLOCK_REALTIME
+
+        # Entprellung als Attribut für alle Leitungen
+        attrs = [0, 0, 0, 0] * _GPIO_V2_LINE_NUM_ATTRS_MAX
+        num_attrs = 0
+        if debounce_us > 0:
+            attrs[0:4] = [_GPIO_V2_LINE_ATTR_ID_DEBOUNCE, 0, int(debounce_us),
+                          (1 << len(offsets)) - 1]
+            num_attrs = 1
+
+        request = bytearray(_LINE_REQUEST.pack(
+            *(list(offsets) + [0] * (_GPIO_V2_LINES_MAX - len(offsets))),
+            consumer.encode()[:31],
+            flags, num_attrs, 0, 0, 0, 0, 0,
+            *attrs,
+            len(offsets), 0, 0, 0, 0, 0, 0, -1))
+
+        fd = os.open(self.path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            fcntl.ioctl(fd, _GPIO_V2_GET_LINE_IOCTL, request, True)
+        finally:
+            os.close(fd)
+
+        line_fd = _LINE_REQUEST.unpack(request)[-1]
+        self.logger.info(f"GPIOs {list(offsets)} an {self.path} reserviert")
+        return GpioLineRequest(line_fd, offsets)
+
+
+class GpioLineRequest:
+    """Reservierte Eingänge eines :class:`~driver.gpio_chardev.GpioChip`
+
+    :param fd: Dateideskriptor der Anforderung
+    :type fd: int
+    :param offsets: Nummern der Leitungen in der Reihenfolge der Anforderung
+    :type offsets: list[int]
+    """
+
+    _EVENTS_PER_READ = 64
+    """Maximale Anzahl Flanken, die mit einem read gelesen werden"""
+
+    def __init__(self, fd: int, offsets: list[int]):
+        self.fd = fd
+        self.offsets = list(offsets)
+        self._mask = (1 << len(self.offsets)) - 1
+
+    def get_values(self) -> list[int]:
+        """Lesen aller Pegel mit einem ioctl
+
+        :return: Pegel in der Reihenfolge der Anforderung
+        :rtype: list[int]
+        """
+        values = bytearray(_LINE_VALUES.pack(0, self._mask))
+        fcntl.ioctl(self.fd, _GPIO_V2_LINE_GET_VALUES_IOCTL, values, True)
+        bits = _LINE_VALUES.unpack(values)[0]
+        return [(bits >> i) & 1 for i in range(len(self.offsets))]
+
+    def read_events(self, timeout: float = 0) -> list[tuple]:
+        """Lesen aller vom Kernel gepufferten Flanken
+
+        :param timeout: maximale Wartezeit auf die erste Flanke in s, defaults to 0
+        :type timeout: float, optional
+        :return: Liste von (Leitung, Pegel, Zeitstempel in s)
+        :rtype: list[tuple]
+        """
+        events = []
+        while select.select([self.fd], [], [], timeout)[0]:
+            data = os.read(self.fd, _LINE_EVENT.size * self._EVENTS_PER_READ)
+            for timestamp_ns, id, offset, _, _ in _LINE_EVENT.iter_unpack(data):
+                events.append((offset,
+                               1 if id == _GPIO_V2_LINE_EVENT_RISING_EDGE else 0,
+                               timestamp_ns / 1e9))
+            if len(data) < _LINE_EVENT.size * self._EVENTS_PER_READ:
+                break
+            timeout = 0
+
+        return events
+
+    def close(self) -> None:
+        """Freigeben der Eingänge"""
+        os.close(self.fd)
+
+
+class FakeGpioChip:
+    """Nachbildung eines :class:`~driver.gpio_chardev.GpioChip` ohne Hardware
+
+    Die Pegel werden mit
+    :func:`~driver.gpio_chardev.FakeGpioChip.set_value` vorgegeben. Jede
+    Änderung erzeugt bei Anforderungen mit Flankenerfassung eine Flanke.
+
+    .. code-block:: python
+
+        chip = FakeGpioChip()
+        gpio = GpioService([14], GpioService.MODE_EVENT,
+                           backend=GpioService.BACKEND_CHARDEV, chip=chip)
+        chip.set_value(14, 1)
+        print(gpio.drain_events())
+
+    """
+
+    def __init__(self):
+        self.levels = {}
+        """Aktuelle Pegel aller Leitungen"""
+
+        self.requests = []
+        """Alle erstellten Anforderungen"""
+
+    def request_lines(self, offsets: list[int], edges: bool = False,
+                      consumer: str = "tatooine_monitor",
+                      debounce_us: int = 0) -> "FakeGpioLineRequest":
+        request = FakeGpioLineRequest(self, offsets, edges)
+        self.requests.append(request)
+        return request
+
+    def set_value(self, offset: int, level: int,
+                  timestamp: float = None) -> None:
+        """Vorgabe eines Pegels
+
+        :param offset: Nummer der Leitung
+        :type offset: int
+        :param level: Pegel (0, 1)
+        :type level: int
+        :param timestamp: Zeitstempel der Flanke, defaults to time.time()
+        :type timestamp: float, optional
+        """
+        level = 1 if level else 0
+        if self.levels.get(offset, 0) == level:
+            return
+
+        self.levels[offset] = level
+        if timestamp is None:
+            timestamp = time.time()
+        for request in self.requests:
+            if request.edges and offset in request.offsets:
+                request.events.append((offset, level, timestamp))
+
+
+class FakeGpioLineRequest:
+    """Reservierte Eingänge eines :class:`~driver.gpio_chardev.FakeGpioChip`"""
+
+    def __init__(self, chip: FakeGpioChip, offsets: list[int], edges: bool):
+        self.chip = chip
+        self.offsets = list(offsets)
+        self.edges = edges
+        self.events = []
+
+    def get_values(self) -> list[int]:
+        return [self.chip.levels.get(offset, 0) for offset in self.offsets]
+
+    def read_events(self, timeout: float = 0) -> list[tuple]:
+        events, self.events = self.events, []
+        return events
+
+    def close(self) -> None:
+        self.chip.requests.remove(self)
@@ -7,6 +7,18 @@ Der ADS1115 ist ein Baustein von Texas Instruments zur Messung mehrerer Spannung
 *ADS111x Ultra-Small, Low-Power, I2C-Compatible, 860-SPS, 16-Bit ADCsWith Internal Reference, Oscillator, and Programmable Comparator*
 
 """
+# Modul für die Wartezeiten der Wandlung
+import time
+import threading
+
+# Vorab angelegter Speicher der Messwerte
+from array import array
+
+# Import Logging Modul
+import logging
+
+# Zusammengefasste Registerzugriffe
+from driver.i2c_bus import I2CBatch
 
 class ADS1115():
     """Die Klasse zur Ansteuerung des ADS1115
@@ -16,6 +28,8 @@ class ADS1115():
     auszulesen. Die übergebenen Parameter dienen der Basiskonfiguration für die Auslesung des jeweiligen Kanals
     
     Im Rahmen der Initialisierung wird der Sensor durch mit Standardeinstellungen konfiguriert und die Messung erfolgt anschließend mit der Methode **getVoltage()**.
+
+    Nach dem Start einer Wandlung wird nicht mehr das Configregister gepollt. Der Treiber wartet die bekannte Wandlungszeit der eingestellten Datenrate ab und liest dann einmal. Optional wird mit einem :class:`~driver.i2c_ads1115.ADS1115ReadyPin` auf die Flanke des ALERT/RDY Pins gewartet. In beiden Fällen bricht die Messung nach einem harten Timeout mit einem TimeoutError ab.
     
     .. code-block:: python
 
@@ -33,6 +47,10 @@ class ADS1115():
     :type scale: float
     :param address: i2c Adresse des Chip, defaults to 0x48
     :type address: byte [optional]
+    :param ready: ALERT/RDY Pin des Chip, defaults to None
+    :type ready: ADS1115ReadyPin [optional]
+    :param timeout: harter Timeout einer Messung in s, defaults to None (4-fache Wandlungszeit + 10ms)
+    :type timeout: float [optional]
     
     :return:    Das Objekt repräsentiert einen AD Kanal des ADS1115
     :rtype:     object
@@ -139,6 +157,12 @@ class ADS1115():
     COMP_ASSERT_2CONV       = 0b00000001
     COMP_ASSERT_4CONV       = 0b00000010
     COMP_DISABLE            = 0b00000011    #default
+
+    # Datenrate in Samples pro Sekunde zu den DR Einstellungen
+    _DR_SPS = {DR_8SPS: 8, DR_16SPS: 16, DR_32SPS: 32, DR_64SPS: 64,
+               DR_128SPS: 128, DR_250SPS: 250, DR_475SPS: 475, DR_860SPS: 860}
+    # Toleranz des internen Oszillators (Datenrate +/-10%)
+    _DR_TOLERANCE = 1.1
     
     #=======================================================================
     # Klassenattribute
@@ -158,7 +182,8 @@ class ADS1115():
     configLSB   = DR_128SPS | COMP_MODE_TRADITIONAL | COMP_DISABLE
 
         
-    def __init__(self,bus,mux,scale, address = 0x48):
+    def __init__(self,bus,mux,scale, address = 0x48, ready = None,
+                 timeout = None):
         """Initialisierung des AnalogChannel vom ADS1115
 
         :param bus: obj übergeben von der Funktion smbus
@@ -169,18 +194,46 @@ class ADS1115():
         :type scale: float
         :param address: i2c Adresse des Chip, defaults to 0x48
         :type address: byte [optional]
+        :param ready: ALERT/RDY Pin des Chip, defaults to None
+        :type ready: ADS1115ReadyPin [optional]
+        :param timeout: harter Timeout einer Messung in s, defaults to None
+        :type timeout: float [optional]
         """
         
         self.bus = bus
         self.mux = mux
         self.scale = scale
         self.i2c_addr = address
+        self.ready = ready
+        self.timeout = timeout
         # Übernahme der Mux Einstellung
         self.configMSB = self.configMSB & 0b10001111
         self.configMSB = self.configMSB | mux
+
+        # ALERT/RDY als Conversion Ready Pin: Hi_thresh MSB = 1,
+        # Lo_thresh MSB = 0 und Komparator nach jeder Wandlung aktiv
+        if self.ready is not None:
+            self.configLSB = (self.configLSB & 0b11111100) | self.COMP_ASSERT_1CONV
+            self.bus.write_i2c_block_data(self.i2c_addr, self.CMD_SEL_REG_HIGH_THD, [0x80, 0x00])
+            self.bus.write_i2c_block_data(self.i2c_addr, self.CMD_SEL_REG_LOW_THD, [0x00, 0x00])
         
         #Config Schreiben
         self.write_config()
+
+        # Config und Ergebnis werden gemeinsam in einem ioctl gelesen
+        self._read_batch = I2CBatch() \
+            .read(self.i2c_addr, self.CMD_SEL_REG_CONFIG, 2) \
+            .read(self.i2c_addr, self.CMD_SEL_REG_CONV, 2)
+
+    def get_conversion_time(self) -> float:
+        """Ausgabe der Wandlungszeit der eingestellten Datenrate
+
+        Die Zeit enthält die Toleranz des internen Oszillators.
+
+        :return: Wandlungszeit [s]
+        :rtype: float
+        """
+        return self._DR_TOLERANCE / self._DR_SPS[self.configLSB & 0b11100000]
         
     def read_conversation(self) -> int:
         """Auslesen des Conversation Registers des ADS1115
@@ -233,25 +286,36 @@ class ADS1115():
         
         Messung der Spannung am AD-Wandler mittels Single Shot. Dazu wird
         zuerst das Config register geschrieben und damit Single Shot getriggert.
-        Anschließend wird Config gepollt, um sicherzustellen, dass die Messung 
-        abgeschlossen wurde. Anschließend wird der Messwert ausgelesen und skaliert.
+        Anschließend wird die Wandlungszeit abgewartet (bzw. die Flanke am
+        ALERT/RDY Pin) und einmal geprüft, ob die Messung abgeschlossen
+        wurde. Anschließend wird der Messwert ausgelesen und skaliert.
 
-        Returns:
-            [float]: Gemessen Spannung am AD-Wandler
+        :raises TimeoutError: Die Messung wurde nicht innerhalb des Timeouts abgeschlossen
         """
-        
+        conversion_time = self.get_conversion_time()
+        timeout = self.timeout if self.timeout is not None else \
+            4 * conversion_time + 0.01
+        deadline = time.monotonic() + timeout
+
         #Schreiben der Konfiguration in des ads1114
+        if self.ready is not None:
+            self.ready.arm()
         self.write_config()
 
         #Warten bis die SingleShot Messung abgeschlossen ist
-        while 1:
-            conf = self.read_config()
-            #print ("{0:b}".format(conf[0]), "{0:b}".format(conf[1]))
-            if conf[0] & self.OS_DEV_CONV_NOT_ACTIV:
-                break
-            
-        #Auslesen der 16bit aus der letzten Messung
-        data = self.read_conversation()
+        if self.ready is not None:
+            self.ready.wait(timeout)
+        else:
+            time.sleep(conversion_time)
+
+        #Kontrolle des OS Bits und Auslesen der 16bit aus der letzten
+        #Messung, nur bei Verzögerung wird nachgepollt
+        conf, data = self._read_batch.run(self.bus)
+        while not conf[0] & self.OS_DEV_CONV_NOT_ACTIV:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"ADS1115 0x{self.i2c_addr:02x}: Wandlung nicht innerhalb von {timeout*1000:0.1f} ms abgeschlossen")
+            time.sleep(conversion_time / 8)
+            conf, data = self._read_batch.run(self.bus)
         
         # Convert the data
         self.__raw_adc = data[0] * 256 + data[1]
@@ -281,6 +345,186 @@ class ADS1115():
         self.__measure_analogIn()
         
         return self.__voltage
-        
 
 
+class ADS1115ReadyPin():
+    """ALERT/RDY Pin eines ADS1115 an einem GPIO des RaspberryPi
+
+    Der ADS1115 zieht den Pin am Ende jeder Wandlung auf Low. Die fallende
+    Flanke wird über einen Callback von RPi.GPIO in einem Event abgelegt, so
+    dass auch eine sehr kurze Wandlung nicht verpasst wird. Mehrere
+    :class:`~driver.i2c_ads1115.ADS1115` Objekte desselben Chips können sich
+    einen Pin teilen, solange sie nacheinander messen.
+
+    .. code-block:: python
+
+        ready = ADS1115ReadyPin(22)
+        Adc1 = ADS1115(bus, ADS1115.MUX_AIN0_GND, 4.096, ready=ready)
+
+    :param pin: BCM Nummer des GPIOs
+    :type pin: int
+    """
+
+    def __init__(self, pin: int):
+        import RPi.GPIO as GPIO
+
+        self.pin = pin
+        self._event = threading.Event()
+
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+        GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        GPIO.add_event_detect(pin, GPIO.FALLING,
+                              callback=lambda channel: self._event.set())
+
+    def arm(self) -> None:
+        """Zurücksetzen vor dem Start einer Wandlung"""
+        self._event.clear()
+
+    def wait(self, timeout: float) -> bool:
+        """Warten auf das Ende der Wandlung
+
+        :param timeout: maximale Wartezeit in s
+        :type timeout: float
+        :return: True, wenn die Flanke erkannt wurde
+        :rtype: bool
+        """
+        return self._event.wait(timeout)
+
+
+class ADS1115Scanner():
+    """Kontinuierliche Abtastung mehrerer Eingänge eines ADS1115
+
+    Der Scanner besitzt den Chip exklusiv. Der ADS1115 wandelt im Continuous
+    Mode, ein Hintergrundthread schaltet den Multiplexer reihum durch die
+    konfigurierten Eingänge. In einem einzigen ioctl
+    (:class:`~driver.i2c_bus.I2CBatch`) wird das Ergebnis des aktuellen
+    Eingangs gelesen und sofort der Multiplexer auf den nächsten Eingang
+    gestellt (Pipelining).
+
+    Im Continuous Mode beendet der ADS1115 nach dem Umschalten zunächst die
+    laufende Wandlung mit dem alten Eingang. Erst das Ergebnis der folgenden
+    Wandlung gehört zum neuen Eingang. Nach jedem Umschalten werden daher
+    zwei Wandlungszeiten abgewartet und das erste Ergebnis verworfen.
+
+    Der jeweils letzte Messwert jedes Eingangs liegt in einem
+    vorab angelegten Array und kann jederzeit ohne Buszugriff abgeholt
+    werden.
+
+    .. code-block:: python
+
+        scanner = ADS1115Scanner(bus, [ADS1115.MUX_AIN0_GND,
+                                       ADS1115.MUX_AIN1_GND], 4.096, 0x49)
+        v0, v1 = scanner.get_voltages()
+
+    :param bus: SMBus kompatibles Objekt (bevorzugt I2CBusClient)
+    :type bus: object
+    :param muxes: Multiplexer Einstellungen der abzutastenden Eingänge
+    :type muxes: list[int]
+    :param scale: Skalierung des AD-Wandlers in Volt
+    :type scale: float
+    :param address: i2c Adresse des Chip (0x48 - 0x4B), defaults to 0x48
+    :type address: byte [optional]
+    :param data_rate: DR Einstellung, defaults to ADS1115.DR_128SPS
+    :type data_rate: int [optional]
+    """
+
+    ADDRESSES = range(0x48, 0x4C)
+    """Mögliche i2c Adressen eines ADS1115 (ADDR an GND, VDD, SDA, SCL)"""
+
+    def __init__(self, bus, muxes: list, scale: float, address = 0x48,
+                 data_rate = ADS1115.DR_128SPS):
+
+        if address not in self.ADDRESSES:
+            raise ValueError(f"Adresse 0x{address:02x} ist keine gültige ADS1115 Adresse")
+        if not muxes:
+            raise ValueError("ADS1115Scanner ohne Eingänge")
+
+        # ============================================
+        # Konfiguration des Logging
+        # ============================================
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        self.bus = bus
+        self.scale = scale
+        self.i2c_addr = address
+        self.conversion_time = ADS1115._DR_TOLERANCE / ADS1115._DR_SPS[data_rate]
+
+        # Wartezeit nach dem Umschalten des Multiplexers: laufende Wandlung
+        # mit dem alten Eingang plus eine vollständige mit dem neuen Eingang
+        self.settle_time = 2 * self.conversion_time
+
+        # Vorab berechnete Configregister je Eingang
+        msb = ADS1115.PGA_4V096 | ADS1115.MODE_CONTINIUS_CONV
+        lsb = data_rate | ADS1115.COMP_MODE_TRADITIONAL | ADS1115.COMP_DISABLE
+        self._configs = [[msb | mux, lsb] for mux in muxes]
+
+        # Pro Eingang: Ergebnis lesen und Multiplexer weiterschalten
+        n = len(self._configs)
+        self._step_batches = []
+        for i in range(n):
+            batch = I2CBatch().read(address, ADS1115.CMD_SEL_REG_CONV, 2)
+            if n > 1:
+                batch.write(address, ADS1115.CMD_SEL_REG_CONFIG,
+                            self._configs[(i + 1) % n])
+            self._step_batches.append(batch)
+
+        self.voltages = array('d', [float('nan')] * len(muxes))
+        """Letzte Spannung [V] jedes Eingangs (NaN bis zur ersten Wandlung)"""
+
+        self.timestamps = array('d', [0.0] * len(muxes))
+        """Zeitstempel der letzten Wandlung jedes Eingangs"""
+
+        self.cnt_samples = 0
+        """Anzahl aller bisherigen Wandlungen"""
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f"ads1115-0x{address:02x}")
+        self._thread.start()
+
+    def get_voltages(self) -> list:
+        """Ausgabe der letzten Spannung jedes Eingangs
+
+        :return: Spannung [V] in der Reihenfolge der Eingänge, None falls noch keine Wandlung vorliegt
+        :rtype: list
+        """
+        return [None if v != v else v for v in self.voltages]
+
+    def close(self) -> None:
+        """Beenden der Abtastung"""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        i = 0
+        restart = True
+
+        while not self._stop.is_set():
+            try:
+                # Start der kontinuierlichen Wandlung mit dem Eingang i
+                if restart:
+                    I2CBatch().write(self.i2c_addr, ADS1115.CMD_SEL_REG_CONFIG,
+                                     self._configs[i]).run(self.bus)
+                    restart = False
+                    self._stop.wait(self.settle_time)
+                    continue
+
+                data = self._step_batches[i].run(self.bus)[0]
+
+                raw = data[0] * 256 + data[1]
+                if raw > 0x7FFF:
+                    raw -= 0x10000
+                self.voltages[i] = self.scale / 0x7FFF * raw
+                self.timestamps[i] = time.time()
+                self.cnt_samples += 1
+                i = (i + 1) % len(self._configs)
+
+            except Exception as e:
+                self.logger.warning(f"ADS1115 0x{self.i2c_addr:02x}: Abtastung fehlgeschlagen: {e}")
+                restart = True
+
+            # Nach dem Umschalten gehört erst die zweite Wandlung zum neuen
+            # Eingang, die erste wird durch das Warten verworfen
+            self._stop.wait(self.settle_time)
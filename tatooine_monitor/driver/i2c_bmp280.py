@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Bibliothek zur Ansteuerung des BMP280
+
+Der BMP280 ist ein Baustein von Bosch Sensortec zur Messung von Luftdruck und
+Temperatur, welcher über den i2c Bus ausgelesen werden kann.
+*BMP280 Digital Pressure Sensor*
+
+Der Sensor wird im Forced Mode betrieben: Pro Zyklus wird genau eine Messung
+gestartet, nach der Messzeit werden Status und Messwerte (Druck und
+Temperatur) mit einem Blockzugriff gelesen. Zwischen den Messungen schläft
+der Sensor, wodurch die Eigenerwärmung gering bleibt.
+
+"""
+# Modul für die Wartezeiten der Messung
+import time
+
+# Modul zum Entpacken der Kalibrierdaten
+import struct
+
+# Import Logging Modul
+import logging
+
+# Zusammengefasste Registerzugriffe
+from driver.i2c_bus import I2CBatch
+
+
+class BMP280():
+    """Die Klasse zur Ansteuerung des BMP280
+
+    Bei der Initialisierung werden die Kalibrierdaten einmalig gelesen und
+    Oversampling sowie IIR Filter konfiguriert. Mit
+    :func:`~driver.i2c_bmp280.BMP280.measure` wird eine Messung im Forced
+    Mode gestartet und Temperatur und Luftdruck mit den zwischengespeicherten
+    Kalibrierdaten kompensiert.
+
+    .. code-block:: python
+
+        bmp = BMP280(bus, 0x76, oversampling_t=1, oversampling_p=4, iir_filter=4)
+        temperature, pressure = bmp.measure()
+
+    :param bus: obj übergeben von der Funktion smbus
+    :type bus: object
+    :param address: i2c Adresse des Chip, defaults to 0x76
+    :type address: byte [optional]
+    :param oversampling_t: Oversampling der Temperatur (1, 2, 4, 8, 16), defaults to 1
+    :type oversampling_t: int [optional]
+    :param oversampling_p: Oversampling des Luftdrucks (0: aus, 1, 2, 4, 8, 16), defaults to 4
+    :type oversampling_p: int [optional]
+    :param iir_filter: Koeffizient des IIR Filters (0: aus, 2, 4, 8, 16), defaults to 4
+    :type iir_filter: int [optional]
+    """
+
+    #=================================================================
+    # Register Selector
+    #=================================================================
+    # Kalibrierdaten dig_T1 ... dig_P9 (24 Byte)
+    REG_CALIB = 0x88
+    # Chip ID
+    REG_CHIP_ID = 0xD0
+    # Status (measuring, im_update)
+    REG_STATUS = 0xF3
+    # Oversampling und Betriebsart
+    REG_CTRL_MEAS = 0xF4
+    # Standby Zeit und IIR Filter
+    REG_CONFIG = 0xF5
+
+    CHIP_ID = 0x58
+    """Inhalt des Chip ID Registers eines BMP280"""
+
+    #=================================================================
+    # Register Ctrl_Meas und Config
+    #=================================================================
+    MODE_SLEEP = 0b00
+    MODE_FORCED = 0b01
+
+    STATUS_MEASURING = 0b00001000
+
+    _OVERSAMPLING = {0: 0b000, 1: 0b001, 2: 0b010, 4: 0b011, 8: 0b100, 16: 0b101}
+    """Oversampling -> Registerwert von osrs_t bzw. osrs_p"""
+
+    _IIR_FILTER = {0: 0b000, 2: 0b001, 4: 0b010, 8: 0b011, 16: 0b100}
+    """Filterkoeffizient -> Registerwert von filter"""
+
+    _CALIB = struct.Struct("<HhhHhhhhhhhh")
+    """Aufbau der Kalibrierdaten (little endian)"""
+
+    # Anzahl der Bytes ab dem Statusregister bis zum Ende der Messwerte
+    # (Status, Ctrl_Meas, Config, reserviert, 3 Byte Druck, 3 Byte Temperatur)
+    _DATA_LENGTH = 10
+
+    def __init__(self, bus, address: int = 0x76, oversampling_t: int = 1,
+                 oversampling_p: int = 4, iir_filter: int = 4):
+
+        # ============================================
+        # Konfiguration des Logging
+        # ============================================
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        if oversampling_t not in self._OVERSAMPLING or oversampling_t == 0:
+            raise ValueError(f"BMP280 Oversampling der Temperatur {oversampling_t} nicht zulässig")
+        if oversampling_p not in self._OVERSAMPLING:
+            raise ValueError(f"BMP280 Oversampling des Luftdrucks {oversampling_p} nicht zulässig")
+        if iir_filter not in self._IIR_FILTER:
+            raise ValueError(f"BMP280 IIR Filter {iir_filter} nicht zulässig")
+
+        self.bus = bus
+        self.i2c_addr = address
+        self.oversampling_t = oversampling_t
+        self.oversampling_p = oversampling_p
+
+        # Chip ID und Kalibrierdaten in einer Transaktion lesen
+        chip_id, calib = I2CBatch() \
+            .read(self.i2c_addr, self.REG_CHIP_ID, 1) \
+            .read(self.i2c_addr, self.REG_CALIB, self._CALIB.size) \
+            .run(self.bus)
+        if chip_id[0] != self.CHIP_ID:
+            self.logger.warning(f"BMP280 0x{self.i2c_addr:02x}: unerwartete Chip ID 0x{chip_id[0]:02x}")
+
+        (self._dig_t1, self._dig_t2, self._dig_t3,
+         self._dig_p1, self._dig_p2, self._dig_p3, self._dig_p4, self._dig_p5,
+         self._dig_p6, self._dig_p7, self._dig_p8, self._dig_p9) = \
+            self._CALIB.unpack(bytes(calib))
+
+        # Startbefehl einer Messung im Forced Mode
+        self._ctrl_meas = (self._OVERSAMPLING[oversampling_t] << 5) | \
+            (self._OVERSAMPLING[oversampling_p] << 2) | self.MODE_FORCED
+
+        # IIR Filter setzen, der Sensor bleibt bis zur ersten Messung im Sleep Mode
+        I2CBatch() \
+            .write(self.i2c_addr, self.REG_CTRL_MEAS,
+                   [self._ctrl_meas & ~0b11]) \
+            .write(self.i2c_addr, self.REG_CONFIG,
+                   [self._IIR_FILTER[iir_filter] << 2]) \
+            .run(self.bus)
+
+        self._trigger = I2CBatch().write(self.i2c_addr, self.REG_CTRL_MEAS,
+                                         [self._ctrl_meas])
+        self._read_batch = I2CBatch().read(self.i2c_addr, self.REG_STATUS,
+                                           self._DATA_LENGTH)
+
+        self.temperature = None
+        """Zuletzt gemessene Temperatur in °C"""
+
+        self.pressure = None
+        """Zuletzt gemessener Luftdruck in hPa"""
+
+    def get_measurement_time(self) -> float:
+        """Ausgabe der maximalen Messzeit des eingestellten Oversamplings
+
+        Nach Datenblatt Kapitel 3.8.1:
+        1.25 ms + 2.3 ms * osrs_t + (2.3 ms * osrs_p + 0.575 ms)
+
+        :return: Messzeit [s]
+        :rtype: float
+        """
+        t_ms = 1.25 + 2.3 * self.oversampling_t
+        if self.oversampling_p:
+            t_ms += 2.3 * self.oversampling_p + 0.575
+        return t_ms / 1000
+
+    def measure(self, timeout: float = None) -> tuple:
+        """Messung von Temperatur und Luftdruck im Forced Mode
+
+        Nach dem Start der Messung wird die Messzeit abgewartet und
+        anschließend Status und Messwerte mit einem Blockzugriff gelesen. Ist
+        die Messung noch nicht abgeschlossen, wird erneut gelesen.
+
+        :param timeout: harter Timeout der Messung in s, defaults to None (doppelte Messzeit + 10ms)
+        :type timeout: float [optional]
+        :return: Temperatur [°C] und Luftdruck [hPa] (None, wenn der Luftdruck nicht gemessen wird)
+        :rtype: tuple[float, float]
+        """
+        measurement_time = self.get_measurement_time()
+        if timeout is None:
+            timeout = 2 * measurement_time + 0.01
+
+        self._trigger.run(self.bus)
+        deadline = time.monotonic() + timeout
+
+        time.sleep(measurement_time)
+        data, = self._read_batch.run(self.bus)
+        while data[0] & self.STATUS_MEASURING:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"BMP280 0x{self.i2c_addr:02x}: Messung nicht innerhalb von {timeout*1000:0.1f} ms abgeschlossen")
+            time.sleep(measurement_time / 8)
+            data, = self._read_batch.run(self.bus)
+
+        # 20 Bit Rohwerte (MSB, LSB, XLSB[7:4])
+        adc_p = (data[4] << 12) | (data[5] << 4) | (data[6] >> 4)
+        adc_t = (data[7] << 12) | (data[8] << 4) | (data[9] >> 4)
+
+        t_fine = self._compensate_t_fine(adc_t)
+        self.temperature = t_fine / 5120.0
+        self.pressure = self._compensate_pressure(adc_p, t_fine) \
+            if self.oversampling_p else None
+
+        return self.temperature, self.pressure
+
+    def _compensate_t_fine(self, adc_t: int) -> float:
+        """Kompensation der Temperatur nach Datenblatt (Fließkomma)"""
+        var1 = (adc_t / 16384.0 - self._dig_t1 / 1024.0) * self._dig_t2
+        var2 = (adc_t / 131072.0 - self._dig_t1 / 8192.0) ** 2 * self._dig_t3
+        return var1 + var2
+
+    def _compensate_pressure(self, adc_p: int, t_fine: float) -> float:
+        """Kompensation des Luftdrucks nach Datenblatt (Fließkomma) in hPa"""
+        var1 = t_fine / 2.0 - 64000.0
+        var2 = var1 * var1 * self._dig_p6 / 32768.0
+        var2 = var2 + var1 * self._dig_p5 * 2.0
+        var2 = var2 / 4.0 + self._dig_p4 * 65536.0
+        var1 = (self._dig_p3 * var1 * var1 / 524288.0 +
+                self._dig_p2 * var1) / 524288.0
+        var1 = (1.0 + var1 / 32768.0) * self._dig_p1
+        if var1 == 0:
+            # Division durch 0 vermeiden (fehlende Kalibrierdaten)
+            return None
+
+        p = 1048576.0 - adc_p
+        p = (p - var2 / 4096.0) * 6250.0 / var1
+        var1 = self._dig_p9 * p * p / 2147483648.0
+        var2 = p * self._dig_p8 / 32768.0
+        return (p + (var1 + var2 + self._dig_p7) / 16.0) / 100.0
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Serialisierter Zugriff auf einen physikalischen i2c Bus
+
+Alle Treiber (ADS1115, INA219, MPU6050, BMP280) teilen sich den i2c Bus 1,
+werden aber aus verschiedenen Threads heraus ausgelesen. Damit sich deren
+Transaktionen nicht gegenseitig unterbrechen, besitzt ein
+:class:`~driver.i2c_bus.I2CBusOwner` den Bus exklusiv. Alle Treiber reichen
+ihre Transaktionen über eine Warteschlange an genau einen Worker pro Bus ein.
+
+Mit einem :class:`~driver.i2c_bus.I2CBatch` werden mehrere Registerzugriffe
+(Zeiger schreiben + lesen) gesammelt und mit ``i2c_rdwr`` in möglichst
+wenigen ioctl ausgeführt.
+
+.. code-block:: python
+
+    bus_owner = I2CBusOwner(1)
+    fast = bus_owner.client(I2CBusOwner.PRIO_HIGH)
+    data = fast.read_i2c_block_data(0x48, 0x00, 2)
+
+    conf, conv = I2CBatch().read(0x48, 0x01, 2).read(0x48, 0x00, 2).run(fast)
+
+"""
+
+# Modul für die Warteschlange und den Worker
+import itertools
+import queue
+import threading
+import time
+
+# Modul für Futures
+import concurrent.futures
+
+# Import Logging Modul
+import logging
+
+import smbus2
+from smbus2 import i2c_msg
+
+
+class I2CBusOwner:
+    """Besitzer eines physikalischen i2c Busses
+
+    Die Klasse öffnet den Bus einmalig und führt alle Transaktionen in einem
+    eigenen Worker-Thread nacheinander aus. Die Transaktionen werden nach
+    Priorität und anschließend in der Reihenfolge des Eingangs abgearbeitet,
+    so dass z.B. die schnellen Gyro-Messungen vor den langsamen BMP280
+    Messungen bedient werden.
+
+    Eine Transaktion ist eine Funktion, die das SMBus Objekt als erstes
+    Argument erhält. Mehrere Zugriffe innerhalb einer Transaktion werden
+    nicht durch andere Threads unterbrochen.
+
+    :param busnum: Nummer des i2c Busses, defaults to 1
+    :type busnum: int, optional
+    :param bus: bereits geöffnetes SMBus Objekt, defaults to None
+    :type bus: smbus2.SMBus, optional
+    """
+
+    PRIO_HIGH = 0
+    """Priorität für die schnellen Sensoren (Gyro, Power, ADC)"""
+
+    PRIO_NORMAL = 5
+    """Standardpriorität"""
+
+    PRIO_LOW = 10
+    """Priorität für die langsamen Sensoren (BMP280)"""
+
+    def __init__(self, busnum = 1, bus = None):
+
+        self.busnum = busnum
+        self.bus = bus if bus is not None else smbus2.SMBus(busnum)
+
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+
+        # Statistik der Busauslastung
+        self._t_start = time.perf_counter()
+        self._busy_s = 0.0
+        self._cnt_transactions = 0
+        self._max_wait_s = 0.0
+
+        # ============================================
+        # Konfiguration des Logging
+        # ============================================
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        self._worker = threading.Thread(target=self._run, daemon=True,
+                                        name=f"i2c-bus-{busnum}")
+        self._worker.start()
+
+    def submit(self, func, *args, priority = PRIO_NORMAL,
+               **kwargs) -> concurrent.futures.Future:
+        """Einreichen einer Transaktion in die Warteschlange des Busses
+
+        :param func: Transaktion, welche als erstes Argument den Bus erhält
+        :type func: Callable
+        :param priority: Priorität (kleiner ist wichtiger), defaults to PRIO_NORMAL
+        :type priority: int, optional
+        :return: Future mit dem Ergebnis der Transaktion
+        :rtype: concurrent.futures.Future
+        """
+        future = concurrent.futures.Future()
+        self._queue.put((priority, next(self._seq), time.perf_counter(),
+                         future, func, args, kwargs))
+        return future
+
+    def call(self, func, *args, priority = PRIO_NORMAL, **kwargs):
+        """Ausführen einer Transaktion und Warten auf das Ergebnis
+
+        Wird die Methode aus einer laufenden Transaktion heraus aufgerufen,
+        so wird die Funktion direkt ausgeführt, um einen Deadlock zu
+        vermeiden.
+
+        :param func: Transaktion, welche als erstes Argument den Bus erhält
+        :type func: Callable
+        :param priority: Priorität (kleiner ist wichtiger), defaults to PRIO_NORMAL
+        :type priority: int, optional
+        :return: Ergebnis der Transaktion
+        """
+        if threading.current_thread() is self._worker:
+            return func(self.bus, *args, **kwargs)
+
+        return self.submit(func, *args, priority=priority,
+                           **kwargs).result()
+
+    def client(self, priority = PRIO_NORMAL) -> "I2CBusClient":
+        """Erzeugen eines SMBus kompatiblen Zugriffsobjektes
+
+        :param priority: Priorität aller Zugriffe des Clients, defaults to PRIO_NORMAL
+        :type priority: int, optional
+        :return: Client mit der Schnittstelle von smbus2.SMBus
+        :rtype: I2CBusClient
+        """
+        return I2CBusClient(self, priority)
+
+    def get_statistics(self) -> dict:
+        """Ausgabe der Busstatistik
+
+        :return: Auslastung [%], Anzahl Transaktionen, max. Wartezeit [s]
+        :rtype: dict
+        """
+        elapsed = time.perf_counter() - self._t_start
+        return {"utilisation": 100 * self._busy_s / elapsed if elapsed else 0,
+                "transactions": self._cnt_transactions,
+                "max_wait_s": self._max_wait_s}
+
+    def close(self) -> None:
+        """Beenden des Workers und Schließen des Busses"""
+        self._queue.put((-1, next(self._seq), 0, None, None, (), {}))
+        self._worker.join()
+        self.bus.close()
+
+    def _run(self) -> None:
+        """Worker: Abarbeitung der Warteschlange"""
+        while True:
+            _, _, t_submit, future, func, args, kwargs = self._queue.get()
+
+            # Beenden des Workers
+            if future is None:
+                return
+
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            t_start = time.perf_counter()
+            try:
+                future.set_result(func(self.bus, *args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            t_end = time.perf_counter()
+
+            self._busy_s += t_end - t_start
+            self._cnt_transactions += 1
+            if t_start - t_submit > self._max_wait_s:
+                self._max_wait_s = t_start - t_submit
+
+
+class I2CBusClient:
+    """SMBus kompatibler Zugriff über einen :class:`~driver.i2c_bus.I2CBusOwner`
+
+    Jeder Methodenaufruf (z.B. ``read_i2c_block_data``) wird als einzelne
+    Transaktion mit der Priorität des Clients an den Besitzer des Busses
+    übergeben. Der Client kann daher überall dort verwendet werden, wo
+    bisher ein ``smbus2.SMBus`` Objekt übergeben wurde.
+
+    :param owner: Besitzer des Busses
+    :type owner: I2CBusOwner
+    :param priority: Priorität aller Zugriffe
+    :type priority: int
+    """
+
+    def __init__(self, owner: I2CBusOwner, priority: int):
+        self.owner = owner
+        self.priority = priority
+
+    def transaction(self, func, *args, **kwargs):
+        """Ausführen mehrerer Buszugriffe ohne Unterbrechung
+
+        :param func: Transaktion, welche als erstes Argument den Bus erhält
+        :type func: Callable
+        :return: Ergebnis der Transaktion
+        """
+        return self.owner.call(func, *args, priority=self.priority, **kwargs)
+
+    def __getattr__(self, name):
+        # Weiterleitung aller SMBus Methoden als Transaktion
+        method = getattr(type(self.owner.bus), name)
+
+        def bus_method(*args, **kwargs):
+            return self.owner.call(method, *args, priority=self.priority,
+                                   **kwargs)
+
+        return bus_method
+
+
+class I2CRegisterDevice:
+    """Registerzugriff auf ein einzelnes i2c Device
+
+    Der Adapter bietet die von Adafruit_GPIO.I2C.Device bekannten Methoden,
+    damit der INA219 Treiber seine Zugriffe ebenfalls über einen
+    :class:`~driver.i2c_bus.I2CBusClient` ausführt.
+
+    :param bus: SMBus kompatibles Objekt
+    :type bus: I2CBusClient
+    :param address: i2c Adresse des Device
+    :type address: int
+    """
+
+    def __init__(self, bus, address: int):
+        self._bus = bus
+        self._address = address
+
+    def writeList(self, register: int, data: list) -> None:
+        """Schreiben einer Liste von Bytes ab dem Register"""
+        self._bus.write_i2c_block_data(self._address, register, data)
+
+    def readU16BE(self, register: int) -> int:
+        """Lesen eines vorzeichenlosen 16bit Registers (Big Endian)"""
+        data = self._bus.read_i2c_block_data(self._address, register, 2)
+        return (data[0] << 8) | data[1]
+
+    def readS16BE(self, register: int) -> int:
+        """Lesen eines vorzeichenbehafteten 16bit Registers (Big Endian)"""
+        value = self.readU16BE(register)
+        return value - 0x10000 if value > 0x7FFF else value
+
+    def readU16BE_list(self, registers: list) -> list:
+        """Lesen mehrerer vorzeichenloser 16bit Register in einem Batch"""
+        batch = I2CBatch()
+        for register in registers:
+            batch.read(self._address, register, 2)
+        return [(data[0] << 8) | data[1] for data in batch.run(self._bus)]
+
+
+class I2CBatch:
+    """Sammlung von Registerzugriffen für einen gemeinsamen ioctl
+
+    Jeder Zugriff besteht aus dem Schreiben des Registerzeigers und dem
+    Lesen bzw. Schreiben der Daten. Beim Ausführen werden alle Zugriffe zu
+    ``i2c_msg`` Nachrichten zusammengefasst und mit ``i2c_rdwr`` in einem
+    ioctl (bei mehr als :mod:`~driver.i2c_bus.I2CBatch.MAX_MSGS` Nachrichten
+    in wenigen ioctl) übertragen. Zwischen den Nachrichten erzeugt der Kernel
+    einen Repeated Start, die Zugriffe werden also nicht durch andere
+    Busteilnehmer unterbrochen.
+
+    Besitzt der Bus kein ``i2c_rdwr``, werden die Zugriffe einzeln mit den
+    SMBus Blockbefehlen ausgeführt.
+    """
+
+    MAX_MSGS = 42
+    """Maximale Anzahl Nachrichten pro ioctl (I2C_RDWR_IOCTL_MAX_MSGS)"""
+
+    def __init__(self):
+        self._ops = []
+
+    def read(self, address: int, register: int, length: int) -> "I2CBatch":
+        """Hinzufügen eines Lesezugriffs
+
+        :param address: i2c Adresse des Device
+        :type address: int
+        :param register: erstes zu lesendes Register
+        :type register: int
+        :param length: Anzahl zu lesender Bytes
+        :type length: int
+        :return: der Batch selbst zur Verkettung
+        :rtype: I2CBatch
+        """
+        self._ops.append((address, register, length, None))
+        return self
+
+    def write(self, address: int, register: int, data: list) -> "I2CBatch":
+        """Hinzufügen eines Schreibzugriffs
+
+        :param address: i2c Adresse des Device
+        :type address: int
+        :param register: erstes zu schreibendes Register
+        :type register: int
+        :param data: zu schreibende Bytes
+        :type data: list
+        :return: der Batch selbst zur Verkettung
+        :rtype: I2CBatch
+        """
+        self._ops.append((address, register, 0, list(data)))
+        return self
+
+    def run(self, bus) -> list:
+        """Ausführen als eine Transaktion auf einem Bus oder Client
+
+        :param bus: SMBus oder I2CBusClient
+        :return: Ergebnisse der Lesezugriffe in der Reihenfolge des Batches
+        :rtype: list[list[int]]
+        """
+        if hasattr(bus, "transaction"):
+            return bus.transaction(self.execute)
+        return self.execute(bus)
+
+    def execute(self, bus) -> list:
+        """Ausführen auf einem physikalischen Bus
+
+        :param bus: SMBus Objekt
+        :return: Ergebnisse der Lesezugriffe in der Reihenfolge des Batches
+        :rtype: list[list[int]]
+        """
+        if not hasattr(bus, "i2c_rdwr"):
+            return self._execute_smbus(bus)
+
+        results = []
+        msgs = []
+        reads = []
+        for address, register, length, data in self._ops:
+            # Zeiger schreiben und lesen bleiben im selben ioctl
+            if len(msgs) + 2 > self.MAX_MSGS:
+                bus.i2c_rdwr(*msgs)
+                results.extend(list(msg) for msg in reads)
+                msgs, reads = [], []
+
+            if data is None:
+                msgs.append(i2c_msg.write(address, [register]))
+                reads.append(i2c_msg.read(address, length))
+                msgs.append(reads[-1])
+            else:
+                msgs.append(i2c_msg.write(address, [register] + data))
+
+        if msgs:
+            bus.i2c_rdwr(*msgs)
+            results.extend(list(msg) for msg in reads)
+        return results
+
+    def _execute_smbus(self, bus) -> list:
+        results = []
+        for address, register, length, data in self._ops:
+            if data is None:
+                results.append(bus.read_i2c_block_data(address, register, length))
+            else:
+                bus.write_i2c_block_data(address, register, data)
+        return results
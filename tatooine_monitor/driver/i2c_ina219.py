@@ -8,6 +8,7 @@ Der INA219 Sensor ist ein Baustein von Texas Instruments, welche Strom, Spannung
 
 """
 import logging
+import threading
 import time
 from math import trunc
 import Adafruit_GPIO.I2C as I2C
@@ -70,6 +71,13 @@ class INA219:
 
     __CONT_SH_BUS = 7
 
+    # Conversion time in us of each ADC setting (Table 5 of the spec)
+    __ADC_CONVERSION_US = {ADC_9BIT: 84, ADC_10BIT: 148, ADC_11BIT: 276,
+                           ADC_12BIT: 532, ADC_2SAMP: 1060, ADC_4SAMP: 2130,
+                           ADC_8SAMP: 4260, ADC_16SAMP: 8510,
+                           ADC_32SAMP: 17020, ADC_64SAMP: 34050,
+                           ADC_128SAMP: 68100}
+
     __AMP_ERR_MSG = ('Expected current %.3fA is greater '
                      'than max possible current %.3fA')
     __RNG_ERR_MSG = ('Expected amps %.2fA, out of range, use a lower '
@@ -97,7 +105,7 @@ class INA219:
 
     def __init__(self, shunt_ohms, max_expected_amps=None,
                  busnum=None, address=__ADDRESS,
-                 log_level=logging.ERROR):
+                 log_level=logging.ERROR, i2c=None):
         """Construct the class.
 
         Pass in the resistance of the shunt resistor and the maximum expected
@@ -110,6 +118,9 @@ class INA219:
             to *0x40* (optional).
         log_level -- set to logging.DEBUG to see detailed calibration
             calculations (optional).
+        i2c -- register device with readU16BE/readS16BE/writeList, e.g.
+            driver.i2c_bus.I2CRegisterDevice. Defaults to an Adafruit
+            I2C device on busnum (optional).
         """
         if len(logging.getLogger().handlers) == 0:
             # Initialize the root logger only if it hasn't been done yet by a
@@ -118,12 +129,17 @@ class INA219:
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(log_level)
 
-        self._i2c = I2C.get_i2c_device(address=address, busnum=busnum)
+        if i2c is not None:
+            self._i2c = i2c
+        else:
+            self._i2c = I2C.get_i2c_device(address=address, busnum=busnum)
         self._shunt_ohms = shunt_ohms
         self._max_expected_amps = max_expected_amps
         self._min_device_current_lsb = self._calculate_min_current_lsb()
         self._gain = None
         self._auto_gain_enabled = False
+        self._conversion_time = self.__conversion_time(self.ADC_12BIT,
+                                                       self.ADC_12BIT)
 
     def configure(self, voltage_range=RANGE_32V, gain=GAIN_AUTO,
                   bus_adc=ADC_12BIT, shunt_adc=ADC_12BIT):
@@ -179,6 +195,43 @@ class INA219:
             self.__BUS_RANGE[voltage_range], self.__GAIN_VOLTS[self._gain],
             self._max_expected_amps)
         self._configure(voltage_range, self._gain, bus_adc, shunt_adc)
+        self._conversion_time = self.__conversion_time(bus_adc, shunt_adc)
+
+    def measure(self):
+        """Return a consistent (voltage, current, power) reading.
+
+        The INA219 has to be configured once with configure(). The bus
+        voltage register is polled until the conversion ready flag (CNVR)
+        is set, then current and power are read from the same conversion.
+        Reading the power register clears CNVR again. The calibration is
+        only rewritten if auto gain detects a current overflow.
+
+        Returns a tuple of bus voltage in volts, current in milliamps and
+        power in milliwatts. A DeviceRangeError exception is thrown if
+        current overflow occurs and the gain cannot be increased.
+        """
+        deadline = time.monotonic() + 2 * self._conversion_time
+        while True:
+            register_value, current, power = \
+                self._read_measurement_registers()
+            if register_value & self.__OVF:
+                if not self._auto_gain_enabled:
+                    raise DeviceRangeError(self.__GAIN_VOLTS[self._gain])
+                self._increase_gain()
+                deadline = time.monotonic() + 2 * self._conversion_time
+                continue
+            # Without a new conversion the registers still hold the last one
+            if register_value & self.__CNVR or time.monotonic() >= deadline:
+                break
+            time.sleep(self._conversion_time / 4)
+
+        voltage = float(register_value >> 3) * self.__BUS_MILLIVOLTS_LSB / 1000
+        return (voltage, current * self._current_lsb * 1000,
+                power * self._power_lsb * 1000)
+
+    def conversion_time(self):
+        """Return the time in seconds of one conversion of shunt and bus."""
+        return self._conversion_time
 
     def voltage(self):
         """Return the bus voltage in volts."""
@@ -333,7 +386,7 @@ class INA219:
         return current_lsb
 
     def _configuration_register(self, register_value):
-        self.logger.debug("configuration: 0x%04x" % register_value)
+        self.logger.debug("configuration: 0x%04x", register_value)
         self.__write_register(self.__REG_CONFIG, register_value)
 
     def _read_configuration(self):
@@ -357,13 +410,24 @@ class INA219:
         self.logger.info("gain set to: %.2fV" % self.__GAIN_VOLTS[gain])
 
     def _calibration_register(self, register_value):
-        self.logger.debug("calibration: 0x%04x" % register_value)
+        self.logger.debug("calibration: 0x%04x", register_value)
         self.__write_register(self.__REG_CALIBRATION, register_value)
 
     def _has_current_overflow(self):
         ovf = self._read_voltage_register() & self.__OVF
         return (ovf == 1)
 
+    def _read_measurement_registers(self):
+        # Bus voltage, current and power in one I2C batch if supported
+        if hasattr(self._i2c, 'readU16BE_list'):
+            voltage, current, power = self._i2c.readU16BE_list(
+                [self.__REG_BUSVOLTAGE, self.__REG_CURRENT, self.__REG_POWER])
+            if current > 0x7FFF:
+                current -= 0x10000
+            return voltage, current, power
+        return (self._read_voltage_register(), self._current_register(),
+                self._power_register())
+
     def _voltage_register(self):
         register_value = self._read_voltage_register()
         return register_value >> 3
@@ -384,12 +448,18 @@ class INA219:
         if voltage_range > len(self.__BUS_RANGE) - 1:
             raise ValueError(self.__VOLT_ERR_MSG)
 
+    def __conversion_time(self, bus_adc, shunt_adc):
+        # Shunt and bus voltage are converted one after the other
+        return (self.__ADC_CONVERSION_US.get(bus_adc, 532) +
+                self.__ADC_CONVERSION_US.get(shunt_adc, 532)) / 1e6
+
     def __write_register(self, register, register_value):
         register_bytes = self.__to_bytes(register_value)
-        self.logger.debug(
-            "write register 0x%02x: 0x%04x 0b%s" %
-            (register, register_value,
-             self.__binary_as_string(register_value)))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "write register 0x%02x: 0x%04x 0b%s" %
+                (register, register_value,
+                 self.__binary_as_string(register_value)))
         self._i2c.writeList(register, register_bytes)
 
     def __read_register(self, register, negative_value_supported=False):
@@ -397,10 +467,11 @@ class INA219:
             register_value = self._i2c.readS16BE(register)
         else:
             register_value = self._i2c.readU16BE(register)
-        self.logger.debug(
-            "read register 0x%02x: 0x%04x 0b%s" %
-            (register, register_value,
-             self.__binary_as_string(register_value)))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "read register 0x%02x: 0x%04x 0b%s" %
+                (register, register_value,
+                 self.__binary_as_string(register_value)))
         return register_value
 
     def __to_bytes(self, register_value):
@@ -416,6 +487,120 @@ class INA219:
             return ', max expected amps: %.3fA' % max_expected_amps
 
 
+class INA219Monitor:
+    """Background reader for an INA219 in hardware averaged continuous mode.
+
+    The INA219 averages each conversion in hardware (ADC_2SAMP ...
+    ADC_128SAMP). A daemon thread reads every conversion with
+    INA219.measure() and accumulates per-interval minimum, maximum and mean
+    values of the current together with the mean voltage and power. Charge
+    (mAh) and energy (mWh) are integrated over all conversions, so current
+    spikes between two calls of get_interval() are not lost.
+
+    Without the background reader, sample() has to be called once per
+    interval; the statistics are then built from these single readings.
+
+    Arguments:
+    ina -- configured INA219 instance (mandatory).
+    background -- start the background reader, defaults to True (optional).
+    """
+
+    def __init__(self, ina, background=True):
+        """Construct the monitor and start the background reader."""
+        self.logger = logging.getLogger(__name__)
+
+        self._ina = ina
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._charge_mah = 0.0
+        self._energy_mwh = 0.0
+        self._last = None
+        self._reset_interval()
+
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._run, daemon=True,
+                                            name="ina219-monitor")
+            self._thread.start()
+
+    def sample(self):
+        """Read one conversion and add it to the current interval."""
+        voltage, current, power = self._ina.measure()
+        self._add(time.monotonic(), voltage, current, power)
+
+    def get_interval(self):
+        """Return the statistics since the last call and start a new interval.
+
+        Returns a dict with voltage, current, power (interval means),
+        current_min, current_max, charge_mah, energy_mwh and samples. If no
+        conversion has finished in the interval, the values of the last
+        conversion are returned.
+        """
+        with self._lock:
+            n = self._n
+            if n:
+                values = {"voltage": self._sum_voltage / n,
+                          "current": self._sum_current / n,
+                          "power": self._sum_power / n,
+                          "current_min": self._min_current,
+                          "current_max": self._max_current}
+            elif self._last is not None:
+                voltage, current, power = self._last[1:]
+                values = {"voltage": voltage, "current": current,
+                          "power": power, "current_min": current,
+                          "current_max": current}
+            else:
+                values = {}
+            values["charge_mah"] = self._charge_mah
+            values["energy_mwh"] = self._energy_mwh
+            values["samples"] = n
+            self._reset_interval()
+
+        return values
+
+    def close(self):
+        """Stop the background reader."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _reset_interval(self):
+        self._n = 0
+        self._sum_voltage = 0.0
+        self._sum_current = 0.0
+        self._sum_power = 0.0
+        self._min_current = float("inf")
+        self._max_current = float("-inf")
+
+    def _add(self, timestamp, voltage, current, power):
+        with self._lock:
+            # Integration of charge and energy (trapezoidal rule)
+            if self._last is not None:
+                dt_h = (timestamp - self._last[0]) / 3600
+                self._charge_mah += (current + self._last[2]) / 2 * dt_h
+                self._energy_mwh += (power + self._last[3]) / 2 * dt_h
+            self._last = (timestamp, voltage, current, power)
+
+            self._n += 1
+            self._sum_voltage += voltage
+            self._sum_current += current
+            self._sum_power += power
+            if current < self._min_current:
+                self._min_current = current
+            if current > self._max_current:
+                self._max_current = current
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.warning("INA219 continuous read failed: %s", e)
+            # The next averaged conversion is ready after one conversion time
+            self._stop.wait(self._ina.conversion_time())
+
+
 class DeviceRangeError(Exception):
     """Class containing the INA219 error functionality."""
 
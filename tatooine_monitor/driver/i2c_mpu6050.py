@@ -9,7 +9,13 @@ Copyright (c) 2015, 2016, 2017, 2021 Martijn (martijn@mrtijn.nl) and contributer
 https://github.com/m-rtijn/mpu6050
 """
 
+import logging
+import threading
+
 import smbus2
+import numpy as np
+
+from driver.i2c_bus import I2CBatch
 
 class mpu6050:
 
@@ -66,12 +72,47 @@ class mpu6050:
     GYRO_CONFIG = 0x1B
     MPU_CONFIG = 0x1A
 
+    # FIFO Registers
+    SMPLRT_DIV = 0x19
+    FIFO_EN = 0x23
+    INT_STATUS = 0x3A
+    USER_CTRL = 0x6A
+    FIFO_COUNTH = 0x72
+    FIFO_R_W = 0x74
+
+    FIFO_SIZE = 1024
+    # Accel, temperature and gyro, same layout as get_snapshot()
+    FIFO_FRAME_SIZE = 14
+    FIFO_EN_TEMP_ACCEL_GYRO = 0xF8
+    USER_CTRL_FIFO_EN = 0x40
+    USER_CTRL_FIFO_RESET = 0x04
+    INT_FIFO_OFLOW = 0x10
+    # Two frames per block read, SMBus block transfers are limited to 32 bytes
+    FIFO_READ_CHUNK = 28
+
     def __init__(self, address, bus=1):
+        """bus -- number of the i2c bus or an already opened SMBus compatible
+        object (e.g. a client of driver.i2c_bus.I2CBusOwner).
+        """
         self.address = address
-        self.bus = smbus2.SMBus(bus)
+        if isinstance(bus, int):
+            self.bus = smbus2.SMBus(bus)
+        else:
+            self.bus = bus
         # Wake up the MPU-6050 since it starts in sleep mode
         self.bus.write_byte_data(self.address, self.PWR_MGMT_1, 0x00)
 
+        # The ranges are read once and cached, set_*_range() keeps them
+        # up to date
+        self._accel_scale_modifier = self.__accel_scale_modifier(
+            self.read_accel_range(True))
+        self._gyro_scale_modifier = self.__gyro_scale_modifier(
+            self.read_gyro_range(True))
+        self.__update_snapshot_scale()
+
+        self.fifo_sample_rate = None
+        self.fifo_overflows = 0
+
     # I2C communication methods
 
     def read_i2c_word(self, register):
@@ -79,9 +120,8 @@ class mpu6050:
         register -- the first register to read from.
         Returns the combined read results.
         """
-        # Read the data from the registers
-        high = self.bus.read_byte_data(self.address, register)
-        low = self.bus.read_byte_data(self.address, register + 1)
+        # Read both registers in one block transfer
+        high, low = self.bus.read_i2c_block_data(self.address, register, 2)
 
         value = (high << 8) + low
 
@@ -90,8 +130,69 @@ class mpu6050:
         else:
             return value
 
+    def __accel_scale_modifier(self, accel_range):
+        if accel_range == self.ACCEL_RANGE_2G:
+            return self.ACCEL_SCALE_MODIFIER_2G
+        elif accel_range == self.ACCEL_RANGE_4G:
+            return self.ACCEL_SCALE_MODIFIER_4G
+        elif accel_range == self.ACCEL_RANGE_8G:
+            return self.ACCEL_SCALE_MODIFIER_8G
+        elif accel_range == self.ACCEL_RANGE_16G:
+            return self.ACCEL_SCALE_MODIFIER_16G
+        else:
+            print("Unkown range - accel_scale_modifier set to self.ACCEL_SCALE_MODIFIER_2G")
+            return self.ACCEL_SCALE_MODIFIER_2G
+
+    def __gyro_scale_modifier(self, gyro_range):
+        if gyro_range == self.GYRO_RANGE_250DEG:
+            return self.GYRO_SCALE_MODIFIER_250DEG
+        elif gyro_range == self.GYRO_RANGE_500DEG:
+            return self.GYRO_SCALE_MODIFIER_500DEG
+        elif gyro_range == self.GYRO_RANGE_1000DEG:
+            return self.GYRO_SCALE_MODIFIER_1000DEG
+        elif gyro_range == self.GYRO_RANGE_2000DEG:
+            return self.GYRO_SCALE_MODIFIER_2000DEG
+        else:
+            print("Unkown range - gyro_scale_modifier set to self.GYRO_SCALE_MODIFIER_250DEG")
+            return self.GYRO_SCALE_MODIFIER_250DEG
+
+    def __update_snapshot_scale(self):
+        # Factors for accel x/y/z, temperature and gyro x/y/z of a snapshot
+        accel = 1.0 / self._accel_scale_modifier
+        gyro = 1.0 / self._gyro_scale_modifier
+        self._snapshot_scale_g = np.array(
+            [accel] * 3 + [1.0 / 340.0] + [gyro] * 3)
+        self._snapshot_scale_ms2 = self._snapshot_scale_g.copy()
+        self._snapshot_scale_ms2[0:3] *= self.GRAVITIY_MS2
+        self._snapshot_offset = np.array([0.0] * 3 + [36.53] + [0.0] * 3)
+
+    def read_i2c_words(self, register, count):
+        """Read count consecutive 16 bit registers in one block transfer.
+
+        register -- the first register to read from.
+        count -- number of 16 bit words.
+
+        Returns a numpy array of the signed values.
+        """
+        data = self.bus.read_i2c_block_data(self.address, register, 2 * count)
+        return np.frombuffer(bytes(data), dtype='>i2')
+
     # MPU-6050 Methods
 
+    def get_snapshot(self, g = False):
+        """Reads accelerometer, temperature and gyroscope in one block.
+
+        The registers 0x3B - 0x48 are read with a single 14 byte block
+        transfer and converted with the cached ranges.
+        If g is True, the acceleration is returned in g, otherwise in m/s^2.
+
+        Returns a numpy array [accel x, y, z, temperature, gyro x, y, z].
+        """
+        raw = self.read_i2c_words(self.ACCEL_XOUT0, 7)
+        scale = self._snapshot_scale_g if g else self._snapshot_scale_ms2
+        return raw * scale + self._snapshot_offset
+
+
     def get_temp(self):
         """Reads the temperature from the onboard temperature sensor of the MPU-6050.
         Returns the temperature in degrees Celcius.
@@ -115,6 +216,9 @@ class mpu6050:
         # Write the new range to the ACCEL_CONFIG register
         self.bus.write_byte_data(self.address, self.ACCEL_CONFIG, accel_range)
 
+        self._accel_scale_modifier = self.__accel_scale_modifier(accel_range)
+        self.__update_snapshot_scale()
+
     def read_accel_range(self, raw = False):
         """Reads the range the accelerometer is set to.
         If raw is True, it will return the raw value from the ACCEL_CONFIG
@@ -144,24 +248,9 @@ class mpu6050:
         If g is False, it will return the data in m/s^2
         Returns a dictionary with the measurement results.
         """
-        x = self.read_i2c_word(self.ACCEL_XOUT0)
-        y = self.read_i2c_word(self.ACCEL_YOUT0)
-        z = self.read_i2c_word(self.ACCEL_ZOUT0)
+        x, y, z = self.read_i2c_words(self.ACCEL_XOUT0, 3).tolist()
 
-        accel_scale_modifier = None
-        accel_range = self.read_accel_range(True)
-
-        if accel_range == self.ACCEL_RANGE_2G:
-            accel_scale_modifier = self.ACCEL_SCALE_MODIFIER_2G
-        elif accel_range == self.ACCEL_RANGE_4G:
-            accel_scale_modifier = self.ACCEL_SCALE_MODIFIER_4G
-        elif accel_range == self.ACCEL_RANGE_8G:
-            accel_scale_modifier = self.ACCEL_SCALE_MODIFIER_8G
-        elif accel_range == self.ACCEL_RANGE_16G:
-            accel_scale_modifier = self.ACCEL_SCALE_MODIFIER_16G
-        else:
-            print("Unkown range - accel_scale_modifier set to self.ACCEL_SCALE_MODIFIER_2G")
-            accel_scale_modifier = self.ACCEL_SCALE_MODIFIER_2G
+        accel_scale_modifier = self._accel_scale_modifier
 
         x = x / accel_scale_modifier
         y = y / accel_scale_modifier
@@ -186,6 +275,9 @@ class mpu6050:
         # Write the new range to the ACCEL_CONFIG register
         self.bus.write_byte_data(self.address, self.GYRO_CONFIG, gyro_range)
 
+        self._gyro_scale_modifier = self.__gyro_scale_modifier(gyro_range)
+        self.__update_snapshot_scale()
+
     def set_filter_range(self, filter_range=FILTER_BW_256):
         """Sets the low-pass bandpass filter frequency"""
         # Keep the current EXT_SYNC_SET configuration in bits 3, 4, 5 in the MPU_CONFIG register
@@ -220,24 +312,9 @@ class mpu6050:
         """Gets and returns the X, Y and Z values from the gyroscope.
         Returns the read values in a dictionary.
         """
-        x = self.read_i2c_word(self.GYRO_XOUT0)
-        y = self.read_i2c_word(self.GYRO_YOUT0)
-        z = self.read_i2c_word(self.GYRO_ZOUT0)
+        x, y, z = self.read_i2c_words(self.GYRO_XOUT0, 3).tolist()
 
-        gyro_scale_modifier = None
-        gyro_range = self.read_gyro_range(True)
-
-        if gyro_range == self.GYRO_RANGE_250DEG:
-            gyro_scale_modifier = self.GYRO_SCALE_MODIFIER_250DEG
-        elif gyro_range == self.GYRO_RANGE_500DEG:
-            gyro_scale_modifier = self.GYRO_SCALE_MODIFIER_500DEG
-        elif gyro_range == self.GYRO_RANGE_1000DEG:
-            gyro_scale_modifier = self.GYRO_SCALE_MODIFIER_1000DEG
-        elif gyro_range == self.GYRO_RANGE_2000DEG:
-            gyro_scale_modifier = self.GYRO_SCALE_MODIFIER_2000DEG
-        else:
-            print("Unkown range - gyro_scale_modifier set to self.GYRO_SCALE_MODIFIER_250DEG")
-            gyro_scale_modifier = self.GYRO_SCALE_MODIFIER_250DEG
+        gyro_scale_modifier = self._gyro_scale_modifier
 
         x = x / gyro_scale_modifier
         y = y / gyro_scale_modifier
@@ -245,6 +322,79 @@ class mpu6050:
 
         return {'x': x, 'y': y, 'z': z}
 
+    def enable_fifo(self, sample_rate=100, filter_range=FILTER_BW_42):
+        """Starts buffering accelerometer, temperature and gyroscope in the FIFO.
+
+        sample_rate -- sample rate in Hz, 4 ... 1000 Hz with the digital low
+        pass filter enabled (defaults to 100).
+        filter_range -- low pass filter, FILTER_BW_256 switches the gyro
+        output rate to 8 kHz (defaults to FILTER_BW_42).
+
+        Returns the actual sample rate in Hz.
+        """
+        self.set_filter_range(filter_range)
+
+        # Sample rate = gyroscope output rate / (1 + SMPLRT_DIV)
+        gyro_rate = 8000 if filter_range == self.FILTER_BW_256 else 1000
+        divider = min(255, max(0, round(gyro_rate / sample_rate) - 1))
+        self.bus.write_byte_data(self.address, self.SMPLRT_DIV, divider)
+        self.fifo_sample_rate = gyro_rate / (1 + divider)
+
+        self.bus.write_byte_data(self.address, self.FIFO_EN,
+                                 self.FIFO_EN_TEMP_ACCEL_GYRO)
+        self.reset_fifo()
+        return self.fifo_sample_rate
+
+    def reset_fifo(self):
+        """Clears the FIFO and keeps it enabled."""
+        self.bus.write_byte_data(self.address, self.USER_CTRL, 0x00)
+        self.bus.write_byte_data(self.address, self.USER_CTRL,
+                                 self.USER_CTRL_FIFO_RESET)
+        self.bus.write_byte_data(self.address, self.USER_CTRL,
+                                 self.USER_CTRL_FIFO_EN)
+
+    def disable_fifo(self):
+        """Stops buffering in the FIFO."""
+        self.bus.write_byte_data(self.address, self.USER_CTRL, 0x00)
+        self.bus.write_byte_data(self.address, self.FIFO_EN, 0x00)
+        self.fifo_sample_rate = None
+
+    def read_fifo(self, g = False):
+        """Reads all complete frames from the FIFO.
+
+        The fill level and the overflow flag are read in one batch, then the
+        frames are drained with block reads of FIFO_R_W in a second batch.
+        After an overflow the frame alignment is lost, so the FIFO is reset
+        and no frames are returned.
+        If g is True, the acceleration is returned in g, otherwise in m/s^2.
+
+        Returns a numpy array with one row [accel x, y, z, temperature,
+        gyro x, y, z] per sample, oldest sample first.
+        """
+        status, count = I2CBatch() \
+            .read(self.address, self.INT_STATUS, 1) \
+            .read(self.address, self.FIFO_COUNTH, 2).run(self.bus)
+
+        if status[0] & self.INT_FIFO_OFLOW:
+            self.fifo_overflows += 1
+            self.reset_fifo()
+            return np.empty((0, 7))
+
+        length = ((count[0] << 8) | count[1]) // self.FIFO_FRAME_SIZE \
+            * self.FIFO_FRAME_SIZE
+        if length == 0:
+            return np.empty((0, 7))
+
+        batch = I2CBatch()
+        for offset in range(0, length, self.FIFO_READ_CHUNK):
+            batch.read(self.address, self.FIFO_R_W,
+                       min(self.FIFO_READ_CHUNK, length - offset))
+        data = bytes(b for chunk in batch.run(self.bus) for b in chunk)
+
+        raw = np.frombuffer(data, dtype='>i2').reshape(-1, 7)
+        scale = self._snapshot_scale_g if g else self._snapshot_scale_ms2
+        return raw * scale + self._snapshot_offset
+
     def get_all_data(self):
         """Reads and returns all the available data."""
         temp = self.get_temp()
@@ -253,3 +403,91 @@ class mpu6050:
 
         return [accel, gyro, temp]
 
+
+class MPU6050FifoReader:
+    """Background reader draining the FIFO of a MPU-6050 into a ring buffer.
+
+    The MPU-6050 samples at the FIFO sample rate (up to 1 kHz). A daemon
+    thread drains the FIFO well before it can overflow and stores the
+    samples in a numpy ring buffer covering the last buffer_s seconds.
+    get_new() returns all samples since its last call, get_window() the
+    most recent samples, e.g. for a spectral analysis.
+
+    mpu -- mpu6050 instance with the FIFO enabled (mandatory).
+    buffer_s -- length of the ring buffer in seconds (defaults to 10).
+    g -- acceleration in g instead of m/s^2 (defaults to True).
+    """
+
+    def __init__(self, mpu, buffer_s = 10.0, g = True):
+        self.logger = logging.getLogger(__name__)
+
+        if mpu.fifo_sample_rate is None:
+            raise ValueError("FIFO of the MPU-6050 is not enabled")
+
+        self.mpu = mpu
+        self.g = g
+        self.sample_rate = mpu.fifo_sample_rate
+        self.capacity = max(1, int(buffer_s * self.sample_rate))
+
+        self.cnt_samples = 0
+        self._buffer = np.zeros((self.capacity, 7))
+        self._read_mark = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        # Drain at a third of the time the FIFO needs to fill up
+        fill_time = mpu.FIFO_SIZE // mpu.FIFO_FRAME_SIZE / self.sample_rate
+        self.period = min(0.1, fill_time / 3)
+
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="mpu6050-fifo")
+        self._thread.start()
+
+    def get_new(self):
+        """Returns all samples since the last call, oldest sample first.
+
+        If more samples arrived than fit into the ring buffer, only the
+        most recent ones are returned.
+        """
+        with self._lock:
+            n = min(self.cnt_samples - self._read_mark, self.capacity)
+            self._read_mark = self.cnt_samples
+            return self._latest(n)
+
+    def get_window(self, n):
+        """Returns the last n samples (or less), oldest sample first."""
+        with self._lock:
+            return self._latest(min(n, self.cnt_samples, self.capacity))
+
+    def close(self):
+        """Stops the background reader."""
+        self._stop.set()
+        self._thread.join()
+
+    def _latest(self, n):
+        end = self.cnt_samples % self.capacity
+        index = np.arange(end - n, end) % self.capacity
+        return self._buffer[index]
+
+    def _push(self, block):
+        n = len(block)
+        with self._lock:
+            if n > self.capacity:
+                block = block[-self.capacity:]
+                self.cnt_samples += n - self.capacity
+                n = self.capacity
+            start = self.cnt_samples % self.capacity
+            first = min(n, self.capacity - start)
+            self._buffer[start:start + first] = block[:first]
+            self._buffer[:n - first] = block[first:]
+            self.cnt_samples += n
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                block = self.mpu.read_fifo(self.g)
+                if len(block):
+                    self._push(block)
+            except Exception as e:
+                self.logger.warning("MPU-6050 FIFO read failed: %s", e)
+            self._stop.wait(self.period)
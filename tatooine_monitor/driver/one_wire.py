@@ -5,11 +5,16 @@
 import re
 
 # Modul zur Bearbeitung der Zeitstempel
-import datetime
+import time
 
 # Module zur Bearbeitung von Files
-from os import listdir, path
-from os.path import isfile, join
+import os
+from os import listdir
+from os.path import join
+
+# Module für die parallele Auslesung und den Zugriff auf den Cache
+import concurrent.futures
+import threading
 
 # Import Logging Modul
 import logging
@@ -21,14 +26,26 @@ class OneWire:
     Bus die DS18220 Sensoren auslesen zu können. Dabei ist zu beachten, dass
     diese Sensoren eine hohe Latenz besitzen und daher die Auslesung über
     Multithreading erfolgen sollte.
+
+    Die Klasse hält dafür einen dauerhaften Thread Pool. Die Liste der
+    Sensoren und die geöffneten Messfiles werden zwischengespeichert und nur
+    alle :mod:`~driver.one_wire.OneWire.RESCAN_INTERVAL_S` Sekunden neu
+    eingelesen, damit nachträglich angeschlossene Sensoren erkannt werden. Pro
+    Zyklus werden so nur noch die bereits geöffneten Files gelesen.
+
+    Mit :func:`~driver.one_wire.OneWire.read_ds18s20_bulk` wird über das
+    Attribut ``therm_bulk_read`` des Busmasters eine gleichzeitige Wandlung
+    aller Sensoren gestartet. Danach wird nur einmal die Wandlungszeit
+    abgewartet und die Temperatur jedes Sensors aus seinem Attribut
+    ``temperature`` gelesen, ohne eine weitere Wandlung auszulösen. Ein Zyklus
+    dauert so unabhängig von der Anzahl der Sensoren eine Wandlungszeit.
     
     .. code-block:: python
     
+        sensor = OneWire()
         sensor.show_all_devices()
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            results = [executor.submit(sensor.read_1w_sensor_ds18s20,i) for i in sensor.list_all_devices()]
-            for f in concurrent.futures.as_completed(results):
-                print(f.result())
+        print(sensor.read_ds18s20_devices())
+        sensor.close()
     
     Dabei wird vorausgesetzt, dass zuvor mit raspi-config die 1Wire
     Intergration aktiviert wurde und ein entsprechender GPIO definiert
@@ -47,14 +64,69 @@ class OneWire:
     _temp_sensor_1w_filename = "-"
     """Dateiname mit dem Messwert des DS18S20 Temperatursensors"""
 
+    _RE_DEVICE = re.compile(r"[0-9a-f]{2}-[0-9a-f]{12}")
+    """Typischer Aufbau des Filenamens eines 1-Wire Sensors (3a-0000003820a6)"""
+
+    _DS18S20_FAMILY = "28-"
+    """Familienkennung der DS18S20 Sensoren"""
+
+    RESCAN_INTERVAL_S = 60.0
+    """Standardintervall für das erneute Einlesen der Sensorliste in s"""
+
+    _RE_MASTER = re.compile(r"w1_bus_master[0-9]+$")
+    """Verzeichnisname eines 1-Wire Busmasters"""
+
+    _BULK_READ_FNAME = "therm_bulk_read"
+    """Attribut des Busmasters für die gleichzeitige Wandlung aller Sensoren"""
+
+    _TEMPERATURE_FNAME = "temperature"
+    """Attribut eines Sensors mit der zuletzt gewandelten Temperatur in m°C"""
+
+    CONVERSION_TIME_S = 0.75
+    """Maximale Wandlungszeit eines DS18S20 in s (12 Bit)"""
+
+    _RESOLUTION_FNAME = "resolution"
+    """Attribut eines Sensors mit der Auflösung in Bit"""
+
+    _CONVERSION_TIME_BY_RESOLUTION_S = {9: 0.09375, 10: 0.1875, 11: 0.375,
+                                        12: 0.75}
+    """Maximale Wandlungszeit in s je Auflösung in Bit (Datenblatt DS18B20)"""
+
+    BUS_TIME_PER_SENSOR_S = 0.015
+    """Geschätzte Buszeit für das Auslesen des Scratchpads eines Sensors in s"""
+
+    CRC_RETRY_BUDGET = 3
+    """Standardanzahl der Wiederholungen fehlerhafter Auslesungen pro Zyklus"""
+
+    QUALITY_OK = 0
+    """Qualitätscode: Messwert gültig"""
+
+    QUALITY_CRC_ERROR = 1
+    """Qualitätscode: CRC des Scratchpads fehlerhaft"""
+
+    QUALITY_READ_ERROR = 2
+    """Qualitätscode: Attribut nicht lesbar (z.B. Sensor abgezogen)"""
+
+    QUALITY_FORMAT_ERROR = 3
+    """Qualitätscode: unerwarteter Inhalt des Attributs"""
+
+    _READ_BUFFER_SIZE = 128
+    """Größe der Lesepuffer pro Attribut (w1_slave umfasst 78 Byte)"""
+
     def __init__(self, path_to_1wire = "/sys/bus/w1/devices", 
-                 ds18s20_fname = "w1_slave"):
+                 ds18s20_fname = "w1_slave",
+                 rescan_interval_s: float = RESCAN_INTERVAL_S,
+                 max_workers: int = 8):
         """Initialisierung der 1 Wire Treiber Klasse
 
         :param path_to_1wire: Systempfades für die 1-Wire Sensoren, defaults to "/sys/bus/w1/devices"
         :type path_to_1wire: str, optional
         :param ds18s20_fname: Filename mit den Sensorwerten des DS18s20, defaults to "w1_slave"
         :type ds18s20_fname: str, optional
+        :param rescan_interval_s: Intervall für das erneute Einlesen der Sensorliste, defaults to RESCAN_INTERVAL_S
+        :type rescan_interval_s: float, optional
+        :param max_workers: Anzahl der Threads für die parallele Auslesung, defaults to 8
+        :type max_workers: int, optional
         """
         
         # ============================================
@@ -68,11 +140,58 @@ class OneWire:
         self._temp_sensor_1w_filename = ds18s20_fname
         # Festlegen des Systempfades für die 1-Wire Sensoren
         self._path_to_1W_sensors = path_to_1wire
+
+        self.rescan_interval_s = rescan_interval_s
+
+        # Zwischengespeicherte Sensorliste und geöffnete Messfiles
+        self._lock = threading.Lock()
+        self._devices = []
+        self._masters = []
+        self._fds = {}
+        self._buffers = {}
+        self._t_scan = 0.0
+
+        # Dauerhafter Thread Pool für die parallele Auslesung
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="one_wire")
+
+        self.rescan()
     
         # Logging Info
         self.logger.info(f'Folgende 1-wire Sensoren wurden unter {path_to_1wire} gefunden: \n{self.list_all_devices()}')
         
         
+    def rescan(self) -> None:
+        """Erneutes Einlesen der Sensorliste aus dem Systemverzeichnis
+
+        Neue Sensoren werden aufgenommen. Die Messfiles entfernter Sensoren
+        werden geschlossen.
+        """
+        try:
+            entries = listdir(self._path_to_1W_sensors)
+        except OSError:
+            self.logger.warning(f'1-Wire Verzeichnis {self._path_to_1W_sensors} nicht lesbar')
+            entries = []
+
+        devices = sorted(f for f in entries if self._RE_DEVICE.match(f))
+        masters = sorted(f for f in entries if self._RE_MASTER.match(f))
+
+        with self._lock:
+            for key in [key for key in self._fds
+                        if key[0] not in devices and key[0] not in masters]:
+                os.close(self._fds.pop(key))
+                self._buffers.pop(key, None)
+            if devices != self._devices:
+                self.logger.info(f'1-Wire Sensoren geändert: {devices}')
+            self._devices = devices
+            self._masters = masters
+            self._t_scan = time.monotonic()
+
+    def _rescan_if_due(self) -> None:
+        """Erneutes Einlesen der Sensorliste, wenn das Intervall abgelaufen ist"""
+        if time.monotonic() - self._t_scan >= self.rescan_interval_s:
+            self.rescan()
+
     def list_all_devices(self) -> list:
         """Auflistung aller 1-Wire Sensoren die im System gefunden werden
         
@@ -87,12 +206,9 @@ class OneWire:
         :rtype: list
         """
 
-        # Alle Files der 1Wire Sensoren extrahieren
-        # typischer Aufbau des Filenamens (3a-0000003820a6)
-        sensors = [f for f in listdir(self._path_to_1W_sensors) \
-            if re.match(r"[0-9a-f]{2}-[0-9a-f]{12}", f)]
-        
-        return sensors    
+        # Zwischengespeicherte Sensorliste, ggf. neu einlesen
+        self._rescan_if_due()
+        return list(self._devices)
 
     def list_ds18s20_devices(self) -> list:
         """Auflistung aller DS18S20 Sensoren die über 1-Wire im System gefunden werden
@@ -106,12 +222,8 @@ class OneWire:
         :rtype: list
         """
 
-        # Alle Files der 1Wire Sensoren extrahieren
-        # typischer Aufbau des Filenamens (3a-0000003820a6)
-        sensors = [f for f in listdir(self._path_to_1W_sensors) \
-            if re.match(r"28-[0-9a-f]{12}", f) ]
-        
-        return sensors  
+        return [id for id in self.list_all_devices()
+                if id.startswith(self._DS18S20_FAMILY)]
 
     def show_all_devices(self) -> None:
         """Ausgabe aller gefunden 1-Wire Sensoren in der Konsole
@@ -123,7 +235,7 @@ class OneWire:
             print(i)
  
 
-    def read_1w_sensor_ds18s20(self,id: str) -> list[str, float]:
+    def read_1w_sensor_ds18s20(self, id: str) -> tuple:
         """Auslesen eines spezifischen DS18S20 Sensors
         
         Die Methode gibt die aktuelle Temperatur des angewählten Sensors
@@ -136,50 +248,319 @@ class OneWire:
             63 01 4b 46 7f ff 0c 10 d1 : crc=d1 YES \n
             63 01 4b 46 7f ff 0c 10 d1 t=22187
         
-        Sollte das File nicht lesbar sein, so wird eine Exception ausgegeben.
-        
+        Das File wird ohne Regular Expressions und Zwischenstrings direkt
+        aus einem wiederverwendeten Puffer ausgewertet
+        (:func:`~driver.one_wire.parse_w1_slave`). Ein nicht lesbares File
+        oder ein CRC Fehler wird über den Qualitätscode gemeldet.
 
         :param id: Die ID des auszulesenden DS18S20 Sensors
         :type id: string
-        :return: eine Liste mit der SensorID und des dazugehörigen Messwertes
-        :rtype: list[str, float]
+        :return: SensorID, Messwert in °C (None bei Fehler) und Qualitätscode (QUALITY_*)
+        :rtype: tuple[str, float, int]
         """
         
-        value = None
-        path = join(self._path_to_1W_sensors,id,self._temp_sensor_1w_filename)
-        
         # Versuchen den Sensor auszulesen
         try:
-            with open(path,'r') as sensorfile:
-                # Wenn die Auslesung korrekt erfolgt ist
-                line1 = sensorfile.readline()
-                if re.match(r"([0-9a-f]{2} ){9}: crc=[0-9a-f]{2} YES", line1):
-                    # Extrahiere den Messwert
-                    line2 = sensorfile.readline()
-                    m = re.match(r"([0-9a-f]{2} ){9}t=([+-]?[0-9]+)", line2)
-                    if m:
-                        # Berechne das Ergebnis
-                        value = str(float(m.group(2)) / 1000.0)            
-                                                          
+            buffer, n = self._read_into(id, self._temp_sensor_1w_filename)
+            value, quality = parse_w1_slave(buffer, n)
+
         # Fehlermeldung sollte 1-Wire Sensor nicht lesbar sein
-        except(OSError):
-                
-            # Logging Info
-            msg = f'DS1820 mit ID: {id} nicht auslesbar. File {path} konnte nicht gelesen werden'
-            self.logger.warning(msg)
-            
-            value = None
-            
-        except Exception as e:
-            
-            # Logging Info
-            self.logger.exception(e)
-            
-            value = None
-                        
-        if value == None:                             
-            # Ausgabe eines Info das Messung fehlgeschlagen
-            self.logger.warning('measure_1wire_ds18s20 hat für Kanal %s keinen Wert auslesen können.',id)
-        
-        return [id,value]
+        except OSError:
+            # Beim nächsten Zyklus das File neu öffnen
+            self._close_file(id, self._temp_sensor_1w_filename)
+            value, quality = None, self.QUALITY_READ_ERROR
+
+        if quality != self.QUALITY_OK and \
+                self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f'DS1820 mit ID: {id} Qualitätscode {quality}')
+
+        return id, value, quality
+
+    def read_ds18s20_devices(self, ids: list = None,
+                             retry_budget: int = CRC_RETRY_BUDGET) -> dict:
+        """Parallele Auslesung mehrerer DS18S20 Sensoren im Thread Pool
+
+        Fehlerhafte Auslesungen (z.B. CRC Fehler durch Störungen auf dem Bus)
+        werden wiederholt, solange das Budget des Zyklus nicht aufgebraucht
+        ist. Jede Wiederholung eines Sensors verbraucht eine Einheit.
+
+        :param ids: IDs der Sensoren, defaults to alle gefundenen DS18S20
+        :type ids: list, optional
+        :param retry_budget: Anzahl der Wiederholungen im Zyklus, defaults to CRC_RETRY_BUDGET
+        :type retry_budget: int, optional
+        :return: SensorID -> (Messwert oder None, Qualitätscode)
+        :rtype: dict
+        """
+        return self._read_parallel(self._wanted_devices(ids), {},
+                                   retry_budget)
+
+    def _wanted_devices(self, ids: list) -> list:
+        """Gefundene DS18S20 Sensoren, ggf. beschränkt auf die IDs"""
+        devices = self.list_ds18s20_devices()
+        if ids is not None:
+            wanted = set(ids)
+            devices = [id for id in devices if id in wanted]
+        return devices
+
+    def _read_parallel(self, devices: list, results: dict,
+                       retry_budget: int) -> dict:
+        """Auslesen über w1_slave im Thread Pool mit Wiederholungsbudget"""
+        while devices:
+            futures = [self._executor.submit(self.read_1w_sensor_ds18s20, id)
+                       for id in devices]
+            failed = []
+            for f in concurrent.futures.as_completed(futures):
+                id, value, quality = f.result()
+                results[id] = (value, quality)
+                if quality != self.QUALITY_OK:
+                    failed.append(id)
+
+            # Wiederholung der fehlerhaften Sensoren im Rahmen des Budgets
+            devices = sorted(failed)[:retry_budget]
+            retry_budget -= len(devices)
+
+        for id, (value, quality) in results.items():
+            if quality != self.QUALITY_OK:
+                self.logger.warning(f'measure_1wire_ds18s20 hat für Kanal {id} keinen Wert auslesen können (Qualitätscode {quality})')
+
+        return results
+
+    def set_resolution(self, id: str, bits: int) -> None:
+        """Einstellen der Auflösung eines Sensors
+
+        Die Auflösung wird über das Attribut ``resolution`` nur in das
+        Scratchpad des Sensors geschrieben und bestimmt dessen Wandlungszeit
+        (94 ms bei 9 Bit bis 750 ms bei 12 Bit). Das EEPROM (Attribut
+        ``eeprom_cmd``) bleibt unverändert, nach einem Spannungsausfall gilt
+        wieder die dort gespeicherte Auflösung. Die Auflösung wird daher bei
+        jedem Start neu eingestellt.
+
+        :param id: Die ID des Sensors
+        :type id: str
+        :param bits: Auflösung in Bit (9 - 12)
+        :type bits: int
+        """
+        if bits not in self._CONVERSION_TIME_BY_RESOLUTION_S:
+            raise ValueError(f"Auflösung {bits} Bit für Sensor {id} nicht zulässig (9 - 12)")
+
+        try:
+            with open(join(self._path_to_1W_sensors, id,
+                           self._RESOLUTION_FNAME), 'w') as f:
+                f.write(f"{bits}\n")
+        except OSError:
+            self.logger.warning(f'Auflösung von Sensor {id} konnte nicht eingestellt werden')
+            return
+
+        self.logger.info(f'Auflösung von Sensor {id} auf {bits} Bit eingestellt')
+
+    def get_resolution(self, id: str) -> int:
+        """Auslesen der Auflösung eines Sensors
+
+        :param id: Die ID des Sensors
+        :type id: str
+        :return: Auflösung in Bit oder None, wenn sie nicht lesbar ist
+        :rtype: int
+        """
+        try:
+            return int(self._read_file(id, self._RESOLUTION_FNAME))
+        except (OSError, ValueError):
+            return None
+
+    def get_conversion_time(self, ids: list = None) -> float:
+        """Längste Wandlungszeit mehrerer Sensoren
+
+        Sensoren, deren Auflösung nicht lesbar ist, werden mit der maximalen
+        Wandlungszeit :mod:`~driver.one_wire.OneWire.CONVERSION_TIME_S`
+        berücksichtigt.
+
+        :param ids: IDs der Sensoren, defaults to alle gefundenen DS18S20
+        :type ids: list, optional
+        :return: Wandlungszeit in s
+        :rtype: float
+        """
+        if ids is None:
+            ids = self.list_ds18s20_devices()
+
+        return max((self._CONVERSION_TIME_BY_RESOLUTION_S.get(
+                        self.get_resolution(id), self.CONVERSION_TIME_S)
+                    for id in ids), default=0.0)
+
+    def bulk_read_supported(self) -> bool:
+        """Prüfung, ob alle Busmaster die gleichzeitige Wandlung unterstützen
+
+        :return: True, wenn mindestens ein Busmaster gefunden wurde und alle ``therm_bulk_read`` besitzen
+        :rtype: bool
+        """
+        self._rescan_if_due()
+        return bool(self._masters) and all(
+            os.path.exists(join(self._path_to_1W_sensors, master,
+                                self._BULK_READ_FNAME))
+            for master in self._masters)
+
+    def read_ds18s20_bulk(self, ids: list = None,
+                          conversion_time_s: float = CONVERSION_TIME_S,
+                          retry_budget: int = CRC_RETRY_BUDGET) -> dict:
+        """Auslesung mehrerer DS18S20 Sensoren mit einer gleichzeitigen Wandlung
+
+        Die Wandlung wird an allen Busmastern gestartet. Nach der
+        Wandlungszeit wird geprüft, ob die Wandlung abgeschlossen ist (Wert
+        -1 im Attribut ``therm_bulk_read``), und höchstens eine weitere
+        Wandlungszeit gewartet.
+
+        Sensoren, deren Temperatur nicht gelesen werden konnte, werden im
+        Rahmen des Budgets einzeln über w1_slave (mit eigener Wandlung)
+        wiederholt.
+
+        :param ids: IDs der Sensoren, defaults to alle gefundenen DS18S20
+        :type ids: list, optional
+        :param conversion_time_s: Wandlungszeit der Sensoren, defaults to CONVERSION_TIME_S
+        :type conversion_time_s: float, optional
+        :param retry_budget: Anzahl der Wiederholungen im Zyklus, defaults to CRC_RETRY_BUDGET
+        :type retry_budget: int, optional
+        :return: SensorID -> (Messwert oder None, Qualitätscode)
+        :rtype: dict
+        """
+        devices = self._wanted_devices(ids)
+
+        results = {}
+        if not devices:
+            return results
+
+        # Gleichzeitige Wandlung aller Sensoren starten
+        for master in self._masters:
+            try:
+                with open(join(self._path_to_1W_sensors, master,
+                               self._BULK_READ_FNAME), 'w') as f:
+                    f.write("trigger\n")
+            except OSError:
+                self.logger.warning(f'Wandlung am 1-Wire Busmaster {master} konnte nicht gestartet werden')
+
+        # Einmalig die Wandlungszeit abwarten
+        time.sleep(conversion_time_s)
+        deadline = time.monotonic() + conversion_time_s
+        while self._bulk_read_pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Die Temperaturen ohne erneute Wandlung lesen
+        failed = []
+        for id in devices:
+            try:
+                value = int(self._read_file(id, self._TEMPERATURE_FNAME))
+            except (OSError, ValueError):
+                self._close_file(id, self._TEMPERATURE_FNAME)
+                failed.append(id)
+                continue
+            results[id] = (value / 1000.0, self.QUALITY_OK)
+
+        # Fehlerhafte Sensoren einzeln wiederholen
+        retry = failed[:retry_budget]
+        for id in failed[retry_budget:]:
+            results[id] = (None, self.QUALITY_READ_ERROR)
+        return self._read_parallel(retry, results, retry_budget - len(retry))
+
+    def _bulk_read_pending(self) -> bool:
+        """Prüfung, ob an einem Busmaster noch eine Wandlung läuft"""
+        for master in self._masters:
+            try:
+                if int(self._read_file(master, self._BULK_READ_FNAME)) < 0:
+                    return True
+            except (OSError, ValueError):
+                pass
+        return False
+
+    def close(self) -> None:
+        """Beenden des Thread Pools und Schließen aller Messfiles"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+
+    def _read_file(self, id: str, fname: str) -> bytes:
+        """Lesen eines Attributs über den dauerhaft geöffneten Deskriptor
+
+        Ein sysfs Attribut wird beim Lesen ab Position 0 vom Kernel neu
+        erzeugt, das File muss daher nicht für jede Messung geöffnet werden.
+        """
+        key = (id, fname)
+        fd = self._fds.get(key)
+        if fd is None:
+            fd = os.open(join(self._path_to_1W_sensors, id, fname),
+                         os.O_RDONLY | os.O_CLOEXEC)
+            with self._lock:
+                if key in self._fds:
+                    os.close(fd)
+                    fd = self._fds[key]
+                else:
+                    self._fds[key] = fd
+        return os.pread(fd, 256, 0)
+
+    def _read_into(self, id: str, fname: str) -> tuple:
+        """Lesen eines Attributs in den wiederverwendeten Puffer des Attributs
+
+        :return: Puffer und Anzahl gelesener Bytes
+        :rtype: tuple[bytearray, int]
+        """
+        key = (id, fname)
+        fd = self._fds.get(key)
+        if fd is None:
+            self._read_file(id, fname)
+            fd = self._fds[key]
+
+        iov = self._buffers.get(key)
+        if iov is None:
+            iov = self._buffers[key] = [bytearray(self._READ_BUFFER_SIZE)]
+        return iov[0], os.preadv(fd, iov, 0)
+
+    def _close_file(self, id: str, fname: str) -> None:
+        """Schließen eines Attributs eines Sensors"""
+        with self._lock:
+            fd = self._fds.pop((id, fname), None)
+        if fd is not None:
+            os.close(fd)
+
+
+def parse_w1_slave(buffer: bytearray, n: int) -> tuple:
+    """Auswertung des Inhalts eines w1_slave Attributs
+
+    Die erste Zeile endet mit dem Ergebnis der CRC Prüfung des Kernels
+    (``YES``/``NO``), die zweite Zeile enthält nach ``t=`` die Temperatur in
+    m°C. Die Auswertung erfolgt direkt auf den Bytes des Puffers ohne
+    Regular Expressions und ohne Zwischenstrings.
+
+    :param buffer: Puffer mit dem Inhalt des Attributs
+    :type buffer: bytearray
+    :param n: Anzahl der gültigen Bytes im Puffer
+    :type n: int
+    :return: Temperatur in °C (None bei Fehler) und Qualitätscode (OneWire.QUALITY_*)
+    :rtype: tuple[float, int]
+    """
+    eol = buffer.find(b"\n", 0, n)
+    if eol < 0:
+        return None, OneWire.QUALITY_FORMAT_ERROR
+
+    # Ergebnis der CRC Prüfung am Ende der ersten Zeile
+    if buffer.find(b"YES", 0, eol) < 0:
+        if buffer.find(b"crc=", 0, eol) < 0:
+            return None, OneWire.QUALITY_FORMAT_ERROR
+        return None, OneWire.QUALITY_CRC_ERROR
+
+    i = buffer.find(b"t=", eol, n)
+    if i < 0:
+        return None, OneWire.QUALITY_FORMAT_ERROR
+    i += 2
+
+    # Ziffern direkt als Bytewerte auswerten
+    sign = 1
+    if i < n and buffer[i] == 0x2d:
+        sign = -1
+        i += 1
+    value = 0
+    start = i
+    while i < n and 0x30 <= buffer[i] <= 0x39:
+        value = value * 10 + buffer[i] - 0x30
+        i += 1
+    if i == start:
+        return None, OneWire.QUALITY_FORMAT_ERROR
 
+    return sign * value / 1000.0, OneWire.QUALITY_OK
@@ -16,6 +16,9 @@ __status__ = "Development"
 
 from .aquire_data import AquireData
 from .datapoint import DataPoint
+from .channel_registry import ChannelRegistry
+from .channel_store import ChannelStore
 from .store_data import StoreDataToInflux
 from .helper import *
-from .alert_service import Alerting
\ No newline at end of file
+from .alert_service import Alerting
+from .scheduler import DeadlineScheduler
\ No newline at end of file
@@ -1,336 +1,329 @@
 #!/usr/bin/env python3
-# -*- coding: utf-8 -*- 
-
-# Modul zur Bearbeitung der Zeitstempel
-from datetime import datetime
-
-# Module für ReguläreExpressions
-import re
-
-# Modul zum Multithreading
-import concurrent.futures
+# -*- coding: utf-8 -*-
 
 # Import Logging Modul
 import logging
+import sys
+
+# Config Files auswerten
+from configparser import ConfigParser
 
 # Klasse für die Abspeicherung der Datenpunkte
 from .datapoint import DataPoint
 
+# Verzeichnis aller Messkanäle
+from .channel_registry import ChannelRegistry
+
+# Spaltenweiser Speicher der Messkanäle
+from .channel_store import ChannelStore
+
+# Komprimierte Zeitreihen der Messkanäle
+from .compressed_series import CompressedSeries
+
 # Helper Modul stell Kanalkonfiguration zur Verfügung
 from .helper import *
 
-# Serviceklasse für die GPIOs
-from .gpio_service import GpioService
+# Plugins zur Anbindung der Treiber an die Messkanäle
+from .sensor_plugins import PLUGIN_REGISTRY, PluginContext, SensorPlugin
+from .sensor_plugins import GROUP_I2C, GROUP_I2C_SLOW, GROUP_1WIRE
 
-#i2c Treiber - AD-Wandler ADS1115
-from driver.i2c_ads1115  import ADS1115
-#i2c Treiber - Powerüberwachung INA219
-from driver.i2c_ina219 import INA219
-from driver.i2c_ina219 import DeviceRangeError
-#i2c Treiber - Gyroscope
-from driver.i2c_mpu6050 import mpu6050
-# 1Wire Treiber
-from driver.one_wire import OneWire
-# i2c Treiber für bmp280
-from bmp280 import BMP280
+#i2c Bus mit serialisiertem Zugriff
+from driver.i2c_bus import I2CBusOwner
 
 
 class AquireData:
     """Klasse zur zentralen Datenerfassung
-    
+
     Mit dieser Klasse werden alle Messwerte von den verschiedenen Sensoren
     erfasst und entsprechend aufbereitet, um sie dann in einem Datenpunkt
     der Klasse :class:`~tatooine_data.datapoint.DataPoint` abzuspeichern.
-    
-    """    
-    
-    SHUNT_OHMS = 0.1
-    """Widerstandswert (Ohm) des Shunt am INA219"""
-    
+
+    Welche Sensoren ausgelesen werden, ergibt sich allein aus den Spalten Driver, Source und Scale der :file:`config_channels.csv`. Für jede Treiberinstanz wird beim Start ein Plugin aus :mod:`~tatooine_data.sensor_plugins` angelegt und einer Erfassungsgruppe (i2c, i2c_slow, 1wire) zugeordnet. Die so erstellten Lesepläne werden im Betrieb ohne weitere Fallunterscheidung abgearbeitet.
+
+    """
+
     _MAX_DATA_POINTS_HISTORY = 8
-    """Anzahl der Werte die in der Datenhistorie betrachtet werden"""     
-  
+    """Anzahl der Werte die in der Datenhistorie betrachtet werden"""
+
+    _SERIES_HOURS = 24
+    """Standard der Vorhaltezeit der komprimierten Zeitreihen in h"""
+
     data_last_measured = []
     """Array von :class:`~tatooine_data.datapoint.DataPoint`, welcher den aktuellen Messwert jedes verfügbaren Kanals bereit hält.
-    """  
-    
-    
-    __SCALE_ADC = 10
-    """Skalierung des Spannungsteilers am AD-Wandler Eingang des ADS1115"""
-    
-    __CAL_VALUE_ADC1 = 1.087
-    """Calibrierwert des ADC1 Kanals, da es aufgrund von Toleranzen bei den Widerständen zu Verschiebungen kommen kann"""
-    
-    __CAL_VALUE_ADC2 = 1.087
-    """Calibrierwert des ADC2 Kanals, da es aufgrund von Toleranzen bei den Widerständen zu Verschiebungen kommen kann"""
-    
-    __CAL_VALUE_ADC3 = 1.087
-    """Calibrierwert des ADC3 Kanals, da es aufgrund von Toleranzen bei den Widerständen zu Verschiebungen kommen kann"""
-    
-    __CAL_VALUE_ADC4 = 1.087
-    """Calibrierwert des ADC4 Kanals, da es aufgrund von Toleranzen bei den Widerständen zu Verschiebungen kommen kann"""
-    
-    def __init__(self, bus = None):
+    """
+
+    def __init__(self, bus = None, conf: ConfigParser = None):
         """Initialisierung des Datenaquisition Klasse
 
-        Bei der Initialisierung werden alles Objekte für den Zugriff auf die diversen Sensorchips (siehe ToDo ) erstellt und entsprechend konfiguriert.
+        Bei der Initialisierung werden für alle in der Kanalkonfiguration genannten Treiberinstanzen die Plugins erstellt, die Kanäle zugeordnet und die Sensorchips einmalig konfiguriert.
 
-        :param bus: Object das den Datenbus repräsentiert, defaults to None
-        :type bus: Objekt(smbus), optional
-        """        
-        self.i2c_bus = bus
-        
-        # Objekte für die Spannungsmessung anlegen
-        self.Adc1 = ADS1115(bus,ADS1115.MUX_AIN0_GND,4.096)
-        self.Adc2 = ADS1115(bus,ADS1115.MUX_AIN1_GND,4.096)
-        self.Adc3 = ADS1115(bus,ADS1115.MUX_AIN2_GND,4.096)
-
-        # Objekt für die Powerüberwachung anlegen
-        self.Ina = INA219(self.SHUNT_OHMS,3,1,0x40)
-
-        # Objekt für den MPU6050 anlegen
-        self.mpu = mpu6050(0x68)
-
-        # Objekt für den 1-Wire Bus anlegen
-        self.one_wire = OneWire()
-        
-        # Objekt für BMP280
-        self.bmp280 = BMP280(i2c_dev=bus)
-        
-        #Initialisierung der aktuellen Messdaten
-        self.data_last_measured =[DataPoint(x['ID'],x['Name'],x["Unit"], \
-            int(x['Filter']),int(x['TickMax']), int(x['TickFast']), \
-            float(x['Threshold_Abs']), float(x['Threshold_Perc'])) for x in CHANNEL_CONFIG_LIST]
+        Alle i2c Treiber greifen über einen gemeinsamen :class:`~driver.i2c_bus.I2CBusOwner` auf den Bus zu. Die schnellen Sensoren erhalten dabei eine höhere Priorität als die langsamen Sensoren.
 
+        :param bus: Object das den Datenbus repräsentiert, defaults to None
+        :type bus: Objekt(I2CBusOwner oder smbus), optional
+        :param conf: Konfiguration aus monitor_live.conf, defaults to None
+        :type conf: ConfigParser, optional
+        """
         # ============================================
         # Konfiguration des Logging
         # ============================================
         self.logger = logging.getLogger(__name__)
         #self.logger.setLevel(logging.INFO)
         self.logger.addHandler(logging.NullHandler())
-   
-    def _store_data(self, data_point, value, 
-                    time):
-        """Abspeichern eines Wertes in einen Datenpunkt
-
-        Mit dieser internen Hilfsfunktion wird ein Messwert samt Einheit und Zeitstempel in den entsprechenden Datenpunkt abgespeichert.
-        
-        
-        :param data_point: Datenpunktobjekt
-        :type data_point: class DataPoint
-        :param value: abzuspeichernder Messwert, defaults to 0.0
-        :type value: float, optional
-        :param time: Zeitstempel des Messwertes
-        :type time: datetime objekt, optional
-        """        
-
-        data_point.update_value(value,time.timestamp())
-
-    
+
+        # Ein direkt übergebener Bus wird ebenfalls serialisiert
+        if not isinstance(bus, I2CBusOwner):
+            bus = I2CBusOwner(bus=bus)
+        self.i2c_bus = bus
+
+        #Initialisierung der aktuellen Messdaten
+        self.channels = ChannelRegistry(CHANNEL_CONFIG_LIST)
+
+        # Komprimierte Zeitreihe der letzten Stunden für alle Kanäle mit
+        # einem Eintrag in der Spalte Series
+        series_hours = conf.getfloat("CHANNELS", "SERIES_HOURS",
+                                     fallback=self._SERIES_HOURS) \
+            if conf is not None else self._SERIES_HOURS
+        if series_hours > 0:
+            for driver in self.channels.drivers():
+                for b in self.channels.bindings_of(driver):
+                    if b.series_resolution is not None:
+                        b.datapoint.series = CompressedSeries(
+                            series_hours * 3600,
+                            resolution=b.series_resolution or None)
+
+        # Optional alle Kanäle spaltenweise in NumPy Arrays halten
+        self.store = None
+        if conf is not None and \
+                conf.get("CHANNELS", "STORE", fallback="datapoint") == "numpy":
+            self.store = ChannelStore(self.channels.datapoints)
+            self.channels.rebind(self.store.views)
+        self.data_last_measured = self.channels.datapoints
+
+        # Anlegen der Plugins und Erstellen der Lesepläne
+        self.plugins = self._create_plugins(PluginContext(bus, conf))
+        self.read_plans = {GROUP_I2C: [], GROUP_I2C_SLOW: [], GROUP_1WIRE: []}
+        for plugin in sorted(self.plugins.values(), key=lambda p: p.PRIORITY):
+            self.read_plans.setdefault(plugin.GROUP, []).append(plugin)
+
+        for group, plan in self.read_plans.items():
+            self.logger.info(f"Leseplan {group}: {[p.name for p in plan]} ~{self.get_read_cost_ms(group):0.1f} ms")
+
+    def _create_plugins(self, context: PluginContext) -> dict:
+        """Anlegen und Initialisieren der Plugins aller Treiberinstanzen
+
+        :param context: gemeinsame Ressourcen der Plugins
+        :type context: PluginContext
+        :return: Treiberinstanz -> Plugin
+        :rtype: dict
+        """
+        plugins = {}
+
+        for name in self.channels.drivers():
+            # Treiberinstanz besteht aus Typ und optionaler Adresse
+            driver_type, _, address = name.partition("@")
+            try:
+                plugin = PLUGIN_REGISTRY[driver_type](name, \
+                    int(address, 0) if address else None, context)
+                for binding in self.channels.bindings_of(name):
+                    plugin.bind(binding)
+                plugin.setup()
+
+            # Programm beenden sollte die Kanalkonfiguration fehlerhaft sein
+            except (KeyError, ValueError) as e:
+                self.logger.critical(f"Fehlerhafte Treiberinstanz {name} in der Kanalkonfiguration: {e}. Bekannte Treiber: {list(PLUGIN_REGISTRY)}")
+                print(f"Fehlerhafte Treiberinstanz {name} in der Kanalkonfiguration: {e}\nBekannte Treiber: {list(PLUGIN_REGISTRY)}")
+                sys.exit("Programm wird beendet wegen falscher Kanal Config...")
+
+            plugins[name] = plugin
+
+        return plugins
+
+    def _run_plan(self, group: str) -> None:
+        """Abarbeiten des Leseplans einer Erfassungsgruppe
+
+        Ein fehlerhafter Sensor verhindert nicht die Erfassung der übrigen Sensoren der Gruppe.
+
+        Mit dem spaltenweisen Speicher werden alle Messwerte der Gruppe gesammelt und in einem Schreibvorgang übernommen.
+
+        :param group: Erfassungsgruppe
+        :type group: str
+        """
+        if self.store is not None:
+            with self.store.batch():
+                self._acquire_all(self.read_plans[group])
+        else:
+            self._acquire_all(self.read_plans[group])
+
+    def _acquire_all(self, plan: list) -> None:
+        """Auslesen aller Plugins eines Leseplans"""
+        for plugin in plan:
+            try:
+                plugin.acquire()
+            except Exception as e:
+                self.logger.warning(f"Erfassung von {plugin.name} fehlgeschlagen: {e}")
+
+    def _run_driver_type(self, driver_type: str) -> None:
+        """Auslesen aller Treiberinstanzen eines Typs"""
+        for plugin in self.plugins.values():
+            if plugin.DRIVER_TYPE == driver_type:
+                plugin.acquire()
+
+    def get_read_cost_ms(self, group: str) -> float:
+        """Geschätzte Dauer der Auslesung einer Erfassungsgruppe
+
+        :param group: Erfassungsgruppe
+        :type group: str
+        :return: Summe der Lesedauer aller Plugins der Gruppe in ms
+        :rtype: float
+        """
+        return sum(p.READ_COST_MS for p in self.read_plans.get(group, []))
+
+    def check_windows(self, group: str, period_s: float) -> None:
+        """Prüfung der Zeitfenster aller Kanäle einer Erfassungsgruppe
+
+        Siehe :func:`~tatooine_data.datapoint.DataPoint.check_window`.
+
+        :param group: Erfassungsgruppe
+        :type group: str
+        :param period_s: Periode der Gruppe in s
+        :type period_s: float
+        """
+        for plugin in self.read_plans.get(group, []):
+            for b in plugin.bindings:
+                b.datapoint.check_window(period_s)
+
+    def get_preferred_period_ms(self, group: str) -> float:
+        """Bevorzugte Periode einer Erfassungsgruppe
+
+        :param group: Erfassungsgruppe
+        :type group: str
+        :return: längste bevorzugte Periode aller Plugins der Gruppe in ms
+        :rtype: float
+        """
+        return max((p.PREFERRED_PERIOD_MS for p in self.read_plans.get(group, [])),
+                   default=SensorPlugin.PREFERRED_PERIOD_MS)
+
     def measure_power(self) -> None:
         """Messung der Leistungsaufnahme des INA219
-        
-        Mittels des INA219 Sensors wird über I2C die aktuelle Spannung, die Stromaufnahme und die Leistungsaufnahme gemessen. Anschließend speichert die Methode die Werte in den Array[:class:`~tatooine_data.datapoint.DataPoint.data_last_measured`] ab.
-        """        
-        
-        #--------------------------------------------------------------------
-        # Erfassung der Messwerte des INA219 und anschließendes Abspeichern 
-        #--------------------------------------------------------------------
-        self.Ina.configure()
-        isoTime = datetime.now()
-                
-        for x in self.data_last_measured:
-            if x.id == "__U_POWER_IT":
-                self._store_data(x,self.Ina.voltage(),isoTime)
-            if x.id == "__I_POWER_IT":
-                self._store_data(x,self.Ina.current(),isoTime)
-            if x.id == "__P_POWER_IT":
-                self._store_data(x,self.Ina.power(),isoTime)
 
+        Mittels des INA219 Sensors wird über I2C die aktuelle Spannung, die Stromaufnahme und die Leistungsaufnahme gemessen. Anschließend speichert die Methode die Werte in den Array[:class:`~tatooine_data.datapoint.DataPoint.data_last_measured`] ab.
+        """
+        self._run_driver_type("ina219")
 
     def measure_adc(self) -> None:
         """Messung von analogen Spannungen am ADS1115
-        
+
         Es können bis zu 4 Spannungen an den ADC Eingängen des ADS1115 über den I2C Bus gemessen werden.
         Anschließend speichert sie die Werte in den Array :class:`~tatooine_data.datapoint.DataPoint.data_last_measured`] ab.
-            
+
         .. todo::
             Schaltungsaufbau beschreiben
-            
-        """        
-               
-        #--------------------------------------------------------------------
-        # Erfassung der Messwerte des ADS1115 und anschließendes Abspeichern 
-        #--------------------------------------------------------------------
-        isoTime = datetime.now()
-                
-        for x in self.data_last_measured:        
-            if x.id == "__U_ADC1":
-                self._store_data(x,self.Adc1.getVoltage()*self.__SCALE_ADC * self.__CAL_VALUE_ADC1,isoTime)
-            if x.id == "__U_ADC2":
-                self._store_data(x,self.Adc2.getVoltage()*self.__SCALE_ADC * self.__CAL_VALUE_ADC2,isoTime)
-            if x.id == "__U_ADC3":
-                self._store_data(x,self.Adc3.getVoltage()*self.__SCALE_ADC * self.__CAL_VALUE_ADC3,isoTime)
-            if x.id == "__U_ADC4":
-                self._store_data(x,self.Adc4.getVoltage()*self.__SCALE_ADC * self.__CAL_VALUE_ADC4,isoTime)
-    
+
+        """
+        self._run_driver_type("ads1115")
+
     def measure_gyro(self) -> None:
         """Messung der Gyro Werte des MPU6050
-        
-        Mit dieser Funktion werden alle Messwert des MPU6050 über den I2C Bus ausgelesen. So können Beschleunigungen und Gierwinkel über die Achsen X, Y,Z erfasst werden. Anschließend speichert sie die Werte in den Array[:class:`~tatooine_data.datapoint.DataPoint.data_last_measured`] ab. 
-        
-        """        
-        
-        #--------------------------------------------------------------------
-        # Erfassung der Messwerte des MPU6050 und anschließendes Abspeichern 
-        #--------------------------------------------------------------------
-        isoTime = datetime.now()
-        accel_data = self.mpu.get_accel_data(True)
-        gyro_data =self.mpu.get_gyro_data()
-        
-        for x in self.data_last_measured:        
-            if x.id == "__ACC_X":
-                self._store_data(x,accel_data['x'],isoTime)
-            if x.id == "__ACC_Y":
-                self._store_data(x,accel_data['y'],isoTime)
-            if x.id == "__ACC_Z":
-                self._store_data(x,accel_data['z'],isoTime)
-            if x.id == "__GYRO_X":
-                self._store_data(x,gyro_data['x'],isoTime)
-            if x.id == "__GYRO_Y":
-                self._store_data(x,gyro_data['y'],isoTime)
-            if x.id == "__GYRO_Z":
-                self._store_data(x,gyro_data['z'],isoTime)
-            if x.id == "__GYRO_TEMP":
-                self._store_data(x,self.mpu.get_temp(), isoTime)          
-            
-    
+
+        Mit dieser Funktion werden alle Messwert des MPU6050 über den I2C Bus ausgelesen. So können Beschleunigungen und Gierwinkel über die Achsen X, Y,Z erfasst werden. Anschließend speichert sie die Werte in den Array[:class:`~tatooine_data.datapoint.DataPoint.data_last_measured`] ab.
+
+        """
+        self._run_driver_type("mpu6050")
+
     def measure_1wire_ds18s20(self) -> None:
         """Auslesen aller DS18S20 Sensoren im 1-Wire Bus
-        
-        Die Methode fragt nach einander alle verbauten DS18S20 Sensoren ab und speichert die Werte in den Array[:class:`~tatooine_data.datapoint.DataPoint.data_last_measured`] ab. 
-        
+
+        Die Methode fragt nach einander alle verbauten DS18S20 Sensoren ab und speichert die Werte in den Array[:class:`~tatooine_data.datapoint.DataPoint.data_last_measured`] ab.
+
         """
-        isoTime = datetime.now()
-
-        # Starten der Multithreading Abfrage des 1-Wire Devices
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            # Einen Thread pro DS18s20 starten
-            results = [executor.submit(self.one_wire.read_1w_sensor_ds18s20,i) 
-                       for i in self.one_wire.list_ds18s20_devices()]
-            
-            # Wenn die Sensoren geantwortet haben
-            for f in concurrent.futures.as_completed(results):
-                # Abspeichern des entsprechenden Ergebnisses im Speicher der 
-                # aktuellen Werte
-                for x in self.data_last_measured:        
-                    if x.id == f.result()[0]:
-                        
-                        # Check ob das Auslesen erfolgreich war
-                        if f.result()[1]:
-                            # Abspeichern des Wertes
-                            self._store_data(x,float(f.result()[1]),isoTime)
-                        else:
-                            # Fehler in Logging eintragen
-                            self.logger.warning(f'Keine Speicherung des Wertes: -> {f.result()[1]} von Sensor {x.id}')
+        self._run_driver_type("ds18s20")
 
     def measure_baro(self) -> None:
         """ Auslesen des Umgebungsdruckes und der Temperatur
-        
+
         Diese Methode liest die MEsswerte des Chips BMP280 aus und speichert
-        daraus die akutelle Temperatur und den aktuellen Luftdruck in dem 
+        daraus die akutelle Temperatur und den aktuellen Luftdruck in dem
         Array [:class:`~tatooine_data.datapoint.DataPoint.data_last_measured`]
         ab.
         """
-        
-        # Auslesend er Messwerte        
-        temperature = self.bmp280.get_temperature()
-        pressure = self.bmp280.get_pressure()
-        isoTime = datetime.now()
-        
-        # Abspeichern im Datenarray
-        for x in self.data_last_measured:        
-            if x.id == "__T_Baro":
-                self._store_data(x,temperature,isoTime)        
-            if x.id == "__Baro":
-                self._store_data(x,pressure,isoTime)    
+        self._run_driver_type("bmp280")
 
     def measure_gpio(self) -> None:
         """ Auslesen aller GPIOs
-        
-        Diese Methode liest alle GPIOs die in der Channelconfig :file:`config_channels.csv` konfiguriert wurden, aus und speichert 
-        sie in dem Array 
+
+        Diese Methode liest alle GPIOs die in der Channelconfig :file:`config_channels.csv` konfiguriert wurden, aus und speichert
+        sie in dem Array
         [:class:`~tatooine_data.datapoint.DataPoint.data_last_measured`] ab.
-        
-        """
-        isoTime = datetime.now()
-        tmp = GpioService()
-        
-        # Abseichern im Datenarray
-        for x in self.data_last_measured:
-            
-            # Wenn es sich um einen GPIO Kanal handelt 
-            reg = re.search("GPIO", x.id)
-            if reg:
-                # Die Kanalnummer ermitteln
-                gpio_chn = int (x.id[reg.span()[1]:])
-                # Den Kanal auslesen
-                resultIo = tmp.getGPIO(gpio_chn)
- 
-                # Abspeichern des Wertes
-                self._store_data(x,resultIo,isoTime)
-                
 
+        """
+        self._run_driver_type("gpio")
 
     def aquire_data_i2c(self) -> None:
         """Zentrale Methode zum Messen aller i2c Sensoren
-        
+
         Die Methode aktualisiert alle Messwerte der verbauten i2c Sensoren.
-        
-        """        
+
+        """
 
         #-----------------------------------------------------------------------
         # Erfassung der Messwerte und anschließendes Abspeichern in der Historie
         #-----------------------------------------------------------------------
-        self.measure_power()
-        self.measure_adc()
-        self.measure_gyro()
-        
-        self.measure_gpio()
-        
+        self._run_plan(GROUP_I2C)
+
     def aquire_data_i2c_slow(self) -> None:
         """Zentrale Methode zum Messen aller LANGSAMEN i2c Sensoren
-        
+
         Die Methode aktualisiert alle Messwerte der verbauten i2c Sensoren, welche nur in einem langsamen Intervall ausgelesen werden müssen. (Wettersensoren etc...)
-        
-        """        
+
+        """
 
         #-----------------------------------------------------------------------
         # Erfassung der Messwerte und anschließendes Abspeichern in der Historie
         #-----------------------------------------------------------------------
-        self.measure_baro()
+        self._run_plan(GROUP_I2C_SLOW)
 
     def aquire_data_1wire(self) -> None:
         """Zentrale Methode zum auslesen aller 1 Wire Sensoren
-        
+
         Die Methode aktualisiert alle Messwerte der verbauten 1-Wire Sensoren.
-        """        
-        
+        """
+
         #-----------------------------------------------------------------------
         # Erfassung der Messwerte und anschließendes Abspeichern in der Historie
         #-----------------------------------------------------------------------
-        self.measure_1wire_ds18s20()
-                     
-                     
+        self._run_plan(GROUP_1WIRE)
+
+
+    def get_history(self, id: str, t_from: float = None, t_to: float = None) -> tuple:
+        """Ausgabe der komprimiert vorgehaltenen Werte eines Kanals
+
+        Damit stehen der Anzeige, den Alarmen und Auswertungen die Werte der
+        letzten Stunden ohne Abfrage der InfluxDB zur Verfügung.
+
+        :param id: Kanal-ID
+        :type id: str
+        :param t_from: Beginn des Zeitraums in s, defaults to None (ältester Wert)
+        :type t_from: float, optional
+        :param t_to: Ende des Zeitraums in s, defaults to None (neuester Wert)
+        :type t_to: float, optional
+        :return: Zeitstempel und Messwerte als NumPy Arrays (leer, wenn der Kanal keine Zeitreihe hat)
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        dp = self.channels.get(id)
+        if dp is None or dp.series is None:
+            return CompressedSeries().to_numpy()
+        return dp.series.to_numpy(t_from, t_to)
+
     def get_last_data_measured(self) -> DataPoint:
         """Ausgabe der aktuell gemessen Daten
-        
+
         Mit dieser Funktion wird die Liste der Messkanäle mit den aktuellen Messwerten ausgegeben.
 
         :return: Liste der aktuellen Messwerte vom Typ Datapoint
         :rtype: DataPoint
         """
-        
+
         # Ausgabe der aktuellen Messwerte
         return self.data_last_measured
-        
+
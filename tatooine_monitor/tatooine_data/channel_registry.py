@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Modul für Datenklassen
+from dataclasses import dataclass
+
+# Import Logging Modul
+import logging
+import sys
+
+# Klasse für die Abspeicherung der Datenpunkte
+from .datapoint import DataPoint
+
+# Inkrementelle Filter der Messwerte
+from .filters import create_filter
+
+
+@dataclass
+class   ChannelBinding():
+    """Zuordnung eines Messkanals zu einer Messgröße einer Treiberinstanz"""
+    
+    datapoint: DataPoint = None
+    """Datenpunkt des Messkanals"""
+    
+    driver: str = '-'
+    """Treiberinstanz aus der Spalte Driver (z.B. ads1115@0x48)"""
+    
+    source: str = '-'
+    """Messgröße des Treibers aus der Spalte Source (z.B. ain0)"""
+    
+    scale: float = 1.0
+    """Skalierung des Messwertes aus der Spalte Scale"""
+
+    resolution: int = None
+    """Auflösung des Sensors in Bit aus der Spalte Resolution (None: Standard des Sensors)"""
+
+    series_resolution: float = None
+    """Auflösung der komprimierten Zeitreihe aus der Spalte Series (None: keine Zeitreihe, 0: volle Genauigkeit)"""
+
+
+def parse_window(text: str, default: int = None) -> tuple:
+    """Auswerten einer Fensterbreite aus der Kanalkonfiguration
+
+    Eine Zahl gibt die Anzahl der Werte an, eine Zahl mit dem Zusatz s ein
+    Zeitfenster in Sekunden (z.B. 5 oder 7.5s).
+
+    :param text: Eintrag der Spalte Filter (gleitender Mittelwert) bzw. History
+    :type text: str
+    :param default: Anzahl der Werte bei einem leeren Eintrag oder einem Zeitfenster, defaults to None
+    :type default: int [optional]
+    :raises ValueError: Eintrag ist weder Anzahl noch Zeitfenster
+    :return: Anzahl der Werte und Zeitfenster in s (0: kein Zeitfenster)
+    :rtype: tuple[int, float]
+    """
+    text = (text or "").strip()
+    if not text:
+        return default, 0.0
+    if text.endswith("s"):
+        seconds = float(text[:-1])
+        if seconds <= 0:
+            raise ValueError(f"Zeitfenster {text} muss größer 0 sein")
+        return default, seconds
+    return int(text), 0.0
+
+
+class ChannelRegistry:
+    """Verzeichnis aller konfigurierten Messkanäle
+
+    Das Verzeichnis wird einmalig beim Start aus der
+    :mod:`~tatooine_data.helper.CHANNEL_CONFIG_LIST` aufgebaut. Es legt für
+    jeden Kanal einen :class:`~tatooine_data.datapoint.DataPoint` an und
+    ordnet ihn über seine ID und über die Spalten Driver, Source und Scale
+    seiner Treiberinstanz zu. Die Measure-Methoden greifen damit direkt auf
+    ihre eigenen Kanäle zu, ohne bei jeder Messung die gesamte Kanalliste zu
+    durchsuchen.
+
+    .. code-block:: python
+
+        channels = ChannelRegistry(CHANNEL_CONFIG_LIST)
+        dp = channels.get("__U_POWER_IT")
+        for b in channels.bindings_of("ads1115@0x48"):
+            ...
+
+    :param channel_config_list: Liste der Kanalkonfigurationen
+    :type channel_config_list: list[dict]
+    """
+
+    def __init__(self, channel_config_list: list[dict]):
+
+        # ============================================
+        # Konfiguration des Logging
+        # ============================================
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        self.datapoints: list[DataPoint] = []
+        """Alle Datenpunkte in der Reihenfolge der Konfiguration"""
+
+        self.by_id: dict[str, DataPoint] = {}
+        """Zuordnung Kanal-ID -> Datenpunkt"""
+
+        self.by_driver: dict[str, list[ChannelBinding]] = {}
+        """Zuordnung Treiberinstanz -> Liste der Kanalzuordnungen"""
+
+        for x in channel_config_list:
+            # Auswerten der Konfig Daten aus der CSV
+            try:
+                # Filter aus der Registry oder gleitender Mittelwert (boxcar)
+                filter = create_filter(x['Filter'])
+                if filter is None:
+                    filter_cnt, filter_window_s = parse_window( \
+                        x['Filter'].removeprefix('boxcar:'), 1)
+                else:
+                    filter_cnt, filter_window_s = 1, 0.0
+                history_length, history_window_s = parse_window(x.get('History'))
+                history = {'history_length': history_length} \
+                    if history_length else {}
+                dp = DataPoint(x['ID'],x['Name'],x["Unit"], \
+                    filter_cnt,int(x['TickMax']), int(x['TickFast']), \
+                    float(x['Threshold_Abs']), float(x['Threshold_Perc']), \
+                    filter_window_s=filter_window_s, \
+                    history_window_s=history_window_s, filter=filter, \
+                    **history)
+                binding = ChannelBinding(dp, x['Driver'], \
+                    x['Source'] or x['ID'], float(x['Scale'] or 1), \
+                    int(x['Resolution']) if x.get('Resolution') else None, \
+                    float(x['Series']) if x.get('Series') else None)
+
+            # Programm beenden sollte das Auslesen schief gehen
+            except (KeyError, ValueError):
+                self.logger.critical(f"Fehler in der Kanalkonfiguration bei Kanal {x.get('ID')}. Es werden folgende Spaltenheader erwartet: ID, Name, Description, Unit, Filter, TickMax, TickFast, Threshold_Abs, Threshold_Perc, Driver, Source, Scale, Resolution (optional), History (optional), Series (optional)")
+                print(f"Fehler in der Kanalkonfiguration bei Kanal {x.get('ID')}\nEs werden folgende Spaltenheader erwartet:\nID, Name, Description, Unit, Filter, TickMax, TickFast, Threshold_Abs, Threshold_Perc, Driver, Source, Scale, Resolution (optional), History (optional), Series (optional)")
+                sys.exit("Programm wird beendet wegen falscher Kanal Config...")
+
+            self.add(binding)
+
+    def add(self, binding: ChannelBinding) -> None:
+        """Aufnehmen eines Kanals in das Verzeichnis
+
+        :param binding: Datenpunkt und Zuordnung zur Treiberinstanz
+        :type binding: ChannelBinding
+        """
+        dp = binding.datapoint
+        if dp.id in self.by_id:
+            self.logger.warning(f"Kanal {dp.id} ist mehrfach konfiguriert")
+
+        self.datapoints.append(dp)
+        self.by_id[dp.id] = dp
+        self.by_driver.setdefault(binding.driver, []).append(binding)
+
+    def rebind(self, datapoints: list[DataPoint]) -> None:
+        """Ersetzen aller Datenpunkte, z.B. durch Sichten auf einen Speicher
+
+        :param datapoints: neue Datenpunkte in der Reihenfolge von :mod:`~tatooine_data.channel_registry.ChannelRegistry.datapoints`
+        :type datapoints: list[DataPoint]
+        """
+        replace = {id(old): new for old, new in zip(self.datapoints, datapoints)}
+        self.datapoints = list(datapoints)
+        self.by_id = {dp.id: dp for dp in self.datapoints}
+        for bindings in self.by_driver.values():
+            for b in bindings:
+                b.datapoint = replace[id(b.datapoint)]
+
+    def get(self, id: str) -> DataPoint:
+        """Ausgabe des Datenpunktes zu einer Kanal-ID
+
+        :param id: Kanal-ID
+        :type id: str
+        :return: Datenpunkt oder None, wenn der Kanal nicht konfiguriert ist
+        :rtype: DataPoint
+        """
+        return self.by_id.get(id)
+
+    def drivers(self) -> list[str]:
+        """Ausgabe aller konfigurierten Treiberinstanzen
+
+        :return: Liste der Treiberinstanzen (z.B. ads1115@0x48)
+        :rtype: list[str]
+        """
+        return list(self.by_driver)
+
+    def bindings_of(self, driver: str) -> list[ChannelBinding]:
+        """Ausgabe aller Kanalzuordnungen einer Treiberinstanz
+
+        :param driver: Treiberinstanz (z.B. ads1115@0x48)
+        :type driver: str
+        :return: Liste der Kanalzuordnungen
+        :rtype: list[ChannelBinding]
+        """
+        return self.by_driver.get(driver, [])
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Module zur Bearbeitung der Zeitstempel
+from datetime import datetime
+
+# Modul für vektorisierte Berechnungen
+import numpy as np
+
+# Module für den Schreibpuffer pro Thread
+import threading
+from contextlib import contextmanager
+
+# Import Logging Modul
+import logging
+
+# Klasse für die Abspeicherung der Datenpunkte
+from .datapoint import DataPoint
+
+
+class ChannelStore:
+    """Spaltenweiser Speicher aller Messkanäle in NumPy Arrays
+
+    Anstelle einzelner Python Objekte werden Historie und Statistik aller
+    Kanäle in 2-D Arrays (Kanäle x Historie) für Messwerte und Zeitstempel
+    sowie in Vektoren für Filterbreite, Schwellwerte, Ticker und die
+    berechneten Größen gehalten. Die Berechnung von gefiltertem Wert,
+    Mittelwert, :mod:`~tatooine_data.datapoint.DataPoint.value_dev_abs` und
+    :mod:`~tatooine_data.datapoint.DataPoint.value_dev_perc` erfolgt
+    vektorisiert über alle Kanäle eines Schreibvorgangs und liefert dieselben
+    Ergebnisse wie :func:`~tatooine_data.datapoint.DataPoint.update_value`.
+
+    Für jeden Kanal stellt der Speicher eine
+    :class:`~tatooine_data.channel_store.DataPointView` bereit. Sie verhält
+    sich wie ein :class:`~tatooine_data.datapoint.DataPoint`, hält aber
+    selbst keine Daten.
+
+    Kanäle mit Zeitfenster (:mod:`~tatooine_data.datapoint.DataPoint.is_windowed`)
+    haben eine variable Länge der Historie und bleiben daher eigenständige
+    :class:`~tatooine_data.datapoint.DataPoint` Objekte in
+    :mod:`~tatooine_data.channel_store.ChannelStore.views`.
+
+    Die Filter der Kanäle (:mod:`~tatooine_data.datapoint.DataPoint.filter`)
+    werden beim Übergeben des Wertes in der Sicht angewendet, der Speicher
+    erhält Rohwert und gefilterten Wert.
+
+    Innerhalb von :func:`~tatooine_data.channel_store.ChannelStore.batch`
+    werden alle neuen Werte eines Threads gesammelt und am Ende mit einem
+    Schreibvorgang übernommen.
+
+    .. code-block:: python
+
+        store = ChannelStore(channels.datapoints)
+        with store.batch():
+            for dp in store.views:
+                dp.update_value(1.0, time.time())
+
+    :param datapoints: Datenpunkte mit der Konfiguration der Kanäle
+    :type datapoints: list[DataPoint]
+    """
+
+    def __init__(self, datapoints: list[DataPoint]):
+
+        # ============================================
+        # Konfiguration des Logging
+        # ============================================
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        # Kanäle mit Zeitfenster werden nicht spaltenweise gehalten
+        columnar = [dp for dp in datapoints if not dp.is_windowed]
+
+        n = len(columnar)
+        width = max((dp.history_length for dp in columnar), default=1)
+
+        # Konfiguration pro Kanal
+        self.capacity = np.array([dp.history_length for dp in columnar],
+                                 dtype=np.int64)
+        self.filter_cnt = np.array([dp.filter_cnt for dp in columnar],
+                                   dtype=np.int64)
+        self.thd_deviation_abs = np.array(
+            [dp.thd_deviation_abs for dp in columnar], dtype=float)
+        self.thd_deviation_per = np.array(
+            [dp.thd_deviation_per for dp in columnar], dtype=float)
+        self.storage_tick_counter = np.zeros(n, dtype=np.int64)
+
+        # Historie als Ringpuffer pro Zeile
+        self.values = np.zeros((n, width))
+        self.timestamps = np.zeros((n, width))
+        self.head = np.zeros(n, dtype=np.int64)
+        self.count = np.zeros(n, dtype=np.int64)
+
+        # Aktuelle Werte und Statistik
+        self.value = np.zeros(n)
+        self.value_raw = np.zeros(n)
+        self.value_mean = np.zeros(n)
+        self.value_dev_abs = np.zeros(n)
+        self.value_dev_perc = np.zeros(n)
+        self.timestamp = np.zeros(n)
+
+        # Fortgeschriebene Summen der Historie und des Filterfensters
+        self._sum = np.zeros(n)
+        self._sum_filter = np.zeros(n)
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self._rows = [DataPointView(self, row, dp)
+                      for row, dp in enumerate(columnar)]
+
+        self._has_series = any(v.series is not None for v in self._rows)
+
+        rows = iter(self._rows)
+        self.views = [dp if dp.is_windowed else next(rows)
+                      for dp in datapoints]
+        """Datenpunkte in der Reihenfolge der übergebenen Datenpunkte"""
+
+        if len(columnar) < len(datapoints):
+            self.logger.info(f"{len(datapoints) - len(columnar)} Kanäle mit Zeitfenster werden nicht spaltenweise gehalten")
+
+    @contextmanager
+    def batch(self):
+        """Sammeln aller neuen Werte des aktuellen Threads
+
+        Am Ende des Blocks werden alle gesammelten Werte mit
+        :func:`~tatooine_data.channel_store.ChannelStore.write` übernommen.
+        """
+        pending = self._local.pending = []
+        try:
+            yield
+        finally:
+            self._local.pending = None
+            if pending:
+                rows, values, timestamps, filtered = zip(*pending)
+                self.write(rows, values, timestamps, filtered)
+
+    def update(self, row: int, value: float, timestamp: float,
+               filtered: float = None) -> None:
+        """Neuer Wert eines Kanals, innerhalb eines Batches wird er gesammelt
+
+        :param row: Zeile des Kanals
+        :type row: int
+        :param value: neuer Messwert
+        :type value: float
+        :param timestamp: Zeitstempel des Messwertes
+        :type timestamp: float
+        :param filtered: Ergebnis des Filters des Kanals, defaults to None (value)
+        :type filtered: float [optional]
+        """
+        if filtered is None:
+            filtered = value
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append((row, value, timestamp, filtered))
+        else:
+            self.write((row,), (value,), (timestamp,), (filtered,))
+
+    def write(self, rows, values, timestamps, filtered=None) -> None:
+        """Übernahme mehrerer neuer Werte in einem Schreibvorgang
+
+        Kommt ein Kanal mehrfach vor (z.B. mehrere Flanken eines GPIOs),
+        werden die Werte in ihrer Reihenfolge nacheinander übernommen.
+
+        :param rows: Zeilen der Kanäle
+        :type rows: list[int]
+        :param values: neue Messwerte
+        :type values: list[float]
+        :param timestamps: Zeitstempel der Messwerte
+        :type timestamps: list[float]
+        :param filtered: Ergebnisse der Filter der Kanäle (:mod:`~tatooine_data.datapoint.DataPoint.filter`), defaults to None (values)
+        :type filtered: list[float] [optional]
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        timestamps = np.broadcast_to(np.asarray(timestamps, dtype=float),
+                                     rows.shape)
+        filtered = values if filtered is None \
+            else np.asarray(filtered, dtype=float)
+
+        with self._lock:
+            # Jeder Kanal darf pro Schritt nur einmal vorkommen
+            if len(np.unique(rows)) == len(rows):
+                self._write_unique(rows, values, timestamps, filtered)
+                return
+
+            start = 0
+            seen = set()
+            for i, row in enumerate(rows.tolist()):
+                if row in seen:
+                    self._write_unique(rows[start:i], values[start:i],
+                                       timestamps[start:i], filtered[start:i])
+                    start = i
+                    seen.clear()
+                seen.add(row)
+            self._write_unique(rows[start:], values[start:], timestamps[start:],
+                               filtered[start:])
+
+    def _write_unique(self, rows: np.ndarray, raw: np.ndarray,
+                      timestamps: np.ndarray, filtered: np.ndarray) -> None:
+        """Vektorisierte Berechnung für Kanäle, die je einmal vorkommen
+
+        Der gleitende Mittelwert wird auf das Ergebnis der Filter angewendet
+        (bei Kanälen mit Filter ist filter_cnt 1, der Wert wird übernommen).
+        """
+        capacity = self.capacity[rows]
+        head = self.head[rows]
+        count = self.count[rows]
+        filter_cnt = self.filter_cnt[rows]
+        k = filter_cnt - 1
+        history = self.values
+
+        # Ältesten Wert aus der Historie entfernen (liegt an der Schreibposition)
+        full = count >= capacity
+        total = self._sum[rows] - np.where(full, history[rows, head], 0.0)
+        count = count - full
+
+        # Gleitender Mittelwert über die letzten Werte der Historie
+        sum_filter = self._sum_filter[rows]
+        active = (count >= filter_cnt) & (filter_cnt > 1)
+        value = np.where(active,
+                         (sum_filter + filtered) / np.maximum(filter_cnt, 1),
+                         filtered)
+
+        # Fortschreiben der Summe des Filterfensters
+        has_filter = k > 0
+        leaving = has_filter & (count >= k)
+        sum_filter = sum_filter \
+            - np.where(leaving, history[rows, (head - k) % capacity], 0.0) \
+            + np.where(has_filter, value, 0.0)
+
+        # Updaten der Werte und Historie
+        history[rows, head] = value
+        self.timestamps[rows, head] = timestamps
+        head = (head + 1) % capacity
+        count = count + 1
+
+        self.head[rows] = head
+        self.count[rows] = count
+        self._sum[rows] = total + value
+        self._sum_filter[rows] = sum_filter
+        self.value_raw[rows] = raw
+        self.value[rows] = value
+        self.timestamp[rows] = timestamps
+
+        # Rundungsfehler der Summen nach jedem Umlauf verwerfen
+        for row in rows[head == 0].tolist():
+            self._resum(row)
+
+        # Mittelwert und Abweichung bei voller Historie
+        filled = count >= capacity
+        mean = np.where(filled, self._sum[rows] / count, value)
+        dev_abs = np.where(filled, np.abs(mean - value), 0.0)
+        nonzero = filled & (mean != 0)
+        dev_perc = np.where(nonzero,
+                            dev_abs / np.where(nonzero, mean, 1.0) * 100, 0.0)
+
+        self.value_mean[rows] = mean
+        self.value_dev_abs[rows] = dev_abs
+        self.value_dev_perc[rows] = dev_perc
+
+        # Ablegen in den komprimierten Zeitreihen
+        if self._has_series:
+            for row, t, v in zip(rows.tolist(), timestamps.tolist(),
+                                 value.tolist()):
+                if self._rows[row].series is not None:
+                    self._rows[row].series.append(t, v)
+
+    def _resum(self, row: int) -> None:
+        """Neuberechnung der fortgeschriebenen Summen eines Kanals"""
+        history = self._rows[row].value_history
+        self._sum[row] = sum(history)
+        k = int(self.filter_cnt[row]) - 1
+        self._sum_filter[row] = sum(history[max(0, len(history) - k):]) \
+            if k > 0 else 0.0
+
+
+def _column(name: str, cast, doc: str) -> property:
+    """Eigenschaft einer DataPointView, die auf eine Spalte des Speichers zeigt"""
+
+    def get(self):
+        return cast(getattr(self._store, name)[self._row])
+
+    def set(self, value):
+        getattr(self._store, name)[self._row] = value
+
+    return property(get, set, doc=doc)
+
+
+class DataPointView(DataPoint):
+    """Datenpunkt als Sicht auf eine Zeile eines :class:`~tatooine_data.channel_store.ChannelStore`
+
+    Messwerte, Statistik, Filterbreite, Schwellwerte und Ticker liegen im
+    Speicher. Die übrigen Eigenschaften (Name, Einheit, Speicherflags) werden
+    wie bei einem :class:`~tatooine_data.datapoint.DataPoint` gehalten.
+
+    :param store: Speicher aller Kanäle
+    :type store: ChannelStore
+    :param row: Zeile des Kanals
+    :type row: int
+    :param datapoint: Datenpunkt mit der Konfiguration des Kanals
+    :type datapoint: DataPoint
+    """
+
+    __slots__ = ("_store", "_row")
+
+    _COPIED_FIELDS = ("id", "name", "unit", "storage_tick_max",
+                      "storage_tick_fast", "storage_prelim_hysterese",
+                      "act_val_stored_to_db", "history_length",
+                      "filter_window_s", "history_window_s", "filter",
+                      "series")
+
+    def __init__(self, store: ChannelStore, row: int, datapoint: DataPoint):
+        self._store = store
+        self._row = row
+        for name in self._COPIED_FIELDS:
+            setattr(self, name, getattr(datapoint, name))
+
+    value = _column("value", float, "aktueller Wert inklusive aller Nachbearbeitungen")
+    value_raw = _column("value_raw", float, "aktuell erfasster Messwert Wert ohne Nachbearbeitungen")
+    value_mean = _column("value_mean", float, "Mittelwert der Historie")
+    value_dev_abs = _column("value_dev_abs", float, "absolute Abweichung des letzten Messwertes vom Mittelwert der Historie")
+    value_dev_perc = _column("value_dev_perc", float, "prozentuale Abweichung des Lestzen Messwertes vom Mittelwert der Historie")
+    timestamp = _column("timestamp", float, "Zeitstempel des aktuellen Wertes")
+    filter_cnt = _column("filter_cnt", int, "der Wert gibt die Breite des gleitenden Mittelwertes an")
+    thd_deviation_abs = _column("thd_deviation_abs", float, "Absolute Abweichung, bei der eine Speicherung ausgelöst wird")
+    thd_deviation_per = _column("thd_deviation_per", float, "Prozentuale Abweichung, bei der eine Speicherung ausgelöst wird")
+    storage_tick_counter = _column("storage_tick_counter", int, "Ticker der in jeder Zeitschleife hochgezählt wird")
+    _head = _column("head", int, "Index, an dem der nächste Wert abgelegt wird")
+    _count = _column("count", int, "Anzahl der Werte in der Historie")
+
+    @property
+    def _values(self) -> np.ndarray:
+        """Ringpuffer der Messwerte (Zeile des Speichers)"""
+        return self._store.values[self._row]
+
+    @property
+    def _timestamps(self) -> np.ndarray:
+        """Ringpuffer der Zeitstempel (Zeile des Speichers)"""
+        return self._store.timestamps[self._row]
+
+    def update_value(self, new_value = float , new_timestamp = datetime):
+        """Updaten des Messwertes über den Speicher
+
+        :param new_value: neuer Messwert zum abspeichern
+        :type new_value:  float
+        :param new_timestamp:    Zeitstempel des neuen Messwertes
+        :type new_timestamp:  float
+        """
+        filtered = None if self.filter is None \
+            else self.filter.update(new_value, new_timestamp)
+        self._store.update(self._row, new_value, new_timestamp, filtered)
+
+        # Vermerken, das ein neuer Wert vorliegt
+        self.act_val_stored_to_db = False
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Modul für die Umwandlung der Messwerte in ihre Bitdarstellung
+import struct
+
+# Mathematische Funktionen (log2, isfinite)
+import math
+
+# Liste der Blöcke mit schnellem Entfernen am Anfang
+from collections import deque
+
+# Schutz der Blöcke beim gleichzeitigen Lesen und Schreiben
+import threading
+
+# Modul für die Ausgabe als Arrays
+import numpy as np
+
+
+_DOUBLE = struct.Struct(">d")
+_UINT64 = struct.Struct(">Q")
+
+
+def _float_to_bits(value: float) -> int:
+    return _UINT64.unpack(_DOUBLE.pack(value))[0]
+
+
+def _bits_to_float(bits: int) -> float:
+    return _DOUBLE.unpack(_UINT64.pack(bits))[0]
+
+
+class _BitWriter:
+    """Schreiben einzelner Bitfolgen in ein bytearray (MSB zuerst)"""
+
+    __slots__ = ("data", "_acc", "_nbits")
+
+    def __init__(self):
+        self.data = bytearray()
+        self._acc = 0
+        self._nbits = 0
+
+    def write(self, value: int, nbits: int) -> None:
+        self._acc = (self._acc << nbits) | (value & ((1 << nbits) - 1))
+        self._nbits += nbits
+        while self._nbits >= 8:
+            self._nbits -= 8
+            self.data.append((self._acc >> self._nbits) & 0xFF)
+        self._acc &= (1 << self._nbits) - 1
+
+    def getvalue(self) -> bytes:
+        """Alle geschriebenen Bits, das letzte Byte wird mit 0 aufgefüllt"""
+        if self._nbits:
+            return bytes(self.data) + bytes(((self._acc << (8 - self._nbits)) & 0xFF,))
+        return bytes(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data) + (1 if self._nbits else 0)
+
+
+class _BitReader:
+    """Lesen einzelner Bitfolgen aus einem Bytestring (MSB zuerst)"""
+
+    __slots__ = ("_data", "_pos", "_acc", "_nbits")
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self._pos = 0
+        self._acc = 0
+        self._nbits = 0
+
+    def read(self, nbits: int) -> int:
+        while self._nbits < nbits:
+            # Bis zu 8 Byte auf einmal nachladen
+            chunk = self._data[self._pos:self._pos + 8]
+            self._pos += len(chunk)
+            if not chunk:
+                raise EOFError("Ende der Bitfolge erreicht")
+            self._acc = (self._acc << (8 * len(chunk))) | int.from_bytes(chunk, "big")
+            self._nbits += 8 * len(chunk)
+        self._nbits -= nbits
+        value = self._acc >> self._nbits
+        self._acc &= (1 << self._nbits) - 1
+        return value
+
+    def read_signed(self, nbits: int) -> int:
+        value = self.read(nbits)
+        if value >= 1 << (nbits - 1):
+            value -= 1 << nbits
+        return value
+
+
+class _Block:
+    """Gorilla kodierter Abschnitt einer Zeitreihe"""
+
+    __slots__ = ("bits", "count", "t_first", "t_last", "_delta", "_value",
+                 "_leading", "_trailing")
+
+    # Bereiche der Delta-of-Delta Kodierung: (Präfix, Präfixlänge, Bits)
+    _DOD_BUCKETS = ((0b10, 2, 7), (0b110, 3, 9), (0b1110, 4, 12))
+
+    def __init__(self):
+        self.bits = _BitWriter()
+        self.count = 0
+        self.t_first = None
+        self.t_last = None
+        self._delta = 0
+        self._value = 0
+        self._leading = -1
+        self._trailing = 0
+
+    def append(self, t_ms: int, value: float) -> None:
+        bits = self.bits
+        value_bits = _float_to_bits(value)
+
+        if self.count == 0:
+            # Erster Wert des Blocks unkomprimiert
+            bits.write(t_ms, 64)
+            bits.write(value_bits, 64)
+            self.t_first = t_ms
+        else:
+            # Zeitstempel: Delta-of-Delta in Millisekunden
+            delta = t_ms - self.t_last
+            dod = delta - self._delta
+            self._delta = delta
+            if dod == 0:
+                bits.write(0, 1)
+            else:
+                for prefix, length, n in self._DOD_BUCKETS:
+                    if -(1 << (n - 1)) < dod <= 1 << (n - 1):
+                        bits.write(prefix, length)
+                        bits.write(dod - 1 if dod > 0 else dod, n)
+                        break
+                else:
+                    bits.write(0b1111, 4)
+                    bits.write(dod, 64)
+
+            # Messwert: XOR mit dem vorherigen Wert
+            xor = value_bits ^ self._value
+            if xor == 0:
+                bits.write(0, 1)
+            else:
+                leading = min(64 - xor.bit_length(), 31)
+                trailing = (xor & -xor).bit_length() - 1
+                if self._leading >= 0 and leading >= self._leading \
+                        and trailing >= self._trailing:
+                    # Die signifikanten Bits passen in das vorherige Fenster
+                    bits.write(0b10, 2)
+                    bits.write(xor >> self._trailing,
+                               64 - self._leading - self._trailing)
+                else:
+                    significant = 64 - leading - trailing
+                    bits.write(0b11, 2)
+                    bits.write(leading, 5)
+                    bits.write(significant & 0x3F, 6)
+                    bits.write(xor >> trailing, significant)
+                    self._leading = leading
+                    self._trailing = trailing
+
+        self._value = value_bits
+        self.t_last = t_ms
+        self.count += 1
+
+    def snapshot(self) -> tuple:
+        """Anzahl der Werte und Kopie der kodierten Bits (unter dem Lock der Zeitreihe)"""
+        return self.count, self.bits.getvalue()
+
+    @staticmethod
+    def decode(count: int, data: bytes):
+        """Dekodieren der ersten count Werte aus einer Kopie eines Blocks
+
+        :return: Generator über (Zeitstempel in ms, Messwert)
+        """
+        reader = _BitReader(data)
+        t = reader.read(64)
+        value_bits = reader.read(64)
+        yield t, _bits_to_float(value_bits)
+
+        delta = 0
+        leading = 0
+        trailing = 0
+        for _ in range(count - 1):
+            if reader.read(1):
+                for prefix, length, n in _Block._DOD_BUCKETS:
+                    if not reader.read(1):
+                        dod = reader.read_signed(n)
+                        if dod >= 0:
+                            dod += 1
+                        break
+                else:
+                    dod = reader.read_signed(64)
+                delta += dod
+            t += delta
+
+            if reader.read(1):
+                if reader.read(1):
+                    leading = reader.read(5)
+                    significant = reader.read(6) or 64
+                    trailing = 64 - leading - significant
+                value_bits ^= reader.read(64 - leading - trailing) << trailing
+            yield t, _bits_to_float(value_bits)
+
+
+class CompressedSeries:
+    """Komprimierte Zeitreihe eines Messkanals im Arbeitsspeicher
+
+    Die Messwerte werden wie in Facebooks Gorilla TSDB kodiert: Zeitstempel
+    (in ms) als Differenz der Differenzen in 1 bis 68 Bit, Messwerte als XOR
+    mit dem vorherigen Wert, von dem nur die signifikanten Bits gespeichert
+    werden. Gleichmäßig erfasste, langsam veränderliche Kanäle benötigen so
+    nur wenige Bit pro Wert.
+
+    Verrauschte Messwerte ändern bei jeder Messung fast alle Bits der
+    Mantisse und benötigen so etwa 7 Byte pro Wert. Mit ``resolution`` werden
+    die Werte daher vor der Kodierung auf die Auflösung des Sensors
+    gerundet, und zwar auf die nächstkleinere Zweierpotenz (z.B. 0.01 ->
+    2^-7). Die Werte haben dann nur wenige signifikante Bits, typische Kanäle
+    benötigen 1.3 - 2.7 Byte pro Wert.
+
+    Die Zeitreihe ist in Blöcke von ``block_s`` Sekunden aufgeteilt. Ein Block
+    wird erst verworfen, wenn sein letzter Wert älter als die Vorhaltezeit
+    ist, es bleibt also immer mindestens ``retention_s`` erhalten.
+
+    .. code-block:: python
+
+        series = CompressedSeries(24 * 3600, resolution=0.01)
+        series.append(time.time(), 12.8)
+        timestamps, values = series.to_numpy(time.time() - 3600)
+
+    :param retention_s: Vorhaltezeit der Werte in s, defaults to 86400 (24 h)
+    :type retention_s: float [optional]
+    :param block_s: Zeitraum eines Blocks in s, defaults to 3600
+    :type block_s: float [optional]
+    :param resolution: Auflösung der gespeicherten Werte, defaults to None (volle Genauigkeit)
+    :type resolution: float [optional]
+    """
+
+    def __init__(self, retention_s: float = 86400, block_s: float = 3600,
+                 resolution: float = None):
+        self.retention_ms = int(retention_s * 1000)
+        """Vorhaltezeit der Werte in ms"""
+        self.block_ms = int(block_s * 1000)
+        """Zeitraum eines Blocks in ms"""
+        self.quantum = 2.0 ** math.floor(math.log2(resolution)) \
+            if resolution else None
+        """Schrittweite der gespeicherten Werte (Zweierpotenz, None: volle Genauigkeit)"""
+        self._blocks = deque()
+        self._lock = threading.Lock()
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Anhängen eines neuen Wertes
+
+        :param timestamp: Zeitstempel in s (Auflösung 1 ms)
+        :type timestamp: float
+        :param value: Messwert
+        :type value: float
+        """
+        t_ms = round(timestamp * 1000)
+        value = float(value)
+        if self.quantum is not None and math.isfinite(value):
+            value = round(value / self.quantum) * self.quantum
+        blocks = self._blocks
+        with self._lock:
+            if not blocks or t_ms - blocks[-1].t_first >= self.block_ms:
+                blocks.append(_Block())
+
+                # Blöcke außerhalb der Vorhaltezeit verwerfen
+                while blocks[0].t_last is not None and \
+                        blocks[0].t_last < t_ms - self.retention_ms:
+                    blocks.popleft()
+
+            blocks[-1].append(t_ms, value)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(b.count for b in self._blocks)
+
+    @property
+    def nbytes(self) -> int:
+        """Speicherbedarf der kodierten Werte in Byte"""
+        with self._lock:
+            return sum(len(b.bits) for b in self._blocks)
+
+    def iter_range(self, t_from: float = None, t_to: float = None):
+        """Iteration über alle Werte eines Zeitraums
+
+        Blöcke außerhalb des Zeitraums werden nicht dekodiert. Die übrigen
+        Blöcke werden unter dem Lock kopiert und außerhalb dekodiert, so dass
+        parallel weiter Werte angehängt werden können.
+
+        :param t_from: Beginn des Zeitraums in s, defaults to None (ältester Wert)
+        :type t_from: float [optional]
+        :param t_to: Ende des Zeitraums in s, defaults to None (neuester Wert)
+        :type t_to: float [optional]
+        :return: Generator über (Zeitstempel in s, Messwert)
+        """
+        ms_from = None if t_from is None else round(t_from * 1000)
+        ms_to = None if t_to is None else round(t_to * 1000)
+
+        # Kopie der kodierten Blöcke, da während der Iteration Werte hinzukommen
+        with self._lock:
+            snapshots = [block.snapshot() for block in self._blocks
+                         if block.count
+                         and (ms_from is None or block.t_last >= ms_from)
+                         and (ms_to is None or block.t_first <= ms_to)]
+
+        for count, data in snapshots:
+            for t, value in _Block.decode(count, data):
+                if ms_from is not None and t < ms_from:
+                    continue
+                if ms_to is not None and t > ms_to:
+                    break
+                yield t / 1000, value
+
+    def to_numpy(self, t_from: float = None, t_to: float = None) -> tuple:
+        """Ausgabe der Werte eines Zeitraums als NumPy Arrays
+
+        :param t_from: Beginn des Zeitraums in s, defaults to None (ältester Wert)
+        :type t_from: float [optional]
+        :param t_to: Ende des Zeitraums in s, defaults to None (neuester Wert)
+        :type t_to: float [optional]
+        :return: Zeitstempel in s und Messwerte
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        data = list(self.iter_range(t_from, t_to))
+        if not data:
+            return np.empty(0), np.empty(0)
+        timestamps, values = np.array(data).T
+        return timestamps, values
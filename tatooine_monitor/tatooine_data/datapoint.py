@@ -8,14 +8,61 @@ from pytz import timezone
 # Modul für Datenklassen
 from dataclasses import dataclass
 from dataclasses import field
+from dataclasses import fields
+from dataclasses import MISSING
+import functools
+
+# Mathematische Funktionen (ceil)
+import math
+
+# Vorab angelegter Speicher der Historie
+from array import array
 
 # Import Logging Modul
 import logging
 
+# Inkrementelle Filter der Messwerte
+from .filters import IncrementalFilter
+
+# Komprimierte Zeitreihe der Messwerte
+from .compressed_series import CompressedSeries
+
 # Festlegen der Zeitzone für die Aufnahme der Messwerte und deren Zeitstempel
 tz_berlin = timezone('Europe/Berlin')
 
 
+def _add_slots(cls):
+    """Neuanlage einer Datenklasse mit ``__slots__`` für alle Felder
+
+    Entspricht ``@dataclass(slots=True)``, das erst ab Python 3.10 verfügbar
+    ist. Der Dienst läuft mit dem python3 des Systems (Raspberry Pi OS
+    Bullseye: Python 3.9).
+    """
+    cls_dict = dict(cls.__dict__)
+    names = tuple(f.name for f in fields(cls))
+    cls_dict['__slots__'] = names
+    # Die Standardwerte der Felder stehen in __init__, nur die Felder mit
+    # init=False werden dort nicht gesetzt und würden sonst fehlen
+    for name in names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+
+    defaults = {f.name: f.default for f in fields(cls)
+                if not f.init and f.default is not MISSING}
+    init = cls.__init__
+
+    @functools.wraps(init)
+    def __init__(self, *args, **kwargs):
+        for name, value in defaults.items():
+            setattr(self, name, value)
+        init(self, *args, **kwargs)
+
+    cls_dict['__init__'] = __init__
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@_add_slots
 @dataclass
 class   DataPoint():
     """Datenpunkt Objekt welches alle Informationen eines Messpunktes enthält
@@ -25,8 +72,27 @@ class   DataPoint():
     
     * Speichern des Messwertes und des Zeitstempels
     * Abspeichern einer Historie von :mod:`~tatooine_data.aquire_data.AquireData._MAX_DATA_POINTS_HISTORY` Werten
-    * Filterung
+    * Filterung (gleitender Mittelwert oder ein Filter aus :mod:`~tatooine_data.filters`)
     * Berechnung Mittelwert der Historie und Abweichung dazu
+    * Optional eine komprimierte Zeitreihe über einen längeren Zeitraum (:class:`~tatooine_data.compressed_series.CompressedSeries`)
+
+    Die Historie wird in zwei Ringpuffern fester Größe (``array('d')``) für
+    Messwerte und Zeitstempel gehalten. Die Summen für den gleitenden
+    Mittelwert und den Mittelwert der Historie werden bei jedem neuen Wert
+    fortgeschrieben, so dass :func:`~tatooine_data.datapoint.DataPoint.update_value`
+    unabhängig von der Länge der Historie eine konstante Laufzeit hat. Um
+    Rundungsfehler nicht aufzusummieren, werden die Summen nach jedem Umlauf
+    des Ringpuffers neu berechnet.
+
+    Alternativ können Filter und Historie als Zeitfenster in Sekunden
+    konfiguriert werden (:mod:`~tatooine_data.datapoint.DataPoint.filter_window_s`,
+    :mod:`~tatooine_data.datapoint.DataPoint.history_window_s`). Dann werden
+    bei jedem neuen Wert alle Werte verworfen, die älter als das Zeitfenster
+    sind, und Mittelwert und Abweichung beziehen sich auf die tatsächlich im
+    Zeitfenster liegenden Werte, unabhängig von der Messrate des Kanals oder
+    ausgelassenen Zyklen. Der Ringpuffer wächst dabei bei Bedarf bis auf
+    :mod:`~tatooine_data.datapoint.DataPoint._MAX_WINDOW_SAMPLES` Werte, der
+    Speicherbedarf ist also durch Messrate x größeres Zeitfenster begrenzt.
     
     
     :return:    DatenpunktObjekt
@@ -85,13 +151,55 @@ class   DataPoint():
     """Mit diesem Flag wird gekennzeichnet, dass der aktuell vorhandene Wert schon in der InfluxDB abgelegt wurde. So werden mehrfache unbenötigte Schreibzugriffe unterbunden."""
     
     history_length: int = 10
-    """Anzahl der Werte die in der Historie gespeichert werden"""
-        
-    timestamp_history: list[float] = field(default_factory=list)
-    """Historie am Zeitstempeln mit der Länge :mod:`~tatooine_data.aquire_data.AquireData._MAX_DATA_POINTS_HISTORY` """ 
-    
-    value_history: list[float] = field(default_factory=list)
-    """Historie am Messwerten mit der Länge :mod:`~tatooine_data.aquire_data.AquireData._MAX_DATA_POINTS_HISTORY` """    
+    """Anzahl der Werte die in der Historie gespeichert werden (nach der Initialisierung unveränderlich). Bei einem Zeitfenster ist es die aktuelle Größe des Ringpuffers."""
+
+    filter_window_s: float = 0
+    """Breite des gleitenden Mittelwertes in s (0: es gilt filter_cnt)"""
+
+    history_window_s: float = 0
+    """Zeitfenster der Historie in s (0: es gilt history_length)"""
+
+    filter: IncrementalFilter = None
+    """Inkrementeller Filter aus :mod:`~tatooine_data.filters`, der anstelle des gleitenden Mittelwertes angewendet wird (None: gleitender Mittelwert über filter_cnt bzw. filter_window_s)"""
+
+    series: CompressedSeries = None
+    """Komprimierte Zeitreihe, in der jeder neue Wert abgelegt wird (None: keine Zeitreihe)"""
+
+    _values: array = field(init=False, repr=False, compare=False)
+    """Ringpuffer der Messwerte"""
+
+    _timestamps: array = field(init=False, repr=False, compare=False)
+    """Ringpuffer der Zeitstempel"""
+
+    _head: int = field(default=0, init=False, repr=False, compare=False)
+    """Index, an dem der nächste Wert abgelegt wird"""
+
+    _count: int = field(default=0, init=False, repr=False, compare=False)
+    """Anzahl der Werte in der Historie"""
+
+    _sum: float = field(default=0.0, init=False, repr=False, compare=False)
+    """Summe aller Werte der Historie"""
+
+    _sum_filter: float = field(default=0.0, init=False, repr=False, compare=False)
+    """Summe der letzten filter_cnt - 1 Werte der Historie"""
+
+    _filter_count: int = field(default=0, init=False, repr=False, compare=False)
+    """Anzahl der Werte der Historie im Zeitfenster des Filters"""
+
+    _t_first: float = field(default=None, init=False, repr=False, compare=False)
+    """Zeitstempel des ersten Wertes (Historie mit Zeitfenster)"""
+
+    _buffered: int = field(default=0, init=False, repr=False, compare=False)
+    """Anzahl der Werte im Ringpuffer, mindestens die Werte von Historie und Filterfenster (Zeitfenster)"""
+
+    _history_max: int = field(default=0, init=False, repr=False, compare=False)
+    """Anzahl der Werte der Historie ohne Zeitfenster der Historie (history_length bei der Initialisierung)"""
+
+    _window_truncated: bool = field(default=False, init=False, repr=False, compare=False)
+    """Das Zeitfenster wurde durch _MAX_WINDOW_SAMPLES verkürzt (einmalige Warnung)"""
+
+    _MAX_WINDOW_SAMPLES = 4096
+    """Obergrenze des Ringpuffers bei einer Historie mit Zeitfenster"""
     
     # ============================================
     # Konfiguration des Logging
@@ -99,7 +207,51 @@ class   DataPoint():
     logger = logging.getLogger(__name__)
     #logger.setLevel(logging.DEBUG)
     logger.addHandler(logging.NullHandler())
-    
+
+    def __post_init__(self):
+        # Ringpuffer einmalig in voller Länge anlegen
+        self._values = array('d', bytes(8 * self.history_length))
+        self._timestamps = array('d', bytes(8 * self.history_length))
+        self._history_max = self.history_length
+
+    @property
+    def is_windowed(self) -> bool:
+        """Filter oder Historie werden über ein Zeitfenster in s bestimmt"""
+        return self.history_window_s > 0 or self.filter_window_s > 0
+
+    @property
+    def value_history(self) -> list[float]:
+        """Historie an Messwerten in zeitlicher Reihenfolge (Kopie)"""
+        return self._ordered(self._values)
+
+    @property
+    def timestamp_history(self) -> list[float]:
+        """Historie an Zeitstempeln in zeitlicher Reihenfolge (Kopie)"""
+        return self._ordered(self._timestamps)
+
+    def _ordered(self, buffer: array, count: int = None) -> list[float]:
+        """Ausgabe der letzten count Werte (defaults to _count) eines Ringpuffers vom ältesten zum neuesten Wert"""
+        if count is None:
+            count = self._count
+        start = (self._head - count) % self.history_length
+        return [buffer[(start + i) % self.history_length]
+                for i in range(count)]
+
+    def _resum(self) -> None:
+        """Neuberechnung der fortgeschriebenen Summen aus der Historie"""
+        if self.is_windowed:
+            # Historie und Filterfenster sind jeweils die neuesten Werte des
+            # Ringpuffers
+            self._sum = sum(self._ordered(self._values))
+            self._sum_filter = sum(self._ordered(self._values,
+                                                 self._filter_count))
+            return
+
+        history = self.value_history
+        self._sum = sum(history)
+        k = self._filter_count if self.is_windowed else self.filter_cnt - 1
+        self._sum_filter = sum(history[max(0, len(history) - k):]) \
+            if k > 0 else 0.0
     
     def update_value(self, new_value = float , new_timestamp = datetime):
         """Updaten des Messwertes in der Dataclass
@@ -110,8 +262,8 @@ class   DataPoint():
         
         Folgende Schritte werden ausgeführt:
         
-        1. Löschen des ältesten Wertes der Historie
-        2. Filtern des aktuellen Wertes durch Mittelwertbildung mit den letzten :mod:`~tatooine_data.datapoint.DataPoint.filter_cnt` Werten der Historie.
+        1. Löschen des ältesten Wertes der Historie (Überschreiben im Ringpuffer)
+        2. Filtern des aktuellen Wertes durch Mittelwertbildung mit den letzten :mod:`~tatooine_data.datapoint.DataPoint.filter_cnt` Werten der Historie (fortgeschriebene Summe) oder mit dem konfigurierten :mod:`~tatooine_data.datapoint.DataPoint.filter`.
         3. Speichern in der neuen Werte in der Historie :mod:`~tatooine_data.aquire_data.AquireData._MAX_DATA_POINTS_HISTORY`
         4. Berechnung des neuen Mittelwertes der Historie und der Abweichung des letzten Wertes von diesem Mittelwert
 
@@ -121,24 +273,35 @@ class   DataPoint():
         :type new_timestamp:  datetime
         """        
         
+        if self.is_windowed:
+            self._update_windowed(new_value, new_timestamp)
+            return
+
+        capacity = self.history_length
+        values = self._values
+        head = self._head
+        k = self.filter_cnt - 1
+
         #-----------------------------------------------------------------------
         # Ältesten Wert aus der Historie entfernen
         #-----------------------------------------------------------------------
-        if len(self.value_history) >= self.history_length:
-            del self.value_history[0]
-            
-        if len(self.timestamp_history) >= self.history_length:
-            del self.timestamp_history[0]
+        count = self._count
+        if count >= capacity:
+            # Der älteste Wert liegt an der Schreibposition
+            self._sum -= values[head]
+            count -= 1
                         
         #-----------------------------------------------------------------------
         # Nachbearbeitung (filtern) des aktuellen Messwertes
         #-----------------------------------------------------------------------
         self.value_raw = new_value
-        if (len(self.value_history) >= self.filter_cnt) and \
-            (self.filter_cnt > 1):
+        if self.filter is not None:
+            # Filter aus der Spalte Filter (EMA, Median, Kalman)
+            self.value = self.filter.update(new_value, new_timestamp)
+
+        elif (count >= self.filter_cnt) and (self.filter_cnt > 1):
             # Berechnung des gleitenden Mittelwertes über lie letzten Messwerte
-            self.value = (sum(self.value_history[(len(self.value_history) - \
-                         self.filter_cnt + 1):]) + self.value_raw) / self.filter_cnt
+            self.value = (self._sum_filter + self.value_raw) / self.filter_cnt
             
         else:
             # Wenn noch keinen Historie vorhanden, dann wird der Rohwert 
@@ -148,21 +311,30 @@ class   DataPoint():
         #-----------------------------------------------------------------------
         # Updaten der Werte und Historie
         #-----------------------------------------------------------------------
-        self.value_history.append(self.value)
-        self.timestamp_history.append(new_timestamp)
+        if k > 0:
+            # Der Wert vor k Positionen verlässt das Fenster des Filters
+            if count >= k:
+                self._sum_filter -= values[(head - k) % capacity]
+            self._sum_filter += self.value
+        self._sum += self.value
+
+        values[head] = self.value
+        self._timestamps[head] = new_timestamp
+        self._head = (head + 1) % capacity
+        self._count = count + 1
         self.timestamp = new_timestamp
 
+        # Rundungsfehler der Summen nach jedem Umlauf verwerfen
+        if self._head == 0:
+            self._resum()
+
         #-----------------------------------------------------------------------
         # Berechnung der Mittelwerte und aktuellen Abweichung für die gesamte
         # Historie
         #-----------------------------------------------------------------------
-        if (len(self.value_history)>= (self.history_length)):
-            mean = 0        
-            for x in self.value_history:
-                mean += x
-                
+        if (self._count >= capacity):
             #Berechne die Statistikdaten
-            self.value_mean = mean / len(self.value_history)
+            self.value_mean = self._sum / self._count
             self.value_dev_abs = abs(self.value_mean - self.value)
             if self.value_mean == 0:
                 self.value_dev_perc = float(0)
@@ -175,10 +347,191 @@ class   DataPoint():
             self.value_dev_abs = float(0)
             self.value_dev_perc = float(0)
             
+        # Ablegen in der komprimierten Zeitreihe
+        if self.series is not None:
+            self.series.append(new_timestamp, self.value)
+
         # Vermerken, das ein neuer Wert vorliegt    
         self.act_val_stored_to_db = False
         
         
+    def _update_windowed(self, new_value: float, new_timestamp: float) -> None:
+        """Updaten des Messwertes bei Filter und Historie mit Zeitfenster
+
+        Wie :func:`~tatooine_data.datapoint.DataPoint.update_value`, jedoch
+        werden die Werte nicht nach ihrer Anzahl, sondern nach ihrem Alter aus
+        Historie und Filterfenster entfernt. Ohne Zeitfenster der Historie
+        gilt weiterhin history_length, ohne Zeitfenster des Filters filter_cnt.
+
+        Historie und Filterfenster sind unabhängig voneinander die neuesten
+        Werte des Ringpuffers. Er hält so viele Werte, wie das größere der
+        beiden Fenster benötigt, ein Filterfenster von 7.5 s wird also auch
+        bei einer Historie von 10 Werten nicht verkürzt.
+
+        :param new_value: neuer Messwert zum abspeichern
+        :type new_value:  float
+        :param new_timestamp:    Zeitstempel des neuen Messwertes in s
+        :type new_timestamp:  float
+        """
+        values = self._values
+        timestamps = self._timestamps
+        if self._t_first is None:
+            self._t_first = new_timestamp
+
+        #-----------------------------------------------------------------------
+        # Alle Werte außerhalb des Zeitfensters der Historie entfernen
+        #-----------------------------------------------------------------------
+        if self.history_window_s > 0:
+            oldest = new_timestamp - self.history_window_s
+            while self._count and \
+                    timestamps[(self._head - self._count) % self.history_length] < oldest:
+                self._sum -= values[(self._head - self._count) % self.history_length]
+                self._count -= 1
+        elif self._count >= self._history_max:
+            self._sum -= values[(self._head - self._count) % self.history_length]
+            self._count -= 1
+
+        #-----------------------------------------------------------------------
+        # Werte außerhalb des Filterfensters verlassen die Filtersumme
+        #-----------------------------------------------------------------------
+        if self.filter_window_s > 0:
+            oldest = new_timestamp - self.filter_window_s
+            while self._filter_count and \
+                    timestamps[(self._head - self._filter_count) % self.history_length] < oldest:
+                self._sum_filter -= values[(self._head - self._filter_count) % self.history_length]
+                self._filter_count -= 1
+        else:
+            k = self.filter_cnt - 1
+            if k > 0 and self._filter_count > k:
+                self._sum_filter -= values[(self._head - self._filter_count) % self.history_length]
+                self._filter_count -= 1
+
+        #-----------------------------------------------------------------------
+        # Nachbearbeitung (filtern) des aktuellen Messwertes
+        #-----------------------------------------------------------------------
+        self.value_raw = new_value
+        if self.filter is not None:
+            self.value = self.filter.update(new_value, new_timestamp)
+        elif self._filter_count:
+            # Gleitender Mittelwert über die Werte im Filterfenster
+            self.value = (self._sum_filter + new_value) / (self._filter_count + 1)
+        else:
+            self.value = new_value
+
+        #-----------------------------------------------------------------------
+        # Updaten der Werte und Historie
+        #-----------------------------------------------------------------------
+        # Werte, die weder in der Historie noch im Filterfenster liegen,
+        # werden nicht mehr benötigt
+        self._buffered = max(self._count, self._filter_count)
+        if self._buffered >= self.history_length:
+            if self.history_length < self._MAX_WINDOW_SAMPLES:
+                self._grow()
+            else:
+                self._drop_oldest()
+
+        values = self._values
+        head = self._head
+        values[head] = self.value
+        self._timestamps[head] = new_timestamp
+        self._head = (head + 1) % self.history_length
+        self._buffered += 1
+        self._count += 1
+        self._sum += self.value
+        if self.filter_window_s > 0 or self.filter_cnt > 1:
+            self._sum_filter += self.value
+            self._filter_count += 1
+        self.timestamp = new_timestamp
+
+        # Rundungsfehler der Summen nach jedem Umlauf verwerfen
+        if self._head == 0:
+            self._resum()
+
+        #-----------------------------------------------------------------------
+        # Berechnung der Mittelwerte und aktuellen Abweichung über das
+        # Zeitfenster der Historie
+        #-----------------------------------------------------------------------
+        if self.history_window_s > 0:
+            filled = new_timestamp - self._t_first >= self.history_window_s
+        else:
+            filled = self._count >= self._history_max
+        if filled:
+            self.value_mean = self._sum / self._count
+            self.value_dev_abs = abs(self.value_mean - self.value)
+            if self.value_mean == 0:
+                self.value_dev_perc = float(0)
+            else:
+                self.value_dev_perc = float(self.value_dev_abs / self.value_mean
+                                            *100)
+        else:
+            # Sonderfall nach Einschalten der Messung
+            self.value_mean = self.value
+            self.value_dev_abs = float(0)
+            self.value_dev_perc = float(0)
+
+        # Ablegen in der komprimierten Zeitreihe
+        if self.series is not None:
+            self.series.append(new_timestamp, self.value)
+
+        # Vermerken, das ein neuer Wert vorliegt
+        self.act_val_stored_to_db = False
+
+    def check_window(self, period_s: float) -> bool:
+        """Prüfung, ob die Zeitfenster bei der Messperiode in den Ringpuffer passen
+
+        Umfasst das größere der beiden Zeitfenster mehr als
+        :mod:`~tatooine_data.datapoint.DataPoint._MAX_WINDOW_SAMPLES` Werte,
+        werden Filter und Historie im Betrieb verkürzt. Dies wird bereits beim
+        Start als Warnung ausgegeben.
+
+        :param period_s: Messperiode des Kanals in s
+        :type period_s: float
+        :return: False, wenn die Zeitfenster verkürzt werden
+        :rtype: bool
+        """
+        if not self.is_windowed or period_s <= 0:
+            return True
+
+        history = self.history_window_s / period_s \
+            if self.history_window_s > 0 else self._history_max
+        filter = self.filter_window_s / period_s \
+            if self.filter_window_s > 0 else self.filter_cnt
+        samples = math.ceil(max(history, filter)) + 1
+        if samples > self._MAX_WINDOW_SAMPLES:
+            self.logger.warning(f"Zeitfenster von {self.id} umfasst bei {period_s * 1000:0.0f} ms ca. {samples} Werte, es werden nur die letzten {self._MAX_WINDOW_SAMPLES} Werte gehalten")
+            return False
+        return True
+
+    def _drop_oldest(self) -> None:
+        """Entfernen des ältesten Wertes aus dem vollen Ringpuffer (_MAX_WINDOW_SAMPLES)
+
+        Historie und Filterfenster werden dadurch kürzer als konfiguriert.
+        """
+        value = self._values[(self._head - self._buffered) % self.history_length]
+        if self._count == self._buffered:
+            self._sum -= value
+            self._count -= 1
+        if self._filter_count == self._buffered:
+            self._sum_filter -= value
+            self._filter_count -= 1
+        self._buffered -= 1
+
+        if not self._window_truncated:
+            self._window_truncated = True
+            self.logger.warning(f"Zeitfenster von {self.id} auf {self._MAX_WINDOW_SAMPLES} Werte begrenzt, Filter und Historie werden verkürzt")
+
+    def _grow(self) -> None:
+        """Verdoppeln des Ringpuffers (bis _MAX_WINDOW_SAMPLES)"""
+        capacity = min(2 * self.history_length, self._MAX_WINDOW_SAMPLES)
+        padding = bytes(8 * (capacity - self._buffered))
+        self._values = array('d', self._ordered(self._values, self._buffered)) \
+            + array('d', padding)
+        self._timestamps = array('d', self._ordered(self._timestamps, self._buffered)) \
+            + array('d', padding)
+        self._head = self._buffered % capacity
+        self.history_length = capacity
+        self.logger.debug(f"Ringpuffer von {self.id} auf {capacity} Werte vergrößert")
+
     def print_data_line(self) -> str:
         """ Print Funktion zur Darstellung des Messwertes und der Statistik in
             einer Linie.
@@ -225,11 +578,12 @@ class   DataPoint():
         
         # Erzeuge JSON Datenstruktur passend zu InfluxDB für den vorletzten
         # Messwert
-        if ((number_of_points == 2) and (len(self.value_history) > 1)):
+        if ((number_of_points == 2) and (self._count > 1)):
             
             #Berechnung aller Werte des vorletzten Messpunktes aus der Historie
-            timestamp = self.timestamp_history[len(self.timestamp_history)-2]
-            penultimate_val = self.value_history[len(self.value_history)-2]
+            i = (self._head - 2) % self.history_length
+            timestamp = self._timestamps[i]
+            penultimate_val = self._values[i]
             
             #Berechnung der Statistik des vorletzten Messpunktes 
             penultimate_dev_abs = abs(self.value_mean - penultimate_val)
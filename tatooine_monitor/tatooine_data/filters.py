@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Mathematische Funktionen (exp, isnan)
+import math
+
+# Vorab angelegter Speicher des Medianfensters
+from array import array
+
+
+FILTER_REGISTRY = {}
+"""Zuordnung Filtername (z.B. ``ema``) -> Filter Klasse"""
+
+
+def register_filter(name: str):
+    """Decorator zur Registrierung eines Filters
+
+    .. code-block:: python
+
+        @register_filter("ema")
+        class EmaFilter(IncrementalFilter):
+            ...
+
+    :param name: Name des Filters, wie er in der Spalte Filter steht
+    :type name: str
+    """
+    def decorator(cls):
+        cls.NAME = name
+        FILTER_REGISTRY[name] = cls
+        return cls
+
+    return decorator
+
+
+def create_filter(spec: str):
+    """Anlegen eines Filters aus einem Eintrag der Spalte Filter
+
+    Der Eintrag besteht aus dem Namen des Filters und seinen durch ``:``
+    getrennten Parametern (z.B. ``ema:0.2``, ``median:5``,
+    ``kalman:0.01:0.5``).
+
+    :param spec: Eintrag der Spalte Filter
+    :type spec: str
+    :raises ValueError: unbekannter Filter oder fehlerhafte Parameter
+    :return: neuer Filter oder None, wenn der Eintrag keinen Filter aus :mod:`~tatooine_data.filters.FILTER_REGISTRY` nennt
+    :rtype: IncrementalFilter
+    """
+    name, *args = spec.strip().split(":")
+    if name not in FILTER_REGISTRY:
+        return None
+    try:
+        return FILTER_REGISTRY[name](*args)
+    except TypeError as e:
+        raise ValueError(f"Filter {spec}: {e}") from None
+
+
+class IncrementalFilter:
+    """Basisklasse der inkrementellen Filter
+
+    Ein Filter erhält jeden neuen Messwert eines Kanals und gibt den
+    gefilterten Wert zurück. Der Zustand wird bei der Initialisierung
+    vollständig angelegt, ein neuer Wert kostet O(1) bzw. O(log n).
+
+    Ungültige Messwerte (NaN) werden unverändert durchgereicht und verändern
+    den Zustand des Filters nicht.
+    """
+
+    NAME = None
+    """Name des Filters (wird von :func:`~tatooine_data.filters.register_filter` gesetzt)"""
+
+    def update(self, value: float, timestamp: float) -> float:
+        """Filtern eines neuen Messwertes
+
+        :param value: neuer Messwert
+        :type value: float
+        :param timestamp: Zeitstempel des Messwertes in s
+        :type timestamp: float
+        :return: gefilterter Wert
+        :rtype: float
+        """
+        if math.isnan(value):
+            return value
+        return self._update(value, timestamp)
+
+    def _update(self, value: float, timestamp: float) -> float:
+        raise NotImplementedError
+
+
+@register_filter("ema")
+class EmaFilter(IncrementalFilter):
+    """Exponentiell gleitender Mittelwert
+
+    Die Glättung wird entweder als Faktor alpha (``ema:0.2``) oder als
+    Zeitkonstante in Sekunden (``ema:5s``) angegeben. Mit einer Zeitkonstante
+    wird alpha aus dem Abstand der Zeitstempel berechnet, so dass die
+    Glättung unabhängig von der Messrate des Kanals ist.
+
+    :param alpha: Faktor (0 < alpha <= 1) oder Zeitkonstante mit dem Zusatz s, defaults to 0.2
+    :type alpha: str or float [optional]
+    """
+
+    def __init__(self, alpha="0.2"):
+        alpha = str(alpha).strip()
+        self.tau = None
+        """Zeitkonstante in s (None: fester Faktor alpha)"""
+        self.alpha = None
+        """Fester Glättungsfaktor"""
+
+        if alpha.endswith("s"):
+            self.tau = float(alpha[:-1])
+            if self.tau <= 0:
+                raise ValueError(f"EMA Zeitkonstante {alpha} muss größer 0 sein")
+        else:
+            self.alpha = float(alpha)
+            if not 0 < self.alpha <= 1:
+                raise ValueError(f"EMA Faktor {alpha} muss zwischen 0 und 1 liegen")
+
+        self._value = None
+        self._timestamp = None
+
+    def _update(self, value: float, timestamp: float) -> float:
+        if self._value is None:
+            self._value = value
+        else:
+            if self.tau is None:
+                alpha = self.alpha
+            else:
+                alpha = 1.0 - math.exp(-max(timestamp - self._timestamp, 0.0) / self.tau)
+            self._value += alpha * (value - self._value)
+        self._timestamp = timestamp
+        return self._value
+
+
+class _IndexedHeap:
+    """Binärer Min-Heap über Indizes eines gemeinsamen Wertearrays
+
+    Die Position jedes Index im Heap wird mitgeführt, so dass sich ein Wert
+    ändern oder entfernen lässt, ohne den Heap zu durchsuchen. Mit sign -1
+    entsteht ein Max-Heap.
+    """
+
+    __slots__ = ("slots", "pos", "size", "values", "sign")
+
+    def __init__(self, capacity: int, values: array, sign: int):
+        self.slots = [0] * capacity
+        self.pos = [-1] * capacity
+        self.size = 0
+        self.values = values
+        self.sign = sign
+
+    def top(self) -> int:
+        return self.slots[0]
+
+    def push(self, slot: int) -> None:
+        i = self.size
+        self.size += 1
+        self.slots[i] = slot
+        self.pos[slot] = i
+        self._up(i)
+
+    def pop(self) -> int:
+        slot = self.slots[0]
+        self.size -= 1
+        self.pos[slot] = -1
+        if self.size:
+            last = self.slots[self.size]
+            self.slots[0] = last
+            self.pos[last] = 0
+            self._down(0)
+        return slot
+
+    def fix(self, slot: int) -> None:
+        """Wiederherstellen der Heap Eigenschaft nach Änderung eines Wertes"""
+        self._up(self.pos[slot])
+        self._down(self.pos[slot])
+
+    def _key(self, i: int) -> float:
+        return self.sign * self.values[self.slots[i]]
+
+    def _swap(self, i: int, j: int) -> None:
+        slots = self.slots
+        slots[i], slots[j] = slots[j], slots[i]
+        self.pos[slots[i]] = i
+        self.pos[slots[j]] = j
+
+    def _up(self, i: int) -> None:
+        while i > 0:
+            parent = (i - 1) >> 1
+            if self._key(i) >= self._key(parent):
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _down(self, i: int) -> None:
+        size = self.size
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and self._key(child + 1) < self._key(child):
+                child += 1
+            if self._key(i) <= self._key(child):
+                break
+            self._swap(i, child)
+            i = child
+
+
+@register_filter("median")
+class MedianFilter(IncrementalFilter):
+    """Gleitender Median über die letzten Messwerte (``median:5``)
+
+    Das Fenster wird in einem Ringpuffer gehalten, dessen Einträge auf zwei
+    indizierte Heaps verteilt sind: ein Max-Heap mit der unteren und ein
+    Min-Heap mit der oberen Hälfte. Der Median liegt damit immer an der
+    Spitze der Heaps. Ein neuer Wert überschreibt den ältesten Eintrag direkt
+    in seinem Heap, so dass jeder Schritt O(log n) kostet und kein Speicher
+    angelegt wird. Einzelne Ausreißer (z.B. Störimpulse am ADC) werden im
+    Gegensatz zum Mittelwert vollständig unterdrückt.
+
+    :param window: Anzahl der Werte im Fenster, defaults to 5
+    :type window: str or int [optional]
+    """
+
+    def __init__(self, window="5"):
+        self.window = int(window)
+        if self.window < 1:
+            raise ValueError(f"Median Fenster {window} muss mindestens 1 sein")
+
+        self._values = array('d', bytes(8 * self.window))
+        self._low = _IndexedHeap(self.window, self._values, -1)
+        self._high = _IndexedHeap(self.window, self._values, 1)
+        self._head = 0
+        self._count = 0
+
+    def _update(self, value: float, timestamp: float) -> float:
+        values = self._values
+        low = self._low
+        high = self._high
+        slot = self._head
+        values[slot] = value
+
+        if self._count < self.window:
+            # Fenster füllen, die untere Hälfte ist gleich groß oder um
+            # einen Wert größer als die obere Hälfte
+            self._count += 1
+            low.push(slot)
+            high.push(low.pop())
+            if high.size > low.size:
+                low.push(high.pop())
+        else:
+            # Der älteste Wert wird in seinem Heap überschrieben
+            (low if low.pos[slot] >= 0 else high).fix(slot)
+            if high.size and values[low.top()] > values[high.top()]:
+                a = low.pop()
+                b = high.pop()
+                low.push(b)
+                high.push(a)
+
+        self._head = (slot + 1) % self.window
+
+        if low.size > high.size:
+            return values[low.top()]
+        return (values[low.top()] + values[high.top()]) / 2
+
+
+@register_filter("kalman")
+class KalmanFilter(IncrementalFilter):
+    """Skalarer Kalman Filter für einen langsam veränderlichen Messwert
+
+    Als Modell wird ein konstanter Wert mit zufälliger Änderung angenommen
+    (``kalman:q:r``). Das Prozessrauschen q wird pro Sekunde angegeben und mit
+    dem Abstand der Zeitstempel skaliert, das Messrauschen r ist die Varianz
+    einer einzelnen Messung.
+
+    :param q: Varianz des Prozessrauschens pro s, defaults to 0.01
+    :type q: str or float [optional]
+    :param r: Varianz des Messrauschens, defaults to 1
+    :type r: str or float [optional]
+    """
+
+    def __init__(self, q="0.01", r="1"):
+        self.q = float(q)
+        """Varianz des Prozessrauschens pro s"""
+        self.r = float(r)
+        """Varianz des Messrauschens"""
+        if self.q < 0 or self.r <= 0:
+            raise ValueError(f"Kalman Parameter q={q} r={r} nicht zulässig")
+
+        self._value = None
+        self._p = self.r
+        self._timestamp = None
+
+    def _update(self, value: float, timestamp: float) -> float:
+        if self._value is None:
+            self._value = value
+        else:
+            # Vorhersage: die Unsicherheit wächst mit der Zeit
+            self._p += self.q * max(timestamp - self._timestamp, 0.0)
+
+            # Korrektur mit dem neuen Messwert
+            gain = self._p / (self._p + self.r)
+            self._value += gain * (value - self._value)
+            self._p *= 1.0 - gain
+        self._timestamp = timestamp
+        return self._value
@@ -1,80 +1,310 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-# Import RaspberryPI GPIOS
-import RPi.GPIO as GPIO
+# Import RaspberryPI GPIOS (wird für das Backend chardev nicht benötigt)
+try:
+    import RPi.GPIO as GPIO
+except ImportError:
+    GPIO = None
+
+# GPIO Character Device des Kernels
+from driver.gpio_chardev import GpioChip
 
 # Import Logging Modul
 import logging
 
+# Module für den Ereignispuffer und die Zeitstempel
+from collections import deque
+import time
+
 # Import System Module
-import os, signal
+import sys
 
 class GpioService:
     """Serviceklasse zum Auslesen der GPIOs
-    
+
     In der Klasse sind alle Methoden zum auslesend der GPIOs enthalten.
-    Die zu bearbeitenden IOs sind in _GPIO_IN definiert.
-    
+    Die zu bearbeitenden IOs werden bei der Initialisierung übergeben,
+    ansonsten werden die IOs aus _GPIO_IN verwendet.
+
     Features:
-    
-    * Limitierung der Anzahl der EMails pro Tag
-    
-    
+
+    * einmalige Konfiguration der IOs beim Start
+    * Auslesen aller IOs in einem Durchlauf in einen vorab angelegten Zustandsvektor
+    * Ausgabe der IOs, deren Pegel sich seit der letzten Auslesung geändert hat
+    * Ereignismodus: Erfassung aller Flanken per Interrupt mit exaktem Zeitstempel
+    * Zähler der steigenden Flanken und Einschaltdauer pro IO
+
+    Im Ereignismodus (:mod:`~tatooine_data.gpio_service.GpioService.MODE_EVENT`) wird nicht mehr gepollt. Die Callbacks von RPi.GPIO legen jede Flanke mit Zeitstempel in einem Puffer ab (``deque.append`` ist atomar und benötigt keinen Lock). Der Puffer wird zyklisch mit :func:`~tatooine_data.gpio_service.GpioService.drain_events` als Block abgeholt.
+
+    Mit dem Backend :mod:`~tatooine_data.gpio_service.GpioService.BACKEND_CHARDEV` wird statt RPi.GPIO das GPIO Character Device des Kernels (:mod:`~driver.gpio_chardev`) verwendet. Alle Eingänge werden dann mit einem ioctl gelesen und die Flanken tragen den Zeitstempel des Kernels. Da kein globaler Zustand existiert, kann der Service aus den Threads der Datenerfassung verwendet werden.
+
+    .. code-block:: python
+
+        gpio = GpioService([14, 15, 17])
+        for i in gpio.read_all():
+            print(gpio.pins[i], gpio.state[i])
+
+        gpio = GpioService([14, 15, 17], GpioService.MODE_EVENT)
+        for i, level, timestamp in gpio.drain_events():
+            print(gpio.pins[i], level, timestamp)
+
     :return:    GPIO_Service Object
     :rtype:     Object
-    
-    """    
-    
+
+    """
+
     _GPIO_IN = [14,15,17,18,27]
     """Spezifiziert auszulesenden GPIOs, welche als Eingänge definiert werden.
     """
-        
-    def __init__(self):
-         
-         
+
+    _GPIO_VALID = range(0, 28)
+    """Gültige BCM Nummern der GPIOs des RaspberryPi"""
+
+    MODE_POLL = "poll"
+    """Die IOs werden zyklisch mit :func:`~tatooine_data.gpio_service.GpioService.read_all` gelesen"""
+
+    MODE_EVENT = "event"
+    """Die Flanken der IOs werden per Interrupt erfasst"""
+
+    BACKEND_RPI = "rpi"
+    """Zugriff auf die GPIOs über RPi.GPIO"""
+
+    BACKEND_CHARDEV = "chardev"
+    """Zugriff auf die GPIOs über das Character Device des Kernels"""
+
+    _EVENT_BUFFER_SIZE = 4096
+    """Maximale Anzahl gepufferter Flanken, bei Überlauf gehen die ältesten verloren"""
+
+    def __init__(self, pins: list[int] = None, mode: str = MODE_POLL,
+                 bouncetime_ms: int = 0, backend: str = BACKEND_RPI,
+                 chip = "/dev/gpiochip0"):
+        """Initialisierung und einmalige Konfiguration der GPIO Eingänge
+
+        :param pins: BCM Nummern der Eingänge, defaults to _GPIO_IN
+        :type pins: list[int], optional
+        :param mode: MODE_POLL oder MODE_EVENT, defaults to MODE_POLL
+        :type mode: str, optional
+        :param bouncetime_ms: Entprellzeit im Ereignismodus, defaults to 0
+        :type bouncetime_ms: int, optional
+        :param backend: BACKEND_RPI oder BACKEND_CHARDEV, defaults to BACKEND_RPI
+        :type backend: str, optional
+        :param chip: Pfad oder Objekt des GPIO Controllers (nur chardev), defaults to "/dev/gpiochip0"
+        :type chip: str oder GpioChip, optional
+        """
+
         # ============================================
         # Konfiguration des Logging
         # ============================================
         self.logger = logging.getLogger(__name__)
         self.logger.addHandler(logging.NullHandler())
-        
+
+        self.pins = list(pins) if pins is not None else list(self._GPIO_IN)
+        """BCM Nummern der Eingänge in der Reihenfolge des Zustandsvektors"""
+
+        self.state = [0] * len(self.pins)
+        """Zustandsvektor mit dem zuletzt gelesenen Pegel jedes Eingangs"""
+
+        self.cnt_rising = [0] * len(self.pins)
+        """Anzahl der steigenden Flanken jedes Eingangs"""
+
+        self.on_time_s = [0.0] * len(self.pins)
+        """Summe der abgeschlossenen High-Phasen jedes Eingangs in Sekunden"""
+
+        self.mode = mode
+        self.backend = backend
+        self._lines = None
+        self._t_on = [0.0] * len(self.pins)
+        self._index = {pin: i for i, pin in enumerate(self.pins)}
+        self._valid = False
+        self._events = deque(maxlen=self._EVENT_BUFFER_SIZE)
+        self._edge_level = [0] * len(self.pins)
+
+        # Programmabbruch, falls ein falscher Kanal spezifiziert wurde
+        for n in self.pins:
+            if n not in self._GPIO_VALID:
+                self.logger.critical(f"GPIO Kanal {n} ist kein gültiger GPIO. Bitte Config überprüfen!")
+                print(f"GPIO Kanal {n} ist kein gültiger GPIO. Bitte Config überprüfen!")
+                sys.exit("Programm wird beendet wegen falscher GPIO Config...")
+
+        if self.mode not in (self.MODE_POLL, self.MODE_EVENT) or \
+                self.backend not in (self.BACKEND_RPI, self.BACKEND_CHARDEV):
+            self.logger.critical(f"Unbekannter GPIO Modus {mode} oder Backend {backend}. Bitte Config überprüfen!")
+            print(f"Unbekannter GPIO Modus {mode} oder Backend {backend}. Bitte Config überprüfen!")
+            sys.exit("Programm wird beendet wegen falscher GPIO Config...")
+
         # ============================================
         # Konfiguration der IOs
         # ============================================
+        if self.backend == self.BACKEND_CHARDEV:
+            if isinstance(chip, str):
+                chip = GpioChip(chip)
+            self._lines = chip.request_lines(
+                self.pins, edges=self.mode == self.MODE_EVENT,
+                debounce_us=int(bouncetime_ms * 1000))
+            if self.mode == self.MODE_EVENT:
+                self.read_all()
+            return
+
         GPIO.setmode(GPIO.BCM)
-        
+
         # ToDo  "GPIO already user"-Fehler adequat abfangen
         GPIO.setwarnings(False)
-        
+
         # GPIO Eingänge wählen
-        for n in self._GPIO_IN:
+        for n in self.pins:
             GPIO.setup(n, GPIO.IN)
-            
+
+        # Im Ereignismodus die Ausgangspegel lesen und Callbacks registrieren
+        if self.mode == self.MODE_EVENT:
+            self.read_all()
+            self._edge_level = list(self.state)
+            for n in self.pins:
+                if bouncetime_ms > 0:
+                    GPIO.add_event_detect(n, GPIO.BOTH, callback=self._on_edge,
+                                          bouncetime=int(bouncetime_ms))
+                else:
+                    GPIO.add_event_detect(n, GPIO.BOTH, callback=self._on_edge)
+
+    def read_all(self) -> list[int]:
+        """Auslesen aller Eingänge in einem Durchlauf
+
+        Die Pegel werden in den Zustandsvektor
+        :mod:`~tatooine_data.gpio_service.GpioService.state` geschrieben. Nach
+        der ersten Auslesung gelten alle Eingänge als geändert.
+
+        :return: Indizes der Eingänge, deren Pegel sich geändert hat
+        :rtype: list[int]
+        """
+        state = self.state
+        changed = []
+        timestamp = time.time()
+
+        # Mit dem Character Device alle Pegel in einem ioctl lesen
+        if self._lines is not None:
+            levels = self._lines.get_values()
+        else:
+            levels = [GPIO.input(pin) for pin in self.pins]
+
+        for i, level in enumerate(levels):
+            if level != state[i] or not self._valid:
+                self._apply(i, level, timestamp)
+                changed.append(i)
+
+        self._valid = True
+        return changed
+
+    def drain_events(self) -> list[tuple]:
+        """Abholen aller seit dem letzten Aufruf erfassten Flanken
+
+        Flanken, die den Pegel nicht ändern (z.B. Prellen schneller als der
+        Callback), werden verworfen. Zustandsvektor, Zähler und
+        Einschaltdauer werden entsprechend aktualisiert.
+
+        Mit RPi.GPIO liefert der Callback nicht die Art der Flanke, der Pegel
+        jeder Flanke ergibt sich daher aus dem Wechsel des vorherigen Pegels.
+        Weicht der tatsächliche Pegel nach dem Abholen davon ab (z.B. eine
+        durch die Entprellzeit unterdrückte Flanke), wird der Zustand auf den
+        gelesenen Pegel korrigiert.
+
+        :return: Liste von (Index, Pegel, Zeitstempel) in zeitlicher Reihenfolge
+        :rtype: list[tuple]
+        """
+        events = []
+        pop = self._events.popleft
+        state = self.state
+
+        # Flanken des Kernels mit einem read in den Puffer übernehmen
+        if self._lines is not None:
+            self._events.extend(self._lines.read_events(0))
+
+        while True:
+            try:
+                pin, level, timestamp = pop()
+            except IndexError:
+                break
+
+            i = self._index[pin]
+            if level != state[i]:
+                self._apply(i, level, timestamp)
+                events.append((i, level, timestamp))
+
+        # Abgleich mit dem tatsächlichen Pegel (nur RPi.GPIO)
+        if self._lines is None:
+            timestamp = time.time()
+            for i, pin in enumerate(self.pins):
+                level = GPIO.input(pin)
+                if level != state[i] and not self._events:
+                    self._edge_level[i] = level
+                    self._apply(i, level, timestamp)
+                    events.append((i, level, timestamp))
+
+        return events
+
+    def get_on_time_s(self, i: int, now: float = None) -> float:
+        """Gesamte Einschaltdauer eines Eingangs inklusive laufender High-Phase
+
+        :param i: Index im Zustandsvektor
+        :type i: int
+        :param now: Bezugszeitpunkt, defaults to time.time()
+        :type now: float, optional
+        :return: Einschaltdauer in Sekunden
+        :rtype: float
+        """
+        if self.state[i]:
+            if now is None:
+                now = time.time()
+            return self.on_time_s[i] + max(0.0, now - self._t_on[i])
+        return self.on_time_s[i]
+
+    def close(self) -> None:
+        """Freigeben der Eingänge bzw. Entfernen der Callbacks im Ereignismodus"""
+        if self._lines is not None:
+            self._lines.close()
+            self._lines = None
+        elif self.mode == self.MODE_EVENT:
+            for n in self.pins:
+                GPIO.remove_event_detect(n)
+
+    def _on_edge(self, pin: int) -> None:
+        """Callback von RPi.GPIO: Ablage der Flanke im Ereignispuffer
+
+        Der Pin wird nicht erneut gelesen, da er bei kurzen Impulsen schon
+        wieder den alten Pegel haben kann. Jede Flanke wechselt den Pegel
+        der vorherigen Flanke (alle Callbacks laufen in einem Thread).
+        """
+        i = self._index[pin]
+        level = self._edge_level[i] ^ 1
+        self._edge_level[i] = level
+        self._events.append((pin, level, time.time()))
+
+    def _apply(self, i: int, level: int, timestamp: float) -> None:
+        """Übernahme eines neuen Pegels in Zustand, Zähler und Einschaltdauer"""
+        if level and not self.state[i]:
+            # Ein bereits beim Start anliegender Pegel ist keine Flanke
+            if self._valid:
+                self.cnt_rising[i] += 1
+            self._t_on[i] = timestamp
+        elif not level and self.state[i] and self._valid:
+            self.on_time_s[i] += max(0.0, timestamp - self._t_on[i])
+        self.state[i] = level
+
     def getGPIO(self, io: int) -> bool:
         """Ausgabe des aktuellen Wertes eines GPIOs
-        
+
         Die Funktion gibt den aktuellen Wert eines GPIOs zurück. Der entsprechende Kanal wird durch "io" spezifiziert.
 
         :param io: Kanalnummer
         :type io: int
-        :return: Wert des IO
+        :return: Wert des IO oder None, wenn der IO nicht konfiguriert ist
         :rtype: bool
         """
-        
-        # Wert ausgeben, wenn der IO ein Input ist
-        for i in self._GPIO_IN:
-            if i == io:
-                return GPIO.input(io)
-        
-        # Programmabbruch, falls ein falscher Kanal spezifiziert wurde
-        self.logger.critical(f"GPIO Kanal {io} ist nicht für das Auslesen spezifiziert. Bitte Config überprüfen!")
-        
-        print(f"GPIO Kanal {io} ist nicht für das Auslesen spezifiziert. Bitte Config überprüfen!")
-        print("Programm  wird beendet ...")
-                
-        # Program beenden aus einem Tread heraus geht nur in Linux
-        os.kill(os.getpid(), signal.SIGINT)
 
+        # Wert ausgeben, wenn der IO ein Input ist
+        if io in self._index:
+            if self._lines is not None:
+                return self._lines.get_values()[self._index[io]]
+            return GPIO.input(io)
 
-        return None
\ No newline at end of file
+        self.logger.error(f"GPIO Kanal {io} ist nicht für das Auslesen spezifiziert. Bitte Config überprüfen!")
+        return None
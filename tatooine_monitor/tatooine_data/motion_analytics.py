@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Modul für vektorisierte Berechnungen
+import numpy as np
+
+# Import Logging Modul
+import logging
+
+
+class MotionAnalytics:
+    """Auswertung der gepufferten Bewegungsdaten des MPU6050
+
+    Aus den Samples des FIFO (:class:`~driver.i2c_mpu6050.MPU6050FifoReader`)
+    werden pro Zyklus wenige abgeleitete Größen berechnet, die anstelle der
+    hochfrequenten Rohdaten gespeichert werden können:
+
+    * Krängung (heel) und Trimm (pitch) aus dem mittleren Beschleunigungsvektor
+    * Effektivwert der Vibration (Betrag der Beschleunigung ohne Gleichanteil)
+    * dominante Frequenz der Wellenbewegung und der Motorvibration aus einer
+      gefensterten FFT
+    * Anzahl der Schläge (Slamming), bei denen die Beschleunigung um mehr als
+      eine Schwelle von 1g abweicht
+
+    Alle Berechnungen erfolgen vektorisiert über das gesamte Fenster.
+
+    Es wird angenommen, dass der Sensor mit der X-Achse in Fahrtrichtung und
+    der Z-Achse senkrecht nach oben eingebaut ist.
+
+    .. code-block:: python
+
+        analytics = MotionAnalytics(100)
+        values = analytics.analyze(reader.get_window(1000), reader.get_new())
+
+    :param sample_rate: Abtastrate der Samples in Hz
+    :type sample_rate: float
+    :param slam_threshold_g: Schwelle eines Schlages in g, defaults to 0.5
+    :type slam_threshold_g: float, optional
+    """
+
+    SOURCES = ("heel", "pitch", "vibration_rms", "wave_freq", "engine_freq",
+               "slam_count")
+    """Berechnete Größen"""
+
+    OPTIONAL_SOURCES = ("vibration_rms", "wave_freq", "engine_freq")
+    """Größen, die fehlen können (Snapshot Modus, noch nicht gefülltes Fenster, kein Maximum im Frequenzband)"""
+
+    WAVE_BAND_HZ = (0.1, 2.0)
+    """Frequenzband der Wellenbewegung in Hz"""
+
+    ENGINE_BAND_HZ = (5.0, None)
+    """Frequenzband der Motorvibration in Hz (bis zur Nyquist Frequenz)"""
+
+    def __init__(self, sample_rate: float, slam_threshold_g: float = 0.5):
+
+        # ============================================
+        # Konfiguration des Logging
+        # ============================================
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        self.sample_rate = sample_rate
+        self.slam_threshold_g = slam_threshold_g
+
+        self.slam_count = 0
+        """Anzahl aller bisher erkannten Schläge"""
+
+        self._slam_active = False
+        self._fft_size = 0
+
+    def analyze(self, window: np.ndarray, new: np.ndarray) -> dict:
+        """Berechnung aller Größen
+
+        :param window: letzte Samples für Lage und Spektrum (Zeilen wie :func:`~driver.i2c_mpu6050.mpu6050.get_snapshot`, Beschleunigung in g)
+        :type window: np.ndarray
+        :param new: seit dem letzten Aufruf neu erfasste Samples für die Schlagerkennung
+        :type new: np.ndarray
+        :return: Messgröße -> Messwert (fehlende Werte bei zu wenigen Samples)
+        :rtype: dict
+        """
+        values = {}
+
+        if len(new):
+            self._count_slams(np.linalg.norm(new[:, 0:3], axis=1))
+        values["slam_count"] = self.slam_count
+
+        if len(window) == 0:
+            return values
+
+        accel = window[:, 0:3]
+        magnitude = np.linalg.norm(accel, axis=1)
+
+        # Lage aus dem mittleren Beschleunigungsvektor (Erdbeschleunigung)
+        ax, ay, az = accel.mean(axis=0)
+        values["heel"] = float(np.degrees(np.arctan2(ay, az)))
+        values["pitch"] = float(np.degrees(np.arctan2(-ax, np.hypot(ay, az))))
+
+        # Vibration ohne Gleichanteil
+        dynamic = magnitude - magnitude.mean()
+        values["vibration_rms"] = float(np.sqrt(np.mean(dynamic ** 2)))
+
+        # Dominante Frequenzen mit Hann Fenster
+        if len(window) >= 16:
+            freqs, spectrum = self._spectrum(dynamic)
+            values["wave_freq"] = self._dominant(freqs, spectrum,
+                                                 self.WAVE_BAND_HZ)
+            values["engine_freq"] = self._dominant(freqs, spectrum,
+                                                   self.ENGINE_BAND_HZ)
+
+        return values
+
+    def _spectrum(self, signal: np.ndarray) -> tuple:
+        # Hann Fenster nur bei geänderter Fenstergröße neu berechnen
+        if len(signal) != self._fft_size:
+            self._fft_size = len(signal)
+            self._hann = np.hanning(self._fft_size)
+            self._freqs = np.fft.rfftfreq(self._fft_size, 1 / self.sample_rate)
+        return self._freqs, np.abs(np.fft.rfft(signal * self._hann))
+
+    def _dominant(self, freqs: np.ndarray, spectrum: np.ndarray,
+                  band: tuple) -> float:
+        low, high = band
+        mask = freqs >= low
+        if high is not None:
+            mask &= freqs <= high
+        if not mask.any():
+            return None
+        return float(freqs[mask][np.argmax(spectrum[mask])])
+
+    def _count_slams(self, magnitude: np.ndarray) -> None:
+        # Ein Schlag ist jeder Übergang über die Schwelle
+        above = np.abs(magnitude - 1.0) > self.slam_threshold_g
+        rising = np.count_nonzero(above[1:] & ~above[:-1])
+        if above[0] and not self._slam_active:
+            rising += 1
+        self.slam_count += int(rising)
+        self._slam_active = bool(above[-1])
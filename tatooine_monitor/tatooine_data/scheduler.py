@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Terminplaner für die zyklische Messdatenerfassung
+
+Die Erfassungsgruppen (i2c, i2c_slow, 1wire) und die Hauptschleife werden
+auf absoluten, monotonen Terminen ausgeführt. Eine Überschreitung eines
+Zyklus verschiebt damit nicht alle folgenden Zyklen, sodass die
+Abtastraten auch über lange Laufzeiten exakt eingehalten werden.
+
+"""
+
+# Modul zur Zeitmessung
+import time
+
+# Modul für Datenklassen
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# Modul zum Multithreading
+import concurrent.futures
+
+# Import Logging Modul
+import logging
+
+
+@dataclass
+class ScheduledGroup():
+    """Datenobjekt einer zyklisch auszuführenden Erfassungsgruppe"""
+
+    name: str = '-'
+    """Name der Gruppe (z.B. i2c, i2c_slow, 1wire)"""
+
+    period_s: float = 1.0
+    """Periode der Gruppe in Sekunden"""
+
+    func: Optional[Callable[[], None]] = None
+    """Auszuführende Methode der Gruppe"""
+
+    threaded: bool = True
+    """True: Ausführung im Threadpool, False: Ausführung in der Hauptschleife"""
+
+    deadline: float = 0
+    """Nächster absoluter Termin (time.monotonic) der Gruppe"""
+
+    future: Optional[concurrent.futures.Future] = None
+    """Future der zuletzt gestarteten Ausführung"""
+
+    cnt_runs: int = 0
+    """Anzahl der Ausführungen"""
+
+    cnt_missed: int = 0
+    """Anzahl der ausgelassenen Termine"""
+
+    max_lateness_s: float = 0
+    """Größte bisher aufgetretene Verspätung gegenüber dem Termin in Sekunden"""
+
+
+class DeadlineScheduler:
+    """Driftfreier Terminplaner für die Erfassungsgruppen
+
+    Jede Gruppe wird auf den Terminen ``t0 + k * period_s`` ausgeführt. Wird
+    ein Termin verpasst (Überlast oder die letzte Erfassung läuft noch), so
+    entscheidet die Policy, wie mit den verpassten Terminen umgegangen wird:
+
+    * :mod:`~tatooine_data.scheduler.DeadlineScheduler.POLICY_SKIP` verpasste Termine entfallen, es wird mit dem nächsten zukünftigen Termin fortgefahren
+    * :mod:`~tatooine_data.scheduler.DeadlineScheduler.POLICY_CATCH_UP` verpasste Termine werden schnellstmöglich nachgeholt, maximal jedoch ``max_catch_up`` Stück
+
+    .. code-block:: python
+
+        scheduler = DeadlineScheduler(executor, DeadlineScheduler.POLICY_SKIP)
+        scheduler.add_group("i2c", 0.25, data_handle.aquire_data_i2c)
+        scheduler.add_group("main", 0.25, main_cycle, threaded=False)
+        scheduler.run_forever()
+
+    :param executor: Threadpool für die Gruppen mit threaded=True
+    :type executor: concurrent.futures.Executor
+    :param policy: Verhalten bei verpassten Terminen, defaults to POLICY_SKIP
+    :type policy: str, optional
+    :param max_catch_up: Anzahl der maximal nachzuholenden Termine, defaults to 2
+    :type max_catch_up: int, optional
+    """
+
+    POLICY_SKIP = "skip"
+    """Verpasste Termine werden ausgelassen"""
+
+    POLICY_CATCH_UP = "catch_up"
+    """Verpasste Termine werden nachgeholt"""
+
+    def __init__(self, executor = None, policy = POLICY_SKIP,
+                 max_catch_up = 2, clock = time.monotonic,
+                 sleep = time.sleep):
+
+        if policy not in (self.POLICY_SKIP, self.POLICY_CATCH_UP):
+            raise ValueError(f"Unbekannte Scheduler Policy: {policy}")
+
+        self.executor = executor
+        self.policy = policy
+        self.max_catch_up = max(0, int(max_catch_up))
+        self._clock = clock
+        self._sleep = sleep
+        self.groups: list[ScheduledGroup] = []
+
+        # ============================================
+        # Konfiguration des Logging
+        # ============================================
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+    def add_group(self, name: str, period_s: float, func: Callable[[], None],
+                  threaded: bool = True) -> ScheduledGroup:
+        """Hinzufügen einer zyklisch auszuführenden Gruppe
+
+        Gruppen mit dem gleichen Termin werden in der Reihenfolge ausgeführt,
+        in der sie hinzugefügt wurden.
+
+        :param name: Name der Gruppe
+        :type name: str
+        :param period_s: Periode in Sekunden
+        :type period_s: float
+        :param func: auszuführende Methode
+        :type func: Callable
+        :param threaded: Ausführung im Threadpool, defaults to True
+        :type threaded: bool, optional
+        :return: die angelegte Gruppe
+        :rtype: ScheduledGroup
+        """
+        if period_s <= 0:
+            raise ValueError(f"Periode der Gruppe {name} muss größer 0 sein")
+
+        group = ScheduledGroup(name, float(period_s), func, threaded,
+                               self._clock())
+        self.groups.append(group)
+        return group
+
+    def start(self) -> None:
+        """Setzen des gemeinsamen Startzeitpunktes aller Gruppen"""
+        t0 = self._clock()
+        for group in self.groups:
+            group.deadline = t0
+
+    def run_pending(self) -> float:
+        """Ausführen aller fälligen Gruppen
+
+        :return: Zeit in Sekunden bis zum nächsten Termin
+        :rtype: float
+        """
+        for group in self.groups:
+            now = self._clock()
+            if now >= group.deadline:
+                self._fire(group, now)
+
+        return min(g.deadline for g in self.groups) - self._clock()
+
+    def wait_next(self) -> None:
+        """Warten bis zum nächsten Termin
+
+        Ist eine fällige Gruppe noch mit der letzten Erfassung beschäftigt,
+        so wird auf deren Ende gewartet, jedoch höchstens bis zum nächsten
+        Termin einer anderen Gruppe.
+        """
+        now = self._clock()
+        due = [g for g in self.groups if g.deadline <= now]
+        pending = [g.deadline for g in self.groups if g.deadline > now]
+        timeout = (min(pending) - now) if pending else None
+
+        # Nachzuholende Termine werden sofort ausgeführt
+        if any(g.future is None or g.future.done() for g in due):
+            return
+
+        busy = [g.future for g in due]
+        if busy:
+            concurrent.futures.wait(busy, timeout,
+                                    concurrent.futures.FIRST_COMPLETED)
+        elif timeout is not None:
+            self._sleep(timeout)
+
+    def run_forever(self) -> None:
+        """Endlosschleife des Terminplaners"""
+        self.start()
+        while True:
+            self.run_pending()
+            self.wait_next()
+
+    def get_statistics(self) -> dict:
+        """Ausgabe der Laufzeitstatistik aller Gruppen
+
+        :return: Name der Gruppe -> (Ausführungen, verpasst, max. Verspätung)
+        :rtype: dict
+        """
+        return {g.name: (g.cnt_runs, g.cnt_missed, g.max_lateness_s)
+                for g in self.groups}
+
+    def _fire(self, group: ScheduledGroup, now: float) -> None:
+        """Ausführen einer fälligen Gruppe und Planung des nächsten Termins"""
+
+        lateness = now - group.deadline
+
+        # Termin verpasst, da die letzte Erfassung noch läuft
+        if group.threaded and group.future is not None and \
+            not group.future.done():
+            self._advance(group, now, False)
+            return
+
+        if group.threaded:
+            group.future = self.executor.submit(group.func)
+        else:
+            group.func()
+
+        group.cnt_runs += 1
+        if lateness > group.max_lateness_s:
+            group.max_lateness_s = lateness
+
+        self._advance(group, now, True)
+
+    def _advance(self, group: ScheduledGroup, now: float,
+                 executed: bool) -> None:
+        """Berechnung des nächsten absoluten Termins einer Gruppe
+
+        Die Anzahl der noch ausstehenden Termine wird auf ``max_catch_up``
+        (POLICY_CATCH_UP) bzw. 0 (POLICY_SKIP) begrenzt. Alle weiteren
+        verpassten Termine entfallen.
+        """
+
+        lateness = now - group.deadline
+
+        # Anzahl der seit dem Termin vollständig vergangenen Perioden
+        elapsed = int((now - group.deadline) // group.period_s)
+        pending = elapsed if executed else elapsed + 1
+
+        keep = self.max_catch_up if self.policy == self.POLICY_CATCH_UP else 0
+        drop = max(0, pending - keep)
+
+        if executed:
+            group.deadline += (1 + drop) * group.period_s
+        else:
+            group.deadline += drop * group.period_s
+
+        if drop > 0:
+            group.cnt_missed += drop
+            msg = "Gruppe {0:s}: {1:d} Termin(e) verpasst, Verspätung {2:0.3f} Sekunden".format(group.name, drop, lateness)
+            self.logger.debug(msg)
@@ -0,0 +1,712 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Sensor-Plugins zur Anbindung der Treiber an die Messkanäle
+
+Jeder Treiber (ADS1115, INA219, MPU6050, BMP280, DS18S20, GPIO) wird durch
+ein Plugin beschrieben. Das Plugin deklariert die Messgrößen (Sources), die
+es liefert, seine Erfassungsgruppe, die geschätzte Dauer einer Auslesung und
+seine bevorzugte Periode. Welche Kanäle aus welcher Treiberinstanz gespeist
+werden, steht ausschließlich in der :file:`config_channels.csv`:
+
+.. code-block:: text
+
+    ID,...,Driver,Source,Scale
+    __U_ADC1,...,ads1115@0x48,ain0,10.87
+    __Baro,...,bmp280@0x76,pressure,1
+
+Ein weiterer Chip kann damit ohne Änderung am Python Code eingebunden
+werden, solange es für seinen Typ ein Plugin gibt. Neue Plugins werden mit
+:func:`~tatooine_data.sensor_plugins.register_plugin` registriert.
+
+"""
+
+# Modul zur Bearbeitung der Zeitstempel
+import time
+
+# Mathematische Funktionen
+import math
+
+# Modul für vektorisierte Berechnungen
+import numpy as np
+
+# Modul für Datenklassen
+from dataclasses import dataclass
+from configparser import ConfigParser
+
+# Import Logging Modul
+import logging
+
+# Zuordnung der Kanäle zu den Treibern
+from .channel_registry import ChannelBinding
+
+# Serviceklasse für die GPIOs
+from .gpio_service import GpioService
+
+# Auswertung der Bewegungsdaten
+from .motion_analytics import MotionAnalytics
+
+#i2c Treiber - AD-Wandler ADS1115
+from driver.i2c_ads1115  import ADS1115, ADS1115ReadyPin, ADS1115Scanner
+#i2c Treiber - Powerüberwachung INA219
+from driver.i2c_ina219 import INA219, INA219Monitor
+#i2c Treiber - Gyroscope
+from driver.i2c_mpu6050 import mpu6050, MPU6050FifoReader
+#i2c Bus mit serialisiertem Zugriff
+from driver.i2c_bus import I2CBusOwner
+from driver.i2c_bus import I2CRegisterDevice
+# 1Wire Treiber
+from driver.one_wire import OneWire
+# i2c Treiber für bmp280
+from driver.i2c_bmp280 import BMP280
+
+
+PLUGIN_REGISTRY = {}
+"""Zuordnung Treibertyp (z.B. ``ads1115``) -> Plugin Klasse"""
+
+GROUP_I2C = "i2c"
+"""Erfassungsgruppe der schnellen Sensoren"""
+GROUP_I2C_SLOW = "i2c_slow"
+"""Erfassungsgruppe der langsamen i2c Sensoren"""
+GROUP_1WIRE = "1wire"
+"""Erfassungsgruppe der 1-Wire Sensoren"""
+
+_MPU_AXES = ("accel_x", "accel_y", "accel_z", "temperature",
+             "gyro_x", "gyro_y", "gyro_z")
+"""Messgrößen des MPU6050 in der Reihenfolge von :func:`~driver.i2c_mpu6050.mpu6050.get_snapshot`"""
+
+
+def register_plugin(driver_type: str):
+    """Decorator zur Registrierung eines Plugins für einen Treibertyp
+
+    .. code-block:: python
+
+        @register_plugin("ads1115")
+        class ADS1115Plugin(SensorPlugin):
+            ...
+
+    :param driver_type: Treibertyp, wie er in der Spalte Driver steht
+    :type driver_type: str
+    """
+    def decorator(cls):
+        cls.DRIVER_TYPE = driver_type
+        PLUGIN_REGISTRY[driver_type] = cls
+        return cls
+
+    return decorator
+
+
+@dataclass
+class PluginContext():
+    """Gemeinsame Ressourcen, die allen Plugins zur Verfügung stehen"""
+
+    bus: I2CBusOwner = None
+    """Besitzer des i2c Busses"""
+
+    conf: ConfigParser = None
+    """Konfiguration aus :file:`monitor_live.conf` (optional)"""
+
+
+class SensorPlugin:
+    """Basisklasse aller Sensor-Plugins
+
+    Eine Instanz entspricht einer Treiberinstanz aus der Spalte Driver (z.B.
+    ``ads1115@0x48``). Beim Start werden ihr alle Kanäle zugeordnet
+    (:func:`~tatooine_data.sensor_plugins.SensorPlugin.bind`) und die
+    Hardware einmalig initialisiert
+    (:func:`~tatooine_data.sensor_plugins.SensorPlugin.setup`). Im Betrieb
+    liefert :func:`~tatooine_data.sensor_plugins.SensorPlugin.read` alle
+    Messgrößen, welche anschließend ohne weitere Fallunterscheidung in die
+    Datenpunkte geschrieben werden.
+
+    :param name: Name der Treiberinstanz (z.B. ads1115@0x48)
+    :type name: str
+    :param address: Adresse des Chips oder None
+    :type address: int
+    :param context: gemeinsame Ressourcen
+    :type context: PluginContext
+    """
+
+    DRIVER_TYPE = "-"
+    """Treibertyp, wird durch :func:`~tatooine_data.sensor_plugins.register_plugin` gesetzt"""
+
+    SOURCES = ()
+    """Messgrößen, welche der Treiber liefert"""
+
+    OPTIONAL_SOURCES = ()
+    """Messgrößen, die regulär fehlen können (z.B. solange ein Auswertefenster gefüllt wird). Ihr Fehlen wird nur einmal gemeldet."""
+
+    GROUP = GROUP_I2C
+    """Erfassungsgruppe, in welcher der Treiber ausgelesen wird"""
+
+    READ_COST_MS = 1.0
+    """Geschätzte Dauer einer Auslesung in ms"""
+
+    PREFERRED_PERIOD_MS = 250
+    """Bevorzugte Periode der Auslesung in ms"""
+
+    PRIORITY = I2CBusOwner.PRIO_NORMAL
+    """Priorität der Buszugriffe"""
+
+    DEFAULT_ADDRESS = None
+    """Adresse, falls in der Spalte Driver keine angegeben wurde"""
+
+    CONF_SECTION = None
+    """Optionaler Abschnitt in :file:`monitor_live.conf` mit Einstellungen des Treibers"""
+
+    def __init__(self, name: str, address: int, context: PluginContext):
+        self.name = name
+        self.address = address if address is not None else self.DEFAULT_ADDRESS
+        self.context = context
+        self.bindings: list[ChannelBinding] = []
+        self._missing_reported = set()
+
+        # ============================================
+        # Konfiguration des Logging
+        # ============================================
+        self.logger = logging.getLogger(__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+    def accepts(self, source: str) -> bool:
+        """Prüfung, ob der Treiber die Messgröße liefern kann"""
+        return source in self.SOURCES
+
+    def bind(self, binding: ChannelBinding) -> None:
+        """Zuordnen eines Kanals zu dieser Treiberinstanz
+
+        :param binding: Zuordnung des Kanals
+        :type binding: ChannelBinding
+        """
+        if not self.accepts(binding.source):
+            raise ValueError(f"Treiber {self.name} liefert keine Messgröße '{binding.source}' für Kanal {binding.datapoint.id}")
+        self.bindings.append(binding)
+
+    def sources(self) -> list[str]:
+        """Ausgabe aller zugeordneten Messgrößen"""
+        return [b.source for b in self.bindings]
+
+    def bus_client(self):
+        """SMBus kompatibler Zugriff mit der Priorität des Plugins"""
+        return self.context.bus.client(self.PRIORITY)
+
+    def option(self, key: str, default):
+        """Auslesen einer optionalen Einstellung des Treibers
+
+        Die Einstellung wird im Abschnitt
+        :mod:`~tatooine_data.sensor_plugins.SensorPlugin.CONF_SECTION` der
+        :file:`monitor_live.conf` gesucht. Fehlt der Abschnitt oder der
+        Schlüssel, wird der Standardwert verwendet. Der Wert wird in den Typ
+        des Standardwertes umgewandelt.
+
+        :param key: Schlüsselwert der Variable
+        :type key: str
+        :param default: Standardwert
+        :return: Conf Wert oder Standardwert
+        """
+        conf = self.context.conf
+        if conf is None or self.CONF_SECTION is None or \
+                not conf.has_option(self.CONF_SECTION, key):
+            return default
+
+        if isinstance(default, bool):
+            return conf.getboolean(self.CONF_SECTION, key)
+        if default is None:
+            return conf.get(self.CONF_SECTION, key)
+        return type(default)(conf.get(self.CONF_SECTION, key))
+
+    def setup(self) -> None:
+        """Einmalige Initialisierung der Hardware"""
+        pass
+
+    def read(self) -> dict:
+        """Auslesen aller zugeordneten Messgrößen
+
+        :return: Messgröße -> Messwert (leer, wenn keine neuen Werte vorliegen)
+        :rtype: dict
+        """
+        raise NotImplementedError
+
+    def acquire(self) -> None:
+        """Auslesen des Treibers und Abspeichern in den Datenpunkten"""
+        values = self.read()
+        if not values:
+            # Der Treiber hat in diesem Zyklus keine neuen Werte
+            return
+        timestamp = time.time()
+
+        for b in self.bindings:
+            value = values.get(b.source)
+            if value is None:
+                self._report_missing(b)
+                continue
+            b.datapoint.update_value(value * b.scale, timestamp)
+
+    def _report_missing(self, binding: ChannelBinding) -> None:
+        """Meldung eines fehlenden Messwertes
+
+        Bei optionalen Messgrößen wird nur das erste Fehlen gemeldet, danach
+        nur noch im Debug Level.
+        """
+        message = f'Keine Speicherung des Wertes von Kanal {binding.datapoint.id} ({self.name}:{binding.source})'
+        if binding.source not in self.OPTIONAL_SOURCES:
+            self.logger.warning(message)
+        elif binding.source not in self._missing_reported:
+            self._missing_reported.add(binding.source)
+            self.logger.info(f'{message}, Messgröße liegt noch nicht vor (weitere Meldungen nur im Debug Level)')
+        else:
+            self.logger.debug(message)
+
+
+@register_plugin("ina219")
+class INA219Plugin(SensorPlugin):
+    """Leistungsmessung mit dem INA219
+
+    Die Betriebsart wird im Abschnitt ``[INA219]`` der
+    :file:`monitor_live.conf` festgelegt:
+
+    * ``MODE: single`` - pro Zyklus wird eine Wandlung gelesen. Ladung und
+      Energie werden aus diesen Einzelwerten aufsummiert.
+    * ``MODE: continuous`` - der INA219 mittelt ``ADC_SAMPLES`` Wandlungen in
+      Hardware, ein :class:`~driver.i2c_ina219.INA219Monitor` liest jede
+      Wandlung im Hintergrund. Spannung, Strom und Leistung sind dann die
+      Mittelwerte seit dem letzten Zyklus. Zusätzlich stehen Minimum und
+      Maximum des Stromes sowie die aufsummierte Ladung (mAh) und Energie
+      (mWh) zur Verfügung.
+    """
+
+    SOURCES = ("voltage", "current", "power", "current_min", "current_max",
+               "charge_mah", "energy_mwh")
+    READ_COST_MS = 1.5
+    PRIORITY = I2CBusOwner.PRIO_HIGH
+    DEFAULT_ADDRESS = 0x40
+    CONF_SECTION = "INA219"
+
+    SHUNT_OHMS = 0.1
+    """Widerstandswert (Ohm) des Shunt am INA219"""
+
+    MAX_EXPECTED_AMPS = 3
+    """Maximal erwarteter Strom (A) durch den Shunt"""
+
+    _ADC_SAMPLES = {1: INA219.ADC_12BIT, 2: INA219.ADC_2SAMP,
+                    4: INA219.ADC_4SAMP, 8: INA219.ADC_8SAMP,
+                    16: INA219.ADC_16SAMP, 32: INA219.ADC_32SAMP,
+                    64: INA219.ADC_64SAMP, 128: INA219.ADC_128SAMP}
+    """Zuordnung Anzahl gemittelter Wandlungen -> ADC Einstellung"""
+
+    def setup(self) -> None:
+        self.ina = INA219(self.SHUNT_OHMS, self.MAX_EXPECTED_AMPS, 1,
+                          self.address,
+                          i2c=I2CRegisterDevice(self.bus_client(),
+                                                self.address))
+        mode = self.option("MODE", "single")
+        if mode == "continuous":
+            samples = self.option("ADC_SAMPLES", 128)
+            if samples not in self._ADC_SAMPLES:
+                raise ValueError(f"ADC_SAMPLES {samples} nicht zulässig, erlaubt sind {list(self._ADC_SAMPLES)}")
+            adc = self._ADC_SAMPLES[samples]
+            self.ina.configure(bus_adc=adc, shunt_adc=adc)
+            self.monitor = INA219Monitor(self.ina)
+        elif mode == "single":
+            # Kalibrierung und Konfiguration werden nur einmalig geschrieben
+            self.ina.configure()
+            self.monitor = INA219Monitor(self.ina, background=False)
+        else:
+            raise ValueError(f"Unbekannter INA219 MODE {mode}")
+        self._single = mode == "single"
+
+    def read(self) -> dict:
+        if self._single:
+            self.monitor.sample()
+        return self.monitor.get_interval()
+
+
+@register_plugin("ads1115")
+class ADS1115Plugin(SensorPlugin):
+    """Spannungsmessung mit dem ADS1115
+
+    Die Betriebsart wird im Abschnitt ``[ADS1115]`` der
+    :file:`monitor_live.conf` festgelegt:
+
+    * ``MODE: single`` - pro Zyklus wird jeder Eingang mit einer Single Shot
+      Wandlung gemessen. Optional kann mit ``READY_GPIO`` der GPIO angegeben
+      werden, an dem der ALERT/RDY Pin angeschlossen ist. Ohne diesen GPIO
+      wird die Wandlungszeit abgewartet.
+    * ``MODE: scan`` - ein :class:`~driver.i2c_ads1115.ADS1115Scanner` tastet
+      alle Eingänge des Chips kontinuierlich mit ``DATA_RATE`` ab. Pro Zyklus
+      werden nur die letzten Messwerte abgeholt. Da nach jedem Umschalten
+      zwei Wandlungen abgewartet werden, ist jeder Eingang etwa mit
+      ``DATA_RATE`` / (2 * Anzahl Eingänge) aktuell.
+    """
+
+    SOURCES = ("ain0", "ain1", "ain2", "ain3")
+    READ_COST_MS = 10.0
+    PRIORITY = I2CBusOwner.PRIO_HIGH
+    DEFAULT_ADDRESS = 0x48
+    CONF_SECTION = "ADS1115"
+
+    FULL_SCALE_V = 4.096
+    """Messbereich des AD-Wandlers in Volt"""
+
+    _MUX = {"ain0": ADS1115.MUX_AIN0_GND, "ain1": ADS1115.MUX_AIN1_GND,
+            "ain2": ADS1115.MUX_AIN2_GND, "ain3": ADS1115.MUX_AIN3_GND}
+    """Zuordnung Messgröße -> Multiplexer Einstellung"""
+
+    _DATA_RATE = {8: ADS1115.DR_8SPS, 16: ADS1115.DR_16SPS,
+                  32: ADS1115.DR_32SPS, 64: ADS1115.DR_64SPS,
+                  128: ADS1115.DR_128SPS, 250: ADS1115.DR_250SPS,
+                  475: ADS1115.DR_475SPS, 860: ADS1115.DR_860SPS}
+    """Zuordnung Samples pro Sekunde -> DR Einstellung"""
+
+    def setup(self) -> None:
+        bus = self.bus_client()
+        self.scanner = None
+
+        mode = self.option("MODE", "single")
+        if mode == "scan":
+            data_rate = self.option("DATA_RATE", 128)
+            if data_rate not in self._DATA_RATE:
+                raise ValueError(f"DATA_RATE {data_rate} nicht zulässig, erlaubt sind {list(self._DATA_RATE)}")
+            self._scan_sources = list(dict.fromkeys(self.sources()))
+            self.scanner = ADS1115Scanner(
+                self.context.bus.client(I2CBusOwner.PRIO_NORMAL),
+                [self._MUX[source] for source in self._scan_sources],
+                self.FULL_SCALE_V, self.address, self._DATA_RATE[data_rate])
+            # Im Zyklus werden nur die letzten Messwerte abgeholt
+            self.READ_COST_MS = 0.0
+            return
+        if mode != "single":
+            raise ValueError(f"Unbekannter ADS1115 MODE {mode}")
+
+        ready_gpio = self.option("READY_GPIO", "")
+        ready = ADS1115ReadyPin(int(ready_gpio)) if ready_gpio else None
+        self.adcs = [(source, ADS1115(bus, self._MUX[source],
+                                      self.FULL_SCALE_V, self.address,
+                                      ready=ready))
+                     for source in dict.fromkeys(self.sources())]
+
+    def read(self) -> dict:
+        if self.scanner is not None:
+            return dict(zip(self._scan_sources, self.scanner.get_voltages()))
+        return {source: adc.getVoltage() for source, adc in self.adcs}
+
+
+@register_plugin("mpu6050")
+class MPU6050Plugin(SensorPlugin):
+    """Beschleunigung, Drehrate und Temperatur mit dem MPU6050
+
+    Die Betriebsart wird im Abschnitt ``[MPU6050]`` der
+    :file:`monitor_live.conf` festgelegt:
+
+    * ``MODE: snapshot`` - pro Zyklus werden alle Messgrößen mit einem 14 Byte
+      Blockzugriff gelesen.
+    * ``MODE: fifo`` - der MPU6050 tastet mit ``SAMPLE_RATE_HZ`` ab und puffert
+      die Werte in seinem FIFO. Ein
+      :class:`~driver.i2c_mpu6050.MPU6050FifoReader` liest das FIFO im
+      Hintergrund in einen Ringpuffer von ``BUFFER_S`` Sekunden. Pro Zyklus
+      werden die Messgrößen aus allen neuen Samples aggregiert.
+
+    Jede Messgröße liefert den Mittelwert (z.B. ``accel_x``), den
+    Effektivwert des Wechselanteils (``accel_x_rms``) und den betragsmäßigen
+    Spitzenwert (``accel_x_peak``) der Samples eines Zyklus.
+
+    Im Modus fifo stehen zusätzlich die Größen der
+    :class:`~tatooine_data.motion_analytics.MotionAnalytics` (``heel``,
+    ``pitch``, ``vibration_rms``, ``wave_freq``, ``engine_freq``,
+    ``slam_count``) zur Verfügung. Sie werden über den gesamten Ringpuffer
+    berechnet. Im Modus snapshot werden nur Krängung, Trimm und Schläge aus
+    dem einzelnen Sample bestimmt.
+    """
+
+    SOURCES = _MPU_AXES + tuple(f"{axis}_{aggregate}"
+                                for aggregate in ("rms", "peak")
+                                for axis in _MPU_AXES) + \
+        MotionAnalytics.SOURCES
+    OPTIONAL_SOURCES = MotionAnalytics.OPTIONAL_SOURCES
+    READ_COST_MS = 1.0
+    PRIORITY = I2CBusOwner.PRIO_HIGH
+    DEFAULT_ADDRESS = 0x68
+    CONF_SECTION = "MPU6050"
+
+    def setup(self) -> None:
+        self.mpu = mpu6050(self.address, self.bus_client())
+        self.fifo = None
+        self.analytics = None
+        use_analytics = any(source in MotionAnalytics.SOURCES
+                            for source in self.sources())
+
+        mode = self.option("MODE", "snapshot")
+        sample_rate = 0.0
+        if mode == "fifo":
+            sample_rate = self.mpu.enable_fifo(self.option("SAMPLE_RATE_HZ", 100))
+            self.fifo = MPU6050FifoReader(self.mpu,
+                                          self.option("BUFFER_S", 10.0))
+            # Im Zyklus werden nur die neuen Samples aggregiert
+            self.READ_COST_MS = 0.1
+            if use_analytics:
+                self.READ_COST_MS = 2.0
+        elif mode != "snapshot":
+            raise ValueError(f"Unbekannter MPU6050 MODE {mode}")
+        elif use_analytics:
+            self.logger.warning("MPU6050 Bewegungsauswertung im MODE snapshot "
+                                "ohne Vibration und Frequenzen")
+
+        if use_analytics:
+            self.analytics = MotionAnalytics(
+                sample_rate, self.option("SLAM_THRESHOLD_G", 0.5))
+
+    def read(self) -> dict:
+        if self.fifo is not None:
+            samples = self.fifo.get_new()
+            if len(samples) == 0:
+                # Keine neuen Samples: keine Werte, statt die letzten zu
+                # wiederholen
+                return {}
+        else:
+            # Alle Messgrößen mit einem 14 Byte Blockzugriff
+            samples = self.mpu.get_snapshot(True)[np.newaxis, :]
+
+        # Aggregation aller Samples des Zyklus je Spalte
+        mean = samples.mean(axis=0)
+        rms = np.sqrt(((samples - mean) ** 2).mean(axis=0))
+        peak = np.abs(samples).max(axis=0)
+
+        values = dict(zip(_MPU_AXES, mean.tolist()))
+        values.update(zip(self.SOURCES[len(_MPU_AXES):],
+                          rms.tolist() + peak.tolist()))
+
+        if self.analytics is not None:
+            if self.fifo is not None:
+                values.update(self.analytics.analyze(
+                    self.fifo.get_window(self.fifo.capacity), samples))
+            else:
+                # Ein einzelnes Sample enthält keine Vibration
+                analyzed = self.analytics.analyze(samples, samples)
+                del analyzed["vibration_rms"]
+                values.update(analyzed)
+        return values
+
+
+@register_plugin("bmp280")
+class BMP280Plugin(SensorPlugin):
+    """Temperatur und Luftdruck mit dem BMP280
+
+    Pro Zyklus wird eine Messung im Forced Mode gestartet und Temperatur und
+    Luftdruck gemeinsam gelesen. Oversampling und IIR Filter werden im
+    Abschnitt ``[BMP280]`` der :file:`monitor_live.conf` festgelegt.
+    """
+
+    SOURCES = ("temperature", "pressure")
+    GROUP = GROUP_I2C_SLOW
+    READ_COST_MS = 5.0
+    PREFERRED_PERIOD_MS = 2500
+    PRIORITY = I2CBusOwner.PRIO_LOW
+    DEFAULT_ADDRESS = 0x76
+
+    CONF_SECTION = "BMP280"
+
+    def setup(self) -> None:
+        self.bmp280 = BMP280(self.bus_client(), self.address,
+                             self.option("OVERSAMPLING_T", 1),
+                             self.option("OVERSAMPLING_P", 4),
+                             self.option("IIR_FILTER", 4))
+        # Messzeit und Buszugriffe
+        self.READ_COST_MS = 1000 * self.bmp280.get_measurement_time() + 1.0
+
+    def read(self) -> dict:
+        temperature, pressure = self.bmp280.measure()
+        return {"temperature": temperature, "pressure": pressure}
+
+
+@register_plugin("ds18s20")
+class DS18S20Plugin(SensorPlugin):
+    """Temperaturmessung mit den DS18S20 Sensoren am 1-Wire Bus
+
+    Die Messgröße ist die ID des Sensors (z.B. 28-012113124839). Mit dem
+    Zusatz ``/quality`` (z.B. 28-012113124839/quality) wird der Qualitätscode
+    der letzten Auslesung geliefert (0: gültig, 1: CRC Fehler, 2: nicht
+    lesbar, 3: unerwarteter Inhalt). Fehlerhafte Auslesungen werden pro
+    Zyklus bis zu ``CRC_RETRY_BUDGET`` mal wiederholt.
+
+    Die Betriebsart wird im Abschnitt ``[ONEWIRE]`` der
+    :file:`monitor_live.conf` festgelegt:
+
+    * ``MODE: parallel`` - jeder Sensor wird in einem eigenen Thread über
+      ``w1_slave`` gelesen und startet dabei seine eigene Wandlung.
+    * ``MODE: bulk`` - eine gleichzeitige Wandlung aller Sensoren über
+      ``therm_bulk_read`` des Busmasters. Unterstützt der Kernel dies nicht,
+      wird auf parallel umgeschaltet.
+
+    Die Auflösung jedes Sensors wird beim Start aus der Spalte Resolution der
+    :file:`config_channels.csv` eingestellt. Aus der daraus folgenden
+    Wandlungszeit und der Anzahl der Sensoren ergeben sich die Lesedauer und
+    die bevorzugte Periode der Erfassungsgruppe 1wire.
+    """
+
+    GROUP = GROUP_1WIRE
+    READ_COST_MS = 750.0
+    PREFERRED_PERIOD_MS = 2500
+
+    def accepts(self, source: str) -> bool:
+        id, _, suffix = source.partition("/")
+        return id.startswith("28-") and suffix in ("", "quality")
+
+    CONF_SECTION = "ONEWIRE"
+
+    def setup(self) -> None:
+        self.one_wire = OneWire(
+            rescan_interval_s=self.option("RESCAN_INTERVAL_S",
+                                          OneWire.RESCAN_INTERVAL_S))
+
+        mode = self.option("MODE", "parallel")
+        if mode not in ("parallel", "bulk"):
+            raise ValueError(f"Unbekannter 1-Wire MODE {mode}")
+        if mode == "bulk" and not self.one_wire.bulk_read_supported():
+            self.logger.warning("1-Wire Busmaster ohne therm_bulk_read, "
+                                "die Sensoren werden parallel gelesen")
+            mode = "parallel"
+        self.mode = mode
+        self.retry_budget = self.option("CRC_RETRY_BUDGET",
+                                        OneWire.CRC_RETRY_BUDGET)
+        self.ids = sorted({source.partition("/")[0]
+                           for source in self.sources()})
+
+        # Auflösung der Sensoren aus der Spalte Resolution
+        for b in self.bindings:
+            if b.resolution is not None:
+                self.one_wire.set_resolution(b.source.partition("/")[0],
+                                             b.resolution)
+
+        # Lesedauer aus einer Wandlung und dem Auslesen jedes Sensors
+        self.conversion_time_s = self.one_wire.get_conversion_time(self.ids)
+        self.READ_COST_MS = 1000 * (self.conversion_time_s + len(self.ids)
+                                    * OneWire.BUS_TIME_PER_SENSOR_S)
+        # Periode mit Reserve auf 50 ms gerundet
+        self.PREFERRED_PERIOD_MS = 50 * math.ceil(self.READ_COST_MS * 1.2 / 50)
+        self.logger.info(f"1-Wire Wandlungszeit {self.conversion_time_s * 1000:0.0f} ms, Periode {self.PREFERRED_PERIOD_MS} ms")
+
+    def read(self) -> dict:
+        if self.mode == "bulk":
+            # Eine Wandlung für alle Sensoren
+            results = self.one_wire.read_ds18s20_bulk(
+                self.ids, self.conversion_time_s, self.retry_budget)
+        else:
+            # Parallele Abfrage im dauerhaften Thread Pool des 1-Wire Treibers
+            results = self.one_wire.read_ds18s20_devices(self.ids,
+                                                         self.retry_budget)
+
+        values = {}
+        for id, (value, quality) in results.items():
+            values[id] = value
+            values[id + "/quality"] = quality
+        return values
+
+
+@register_plugin("gpio")
+class GpioPlugin(SensorPlugin):
+    """Auslesen der GPIO Eingänge
+
+    Die Messgröße ist die BCM Nummer des GPIOs (z.B. 14). Zusätzlich liefert
+    jeder GPIO die Anzahl der steigenden Flanken (``14/count``) und die
+    gesamte Einschaltdauer in Sekunden (``14/on_time``).
+
+    Der :class:`~tatooine_data.gpio_service.GpioService` wird einmalig beim
+    Start konfiguriert. Die Betriebsart wird im Abschnitt ``[GPIO]`` der
+    :file:`monitor_live.conf` festgelegt:
+
+    * ``MODE: poll`` - pro Zyklus werden alle Eingänge in einem Durchlauf
+      gelesen und nur die Datenpunkte geschrieben, deren Pegel sich geändert
+      hat.
+    * ``MODE: event`` - die Flanken werden per Interrupt erfasst und pro
+      Zyklus gesammelt mit ihrem exakten Zeitstempel in die Datenpunkte
+      geschrieben. Kurze Impulse (z.B. Lenzpumpe) gehen so nicht verloren.
+
+    Mit ``BACKEND: chardev`` wird statt RPi.GPIO das Character Device
+    ``CHIP`` des Kernels verwendet.
+    """
+
+    READ_COST_MS = 0.5
+    CONF_SECTION = "GPIO"
+
+    _STATISTICS = ("count", "on_time")
+    """Abgeleitete Messgrößen pro GPIO"""
+
+    def accepts(self, source: str) -> bool:
+        pin, _, statistic = source.partition("/")
+        return pin.isdigit() and (not statistic or statistic in self._STATISTICS)
+
+    def setup(self) -> None:
+        pins = dict.fromkeys(int(source.partition("/")[0])
+                             for source in self.sources())
+        self.gpio = GpioService(list(pins),
+                                self.option("MODE", GpioService.MODE_POLL),
+                                self.option("BOUNCETIME_MS", 0),
+                                self.option("BACKEND", GpioService.BACKEND_RPI),
+                                self.option("CHIP", "/dev/gpiochip0"))
+        self._first_cycle = True
+
+        # Zuordnung Index im Zustandsvektor -> Kanalzuordnungen
+        self._bindings_of_index = [[] for _ in self.gpio.pins]
+        self._statistic_bindings = []
+        for b in self.bindings:
+            pin, _, statistic = b.source.partition("/")
+            i = self.gpio.pins.index(int(pin))
+            if statistic:
+                self._statistic_bindings.append((i, statistic, b))
+            else:
+                self._bindings_of_index[i].append(b)
+
+    def read(self) -> dict:
+        """Momentaufnahme von Pegel, Zähler und Einschaltdauer aller GPIOs
+
+        Im Ereignismodus werden die gepufferten Flanken nicht abgeholt, sie
+        bleiben für :func:`~tatooine_data.sensor_plugins.GpioPlugin.acquire`
+        erhalten. Die Werte entsprechen daher dem Stand der letzten Erfassung.
+
+        :return: Messgröße -> Messwert
+        :rtype: dict
+        """
+        if self.gpio.mode != GpioService.MODE_EVENT:
+            self.gpio.read_all()
+
+        now = time.time()
+        values = {}
+        for i, pin in enumerate(self.gpio.pins):
+            values[str(pin)] = self.gpio.state[i]
+            values[f"{pin}/count"] = self.gpio.cnt_rising[i]
+            values[f"{pin}/on_time"] = self.gpio.get_on_time_s(i, now)
+        return values
+
+    def acquire(self) -> None:
+        state = self.gpio.state
+
+        if self.gpio.mode == GpioService.MODE_EVENT:
+            # Im ersten Zyklus die Ausgangspegel übernehmen
+            if self._first_cycle:
+                timestamp = time.time()
+                for i, bindings in enumerate(self._bindings_of_index):
+                    for b in bindings:
+                        b.datapoint.update_value(state[i] * b.scale, timestamp)
+
+            # Alle Flanken mit ihrem Zeitstempel übernehmen
+            for i, level, timestamp in self.gpio.drain_events():
+                for b in self._bindings_of_index[i]:
+                    b.datapoint.update_value(level * b.scale, timestamp)
+        else:
+            changed = self.gpio.read_all()
+            if changed:
+                timestamp = time.time()
+                for i in changed:
+                    for b in self._bindings_of_index[i]:
+                        b.datapoint.update_value(state[i] * b.scale, timestamp)
+
+        self._first_cycle = False
+
+        # Zähler und Einschaltdauer werden jeden Zyklus aktualisiert
+        if self._statistic_bindings:
+            now = time.time()
+            for i, statistic, b in self._statistic_bindings:
+                if statistic == "count":
+                    value = self.gpio.cnt_rising[i]
+                else:
+                    value = self.gpio.get_on_time_s(i, now)
+                b.datapoint.update_value(value * b.scale, now)
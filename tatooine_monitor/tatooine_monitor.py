@@ -14,8 +14,6 @@ from datetime import datetime
 import logging
 from pickle import FALSE, TRUE
 import sys
-import smbus2
-import time
 import argparse
 import os
 
@@ -28,6 +26,8 @@ from tatooine_data import AquireData
 from tatooine_data import StoreDataToInflux
 from tatooine_data import helper
 from tatooine_data import Alerting
+from tatooine_data import DeadlineScheduler
+from driver.i2c_bus import I2CBusOwner
 
 
 #=========================================================================
@@ -38,20 +38,12 @@ from tatooine_data import Alerting
 TATOOINE_CONF_FILE = "/opt/tatooinePi/tatooine_monitor/monitor_live.conf"
 
 
-# Länge der Hauptschleife
-MAIN_LOOP_LENGHT_MS = 250
-# Anzahl Schleifendurchgänge bis I2C gemessen wird
-N_LOOPS_AQUIRE_I2C = 1
-# Anzahl Schleifendurchgänge bis I2C gemessen wird
-N_LOOPS_AQUIRE_I2C_SLOW = 10
-# Anzahl Schleifendurchgänge bis 1-Wire gemessen wird
-N_LOOPS_AQUIRE_1WIRE = 10
-# Anzahl Schleifendurchgänge Delay AlarmSystem nach Startup
+# Anzahl Zyklen der Hauptschleife Delay AlarmSystem nach Startup
 N_LOOPS_DELAY_ALERT_AT_STARTUP = 20
 
 
-# Get I2C bus
-bus = smbus2.SMBus(1)
+# Get I2C bus, alle Treiber greifen serialisiert über den Besitzer zu
+bus = I2CBusOwner(1)
 
 
 #=========================================================================
@@ -67,7 +59,7 @@ def main(show = FALSE):
         influx_passwort,influx_db_name,influx_measurement,influx_tag_location)
 
     # Initialisierung der Datenerfassung
-    data_handle = AquireData(bus)
+    data_handle = AquireData(bus, Config)
 
     # Initialisierung Alarmsystem
     alert_handle = Alerting(Config)
@@ -75,76 +67,61 @@ def main(show = FALSE):
     # Test der Verbindung zu InfluxDB
     inflDB.check_db_connection()
 
-    cnt_i2c = 0
-    cnt_i2c_slow = 0
-    cnt_1wire = 0
     cnt_cycle = 0
 
+    def main_cycle() -> None:
+        """Zyklus der Hauptschleife: Speichern, Alarme und Liveausgabe"""
+        nonlocal cnt_cycle
+
+        # Speichern der Messdaten
+        inflDB.store_data(data_handle.data_last_measured)
+
+        # Alert Notifications
+        if (cnt_cycle > N_LOOPS_DELAY_ALERT_AT_STARTUP):
+
+            alert_handle.calc_alerts(data_handle.get_last_data_measured())
+
+            alert_handle.process_alerts(data_handle.get_last_data_measured())
+        else:
+            cnt_cycle +=1
+
+        #Ausgabe der aktuellen Daten über Stdout
+        if(show == TRUE):
+            print(chr(27) + "[2J" + helper.show_current_data(data_handle.get_last_data_measured()))
+            print("\ni2c Bus: {utilisation:0.1f} % Auslastung, {transactions:d} Transaktionen, max. Wartezeit {max_wait_s:0.3f} s".format(**bus.get_statistics()))
+
+    # Periode der 1-Wire Sensoren aus Wandlungszeit und Anzahl der Sensoren
+    if period_1wire_ms == "auto":
+        period_1wire_s = data_handle.get_preferred_period_ms("1wire") / 1000
+    else:
+        period_1wire_s = float(period_1wire_ms) / 1000
+
     # We can use a with statement to ensure threads are cleaned up promptly
     with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-        future_1w  = concurrent.futures.Future()
-        future_i2c  = concurrent.futures.Future()
-        future_i2c_slow  = concurrent.futures.Future()
-        
-        while True:
-            
-            cnt_i2c +=1
-            cnt_i2c_slow +=1
-            cnt_1wire +=1
 
-            # Bestimmung der Startzeit der Schleife
-            start = time.perf_counter()
-            
-            # i2c Messen wenn es Zeit ist und der letzte Thread beendet wurde
-            if cnt_i2c >= N_LOOPS_AQUIRE_I2C and not(future_i2c.running()):
-                # Messen aller Sensoren
-                future_i2c = executor.submit(data_handle.aquire_data_i2c)
-                cnt_i2c =0
-                
-            # i2c Messen wenn es Zeit ist und der letzte Thread beendet wurde
-            if cnt_i2c_slow >= N_LOOPS_AQUIRE_I2C_SLOW and not(future_i2c_slow.running()):
-                # Messen aller Sensoren
-                future_i2c_slow = executor.submit(data_handle.aquire_data_i2c_slow)
-                cnt_i2c_slow =0
-                
-            # 1 Wire Messen wenn es Zeit ist und der letzte Thread beendet wurde
-            if cnt_1wire >= N_LOOPS_AQUIRE_1WIRE and not(future_1w.running()):
-                # Messen aller Sensoren in separatem thread
-                future_1w = executor.submit(data_handle.aquire_data_1wire)
-                cnt_1wire =0
-                
-            # Speichern der Messdaten
-            inflDB.store_data(data_handle.data_last_measured)
-            
-            # Alert Notifications
-            if (cnt_cycle > N_LOOPS_DELAY_ALERT_AT_STARTUP):
-                
-                alert_handle.calc_alerts(data_handle.get_last_data_measured())
-                
-                alert_handle.process_alerts(data_handle.get_last_data_measured())
-            else:
-                cnt_cycle +=1
-            
-            
-            # Bestimmung der noch verbleibenden Schleifenzeit        
-            delta = time.perf_counter() - start
-            delay = (MAIN_LOOP_LENGHT_MS / 1000) - delta
-
-            if (delay < 0):
-                # Die Zeitschleife wurde überschritten
-                msg = "Oberrun by {0:0.3f} Sekunden".format(round(delta,3))
-                logger.debug(msg)
-            else:
-                # print(f'Loop finished in {round(delta,3)} s')
-                time.sleep(delay)
-            
-            #Ausgabe der aktuellen Daten über Stdout
-            if(show == TRUE):
-                print(chr(27) + "[2J" + helper.show_current_data(data_handle.get_last_data_measured()))
-            
-            #finish = time.perf_counter()    
-            #print(f'Loop finished in {round(finish-start,3)} s')
-    
+        # Alle Erfassungsgruppen laufen auf absoluten Terminen, so dass eine
+        # Überschreitung die folgenden Zyklen nicht verschiebt
+        scheduler = DeadlineScheduler(executor, scheduler_policy,
+                                      scheduler_max_catch_up)
+        scheduler.add_group("i2c", period_i2c_ms / 1000,
+                            data_handle.aquire_data_i2c)
+        scheduler.add_group("i2c_slow", period_i2c_slow_ms / 1000,
+                            data_handle.aquire_data_i2c_slow)
+        scheduler.add_group("1wire", period_1wire_s,
+                            data_handle.aquire_data_1wire)
+        scheduler.add_group("main", main_loop_ms / 1000, main_cycle,
+                            threaded=False)
+
+        # Warnung, wenn ein Leseplan länger dauert als seine Periode oder
+        # die Zeitfenster der Kanäle den Ringpuffer übersteigen
+        for group in scheduler.groups:
+            cost_ms = data_handle.get_read_cost_ms(group.name)
+            if cost_ms > group.period_s * 1000:
+                logger.warning(f"Leseplan {group.name} benötigt ca. {cost_ms:0.0f} ms bei einer Periode von {group.period_s * 1000:0.0f} ms")
+            data_handle.check_windows(group.name, group.period_s)
+
+        scheduler.run_forever()
+
 
 #=========================================================================
 # Starten des Hauptprogramms
@@ -169,6 +146,14 @@ if __name__ == '__main__':
     influx_db_name = helper.getConfigValue(Config,"InfluxDB","DB_NAME")
     influx_measurement = helper.getConfigValue(Config,"InfluxDB","MEASUREMENT")
     influx_tag_location = helper.getConfigValue(Config,"InfluxDB","TAG_LOCATION")
+
+    # Zykluszeiten der Erfassungsgruppen
+    main_loop_ms = float(helper.getConfigValue(Config,"SCHEDULER","MAIN_LOOP_MS"))
+    period_i2c_ms = float(helper.getConfigValue(Config,"SCHEDULER","PERIOD_I2C_MS"))
+    period_i2c_slow_ms = float(helper.getConfigValue(Config,"SCHEDULER","PERIOD_I2C_SLOW_MS"))
+    period_1wire_ms = helper.getConfigValue(Config,"SCHEDULER","PERIOD_1WIRE_MS")
+    scheduler_policy = helper.getConfigValue(Config,"SCHEDULER","OVERRUN_POLICY")
+    scheduler_max_catch_up = int(helper.getConfigValue(Config,"SCHEDULER","MAX_CATCH_UP"))
     
     # Logging
     tatooine_log_file = helper.getConfigValue(Config,"Logging","LOG_FILE")
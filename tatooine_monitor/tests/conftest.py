@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Die Module werden wie im Betrieb relativ zu tatooine_monitor importiert
+# (driver.*, tatooine_data.*)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
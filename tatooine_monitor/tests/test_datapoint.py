@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Tests der Datenpunkte mit Filter und Historie als Zeitfenster"""
+
+import logging
+
+import pytest
+
+from tatooine_data.datapoint import DataPoint
+
+
+def samples(n, period_s, t0=1000.0):
+    """Messwerte 0, 1, 2, ... im Abstand period_s"""
+    return [(float(i), t0 + i * period_s) for i in range(n)]
+
+
+def test_filter_window_longer_than_history_length():
+    # 7.5 s Filter bei 0.5 s Periode: 16 Werte, die Historie hat nur 10
+    dp = DataPoint("a", filter_window_s=7.5)
+    stored = []
+    for value, timestamp in samples(40, 0.5):
+        dp.update_value(value, timestamp)
+        window = [v for v, t in stored if t >= timestamp - 7.5]
+        expected = (sum(window) + value) / (len(window) + 1)
+        stored.append((expected, timestamp))
+        assert dp.value == pytest.approx(expected)
+
+    assert dp.value_history == pytest.approx([v for v, _ in stored[-10:]])
+    assert dp.value_mean == pytest.approx(sum(dp.value_history) / 10)
+
+
+def test_filter_window_matches_reference():
+    dp = DataPoint("a", filter_window_s=7.5, history_window_s=3.0)
+    stored = []
+    for value, timestamp in samples(200, 0.25):
+        dp.update_value(value, timestamp)
+        window = [v for v, t in stored if t >= timestamp - 7.5]
+        expected = (sum(window) + value) / (len(window) + 1)
+        stored.append((expected, timestamp))
+        assert dp.value == pytest.approx(expected)
+
+        history = [v for v, t in stored if t >= timestamp - 3.0]
+        assert dp.value_history == pytest.approx(history)
+
+
+def test_filter_count_with_history_window():
+    dp = DataPoint("a", filter_cnt=20, history_window_s=0.5)
+    stored = []
+    for value, timestamp in samples(100, 0.25):
+        dp.update_value(value, timestamp)
+        window = stored[-19:]
+        expected = (sum(window) + value) / (len(window) + 1)
+        stored.append(expected)
+        assert dp.value == pytest.approx(expected)
+    assert len(dp.value_history) == 3
+
+
+def test_window_limited_by_max_samples(caplog):
+    dp = DataPoint("a", history_window_s=1000)
+    assert not dp.check_window(0.1)
+    assert dp.check_window(1.0)
+
+    with caplog.at_level(logging.WARNING):
+        for value, timestamp in samples(DataPoint._MAX_WINDOW_SAMPLES + 10, 0.1):
+            dp.update_value(value, timestamp)
+    assert dp.history_length == DataPoint._MAX_WINDOW_SAMPLES
+    assert len(dp.value_history) == DataPoint._MAX_WINDOW_SAMPLES
+    assert sum("begrenzt" in r.message for r in caplog.records) == 1
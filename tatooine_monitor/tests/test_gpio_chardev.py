@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Tests des GpioService mit dem Backend chardev über den FakeGpioChip"""
+
+import pytest
+
+from driver.gpio_chardev import FakeGpioChip
+from tatooine_data.gpio_service import GpioService
+
+
+PINS = [14, 15, 17]
+
+
+@pytest.fixture
+def chip():
+    return FakeGpioChip()
+
+
+def test_read_all_returns_changed_indices(chip):
+    chip.set_value(15, 1)
+    gpio = GpioService(PINS, GpioService.MODE_POLL,
+                       backend=GpioService.BACKEND_CHARDEV, chip=chip)
+
+    # Nach der ersten Auslesung gelten alle Eingänge als geändert
+    assert gpio.read_all() == [0, 1, 2]
+    assert gpio.state == [0, 1, 0]
+    assert gpio.read_all() == []
+
+    chip.set_value(17, 1)
+    chip.set_value(15, 0)
+    assert gpio.read_all() == [1, 2]
+    assert gpio.state == [0, 0, 1]
+
+    # Ein beim Start anliegender Pegel ist keine Flanke
+    assert gpio.cnt_rising == [0, 0, 1]
+
+
+def test_events_keep_kernel_timestamps(chip):
+    gpio = GpioService(PINS, GpioService.MODE_EVENT,
+                       backend=GpioService.BACKEND_CHARDEV, chip=chip)
+
+    chip.set_value(14, 1, timestamp=100.0)
+    chip.set_value(17, 1, timestamp=100.2)
+    chip.set_value(14, 0, timestamp=100.5)
+
+    assert gpio.drain_events() == [(0, 1, 100.0), (2, 1, 100.2),
+                                   (0, 0, 100.5)]
+    assert gpio.drain_events() == []
+    assert gpio.state == [0, 0, 1]
+
+
+def test_short_pulse_is_counted(chip):
+    gpio = GpioService(PINS, GpioService.MODE_EVENT,
+                       backend=GpioService.BACKEND_CHARDEV, chip=chip)
+
+    # Beide Flanken liegen vor dem Abholen, der Pegel ist wieder 0
+    chip.set_value(15, 1, timestamp=10.0)
+    chip.set_value(15, 0, timestamp=10.02)
+    assert [(i, level) for i, level, _ in gpio.drain_events()] == \
+        [(1, 1), (1, 0)]
+    assert gpio.cnt_rising == [0, 1, 0]
+    assert gpio.on_time_s[1] == pytest.approx(0.02)
+
+
+def test_count_and_on_time(chip):
+    gpio = GpioService(PINS, GpioService.MODE_EVENT,
+                       backend=GpioService.BACKEND_CHARDEV, chip=chip)
+
+    chip.set_value(14, 1, timestamp=0.0)
+    chip.set_value(14, 0, timestamp=2.0)
+    chip.set_value(14, 1, timestamp=5.0)
+    gpio.drain_events()
+
+    assert gpio.cnt_rising[0] == 2
+    assert gpio.on_time_s[0] == pytest.approx(2.0)
+
+    # Die laufende High-Phase wird bis zum Bezugszeitpunkt mitgezählt
+    assert gpio.get_on_time_s(0, now=6.5) == pytest.approx(3.5)
+    assert gpio.get_on_time_s(1, now=6.5) == 0.0
+
+
+def test_event_without_level_change_is_dropped(chip):
+    gpio = GpioService(PINS, GpioService.MODE_EVENT,
+                       backend=GpioService.BACKEND_CHARDEV, chip=chip)
+
+    chip.set_value(14, 1, timestamp=1.0)
+    chip.requests[0].events.append((14, 1, 1.001))
+    assert gpio.drain_events() == [(0, 1, 1.0)]
+    assert gpio.cnt_rising[0] == 1
+
+
+def test_close_releases_lines(chip):
+    gpio = GpioService(PINS, GpioService.MODE_EVENT,
+                       backend=GpioService.BACKEND_CHARDEV, chip=chip)
+    assert len(chip.requests) == 1
+    gpio.close()
+    assert chip.requests == []
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Tests der 1-Wire Auslesung über ein nachgebildetes sysfs Verzeichnis"""
+
+import pytest
+
+from driver.one_wire import OneWire, parse_w1_slave
+
+
+W1_SLAVE_OK = b"63 01 4b 46 7f ff 0c 10 d1 : crc=d1 YES\n" \
+              b"63 01 4b 46 7f ff 0c 10 d1 t=22187\n"
+W1_SLAVE_CRC = b"63 01 4b 46 7f ff 0c 10 d1 : crc=d1 NO\n" \
+               b"63 01 4b 46 7f ff 0c 10 d1 t=85000\n"
+
+
+def add_sensor(root, id, temperature=None, w1_slave=None):
+    """Anlegen eines Sensors mit den Attributen temperature und w1_slave"""
+    sensor = root / id
+    sensor.mkdir()
+    if temperature is not None:
+        (sensor / "temperature").write_text(temperature)
+    if w1_slave is not None:
+        (sensor / "w1_slave").write_bytes(w1_slave)
+
+
+@pytest.fixture
+def root(tmp_path):
+    master = tmp_path / "w1_bus_master1"
+    master.mkdir()
+    (master / "therm_bulk_read").write_text("1\n")
+    return tmp_path
+
+
+@pytest.fixture
+def open_wire(root):
+    sensors = []
+
+    def factory():
+        sensor = OneWire(str(root))
+        sensors.append(sensor)
+        return sensor
+
+    yield factory
+    for sensor in sensors:
+        sensor.close()
+
+
+def count_calls(sensor):
+    """Zählen der Einzelauslesungen über w1_slave je Sensor"""
+    calls = {}
+    read = sensor.read_1w_sensor_ds18s20
+
+    def wrapper(id):
+        calls[id] = calls.get(id, 0) + 1
+        return read(id)
+
+    sensor.read_1w_sensor_ds18s20 = wrapper
+    return calls
+
+
+def test_parse_w1_slave_ok():
+    buffer = bytearray(W1_SLAVE_OK)
+    assert parse_w1_slave(buffer, len(buffer)) == (22.187, OneWire.QUALITY_OK)
+
+
+def test_parse_w1_slave_negative():
+    buffer = bytearray(W1_SLAVE_OK.replace(b"t=22187", b"t=-1250"))
+    assert parse_w1_slave(buffer, len(buffer)) == (-1.25, OneWire.QUALITY_OK)
+
+
+def test_parse_w1_slave_crc_error():
+    buffer = bytearray(W1_SLAVE_CRC)
+    assert parse_w1_slave(buffer, len(buffer)) == \
+        (None, OneWire.QUALITY_CRC_ERROR)
+
+
+def test_parse_w1_slave_format_error():
+    # Fehlendes t= in der zweiten Zeile
+    buffer = bytearray(W1_SLAVE_OK.replace(b"t=22187", b"22187"))
+    assert parse_w1_slave(buffer, len(buffer)) == \
+        (None, OneWire.QUALITY_FORMAT_ERROR)
+
+    # Ohne Ziffern nach t=
+    buffer = bytearray(W1_SLAVE_OK.replace(b"t=22187", b"t="))
+    assert parse_w1_slave(buffer, len(buffer)) == \
+        (None, OneWire.QUALITY_FORMAT_ERROR)
+
+    # Unvollständiges Attribut ohne Zeilenende
+    buffer = bytearray(W1_SLAVE_OK)
+    assert parse_w1_slave(buffer, 20) == (None, OneWire.QUALITY_FORMAT_ERROR)
+
+
+def test_parse_w1_slave_ignores_bytes_after_n():
+    # Der wiederverwendete Puffer enthält noch Reste einer früheren Auslesung
+    buffer = bytearray(W1_SLAVE_OK.replace(b"t=22187\n", b"t=21")) + b"999"
+    n = len(buffer) - 3
+    assert parse_w1_slave(buffer, n) == (0.021, OneWire.QUALITY_OK)
+
+
+def test_bulk_read(root, open_wire):
+    add_sensor(root, "28-000000000001", temperature="21500\n")
+    add_sensor(root, "28-000000000002", temperature="-3125\n")
+    add_sensor(root, "3a-000000000003")
+    sensor = open_wire()
+    calls = count_calls(sensor)
+
+    assert sensor.bulk_read_supported()
+    results = sensor.read_ds18s20_bulk(conversion_time_s=0)
+
+    assert results == {"28-000000000001": (21.5, OneWire.QUALITY_OK),
+                       "28-000000000002": (-3.125, OneWire.QUALITY_OK)}
+    assert calls == {}
+
+    # Die Wandlung wurde am Busmaster gestartet
+    assert (root / "w1_bus_master1" / "therm_bulk_read").read_text() == \
+        "trigger\n"
+
+
+def test_bulk_read_only_requested_ids(root, open_wire):
+    add_sensor(root, "28-000000000001", temperature="21500\n")
+    add_sensor(root, "28-000000000002", temperature="22000\n")
+    sensor = open_wire()
+
+    assert sensor.read_ds18s20_bulk(["28-000000000002"],
+                                    conversion_time_s=0) == \
+        {"28-000000000002": (22.0, OneWire.QUALITY_OK)}
+
+
+def test_bulk_read_falls_back_to_w1_slave(root, open_wire):
+    add_sensor(root, "28-000000000001", temperature="21500\n")
+    # Ohne lesbare Temperatur wird einzeln über w1_slave gelesen
+    add_sensor(root, "28-000000000002", w1_slave=W1_SLAVE_OK)
+    add_sensor(root, "28-000000000003", temperature="garbage\n",
+               w1_slave=W1_SLAVE_OK.replace(b"t=22187", b"t=-500"))
+    sensor = open_wire()
+    calls = count_calls(sensor)
+
+    results = sensor.read_ds18s20_bulk(conversion_time_s=0)
+
+    assert results == {"28-000000000001": (21.5, OneWire.QUALITY_OK),
+                       "28-000000000002": (22.187, OneWire.QUALITY_OK),
+                       "28-000000000003": (-0.5, OneWire.QUALITY_OK)}
+    assert calls == {"28-000000000002": 1, "28-000000000003": 1}
+
+
+def test_bulk_read_retry_budget_exhausted(root, open_wire):
+    for i in range(1, 4):
+        add_sensor(root, f"28-00000000000{i}", w1_slave=W1_SLAVE_CRC)
+    sensor = open_wire()
+    calls = count_calls(sensor)
+
+    results = sensor.read_ds18s20_bulk(conversion_time_s=0, retry_budget=2)
+
+    # Zwei Sensoren werden über w1_slave wiederholt und liefern weiter
+    # CRC Fehler, für den dritten reicht das Budget nicht
+    assert results == {
+        "28-000000000001": (None, OneWire.QUALITY_CRC_ERROR),
+        "28-000000000002": (None, OneWire.QUALITY_CRC_ERROR),
+        "28-000000000003": (None, OneWire.QUALITY_READ_ERROR)}
+    assert calls == {"28-000000000001": 1, "28-000000000002": 1}
+
+
+def test_read_devices_retry_budget(root, open_wire):
+    add_sensor(root, "28-000000000001", w1_slave=W1_SLAVE_OK)
+    add_sensor(root, "28-000000000002", w1_slave=W1_SLAVE_CRC)
+    sensor = open_wire()
+    calls = count_calls(sensor)
+
+    results = sensor.read_ds18s20_devices(retry_budget=3)
+
+    # Der fehlerhafte Sensor verbraucht das gesamte Budget
+    assert results == {"28-000000000001": (22.187, OneWire.QUALITY_OK),
+                       "28-000000000002": (None, OneWire.QUALITY_CRC_ERROR)}
+    assert calls == {"28-000000000001": 1, "28-000000000002": 4}
+
+
+def test_read_devices_recovers_after_crc_error(root, open_wire):
+    add_sensor(root, "28-000000000001", w1_slave=W1_SLAVE_CRC)
+    sensor = open_wire()
+    read = sensor.read_1w_sensor_ds18s20
+    w1_slave = root / "28-000000000001" / "w1_slave"
+
+    def flaky(id):
+        # Nach dem ersten CRC Fehler liefert der Bus wieder gültige Werte
+        result = read(id)
+        w1_slave.write_bytes(W1_SLAVE_OK)
+        return result
+
+    sensor.read_1w_sensor_ds18s20 = flaky
+    assert sensor.read_ds18s20_devices(retry_budget=1) == \
+        {"28-000000000001": (22.187, OneWire.QUALITY_OK)}